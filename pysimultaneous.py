@@ -2,20 +2,31 @@
 # Author: Andrew W. Lounsbury
 # Date: 3/24/24
 # Description: a class for handling simultaneous games with n players, n >= 2
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from fractions import Fraction
 from itertools import chain
 from itertools import combinations
+import json
 import numpy as np
-import sympy
-from sympy import solve
-from sympy import simplify
-from sympy import Symbol
+import re
+import struct
+import threading
 import warnings
+import weakref
 from pprint import pprint
 import colorama
 from colorama import init, Fore, Style
 
 init()
 
+# Binary game files start with BINARY_MAGIC, then the format version and the length of a JSON header as little-endian
+# uint32s, then the header. The payoff tensor follows as raw little-endian float64s in C order, starting at the next
+# multiple of BINARY_ALIGNMENT bytes so that it can be memory-mapped.
+BINARY_MAGIC = b"PYSIMGAM"
+BINARY_VERSION = 1
+BINARY_ALIGNMENT = 64
+
 def checkIfFloats(myList):
     allFloats = True
     t = ""
@@ -27,7 +38,645 @@ def checkIfFloats(myList):
                 break
             if t == "int":
                 myList[i] = float(myList[i])
-    return (allFloats, t, myList) 
+    return (allFloats, t, myList)
+
+def formatPayoff(payoff):
+    """Formats a payoff for printing, dropping the decimal point from whole numbers
+
+    Args:
+        payoff (float): the payoff
+
+    Returns:
+        str: the formatted payoff
+    """
+    payoff = float(payoff)
+    if payoff.is_integer():
+        return str(int(payoff))
+    return str(payoff)
+
+def toMatrixLayout(array, numPlayers):
+    """Rearranges an array indexed by (s_1, ..., s_n, ...) into the stack of payoff arrays layout (m, s_1, s_2, ...), where m runs over the strategies of players 3,...,n with player 3 changing fastest
+
+    Args:
+        array (np.ndarray): array whose first numPlayers axes are the players' strategies
+        numPlayers (int): the number of players
+
+    Returns:
+        np.ndarray: the same data indexed by [m][i][j]
+    """
+    # m = c_3 + s_3 * c_4 + ..., so the last player changes slowest
+    order = list(range(numPlayers - 1, 1, -1)) + [0, 1] + list(range(numPlayers, array.ndim))
+    numMatrices = int(np.prod(array.shape[2:numPlayers]))
+    return array.transpose(order).reshape((numMatrices,) + array.shape[:2] + array.shape[numPlayers:])
+
+def matricesToTensor(matrices, numStrats):
+    """Converts a stack of payoff arrays indexed by [m][i][j][x] into a payoff tensor of shape (numPlayers, s_1, ..., s_n)
+
+    Args:
+        matrices (np.ndarray): payoffs of shape (numMatrices, s_1, s_2, numPlayers)
+        numStrats (list): the number of strategies of each player
+
+    Returns:
+        np.ndarray: the payoff tensor
+    """
+    numPlayers = len(numStrats)
+    stacked = matrices.reshape(tuple(numStrats[:1:-1]) + (numStrats[0], numStrats[1], numPlayers))
+    order = [numPlayers, numPlayers - 2, numPlayers - 1] + [numPlayers - 1 - x for x in range(2, numPlayers)]
+    return np.ascontiguousarray(stacked.transpose(order))
+
+def tensorToMatrices(tensor):
+    """Converts a payoff tensor of shape (numPlayers, s_1, ..., s_n) into a stack of payoff arrays indexed by [m][i][j][x]. This is the inverse of matricesToTensor.
+
+    Args:
+        tensor (np.ndarray): the payoff tensor
+
+    Returns:
+        np.ndarray: payoffs of shape (numMatrices, s_1, s_2, numPlayers)
+    """
+    return toMatrixLayout(np.moveaxis(tensor, 0, -1), tensor.shape[0])
+
+def outcomeToList(outcome):
+    """Converts an outcome given as a ListNode, OutcomeView, or list into a list of payoffs
+
+    Args:
+        outcome (ListNode, OutcomeView, or list): the outcome
+
+    Returns:
+        list: the payoffs, or None if the outcome has an unsupported type
+    """
+    if isinstance(outcome, (list, tuple, np.ndarray)):
+        return list(outcome)
+    if isinstance(outcome, (ListNode, OutcomeView)):
+        return [outcome.getListNode(x).payoff for x in range(outcome.size())]
+    return None
+
+def positiveBimatrix(tensor):
+    """Shifts the payoffs of a two-player game to be at least 1, which keeps the best response polytopes bounded without changing the equilibria
+
+    Args:
+        tensor (np.ndarray): the payoff tensor of shape (2, m, n)
+
+    Returns:
+        np.ndarray: the row player's shifted payoffs
+        np.ndarray: the column player's shifted payoffs
+    """
+    A = tensor[0].astype(float)
+    B = tensor[1].astype(float)
+    return A - A.min() + 1, B - B.min() + 1
+
+def pivotTableau(tableau, basis, column, lexColumns, tol = 1e-12):
+    """Pivots a variable into the basis of a tableau whose last column is the right-hand side, breaking ties in the ratio test lexicographically
+
+    Args:
+        tableau (np.ndarray): the tableau, modified in place
+        basis (list): basis[row] is the variable that is basic in row, modified in place
+        column (int): the entering variable
+        lexColumns (list): the columns that form the identity in the starting tableau, used to break ties
+        tol (float): entries no greater than tol are treated as 0
+
+    Returns:
+        int: the variable that left the basis, or -1 if the column is unbounded
+    """
+    coefficients = tableau[:, column]
+    rows = np.flatnonzero(coefficients > tol)
+    if len(rows) == 0:
+        return -1
+    ratios = tableau[rows, -1] / coefficients[rows]
+    minimum = ratios.min()
+    rows = rows[ratios <= minimum + tol * max(1.0, abs(minimum))]
+    # breaking ties lexicographically
+    for k in lexColumns:
+        if len(rows) == 1:
+            break
+        ratios = tableau[rows, k] / coefficients[rows]
+        minimum = ratios.min()
+        rows = rows[ratios <= minimum + tol * max(1.0, abs(minimum))]
+    row = rows[0]
+    leaving = basis[row]
+    tableau[row] /= tableau[row, column]
+    pivotColumn = tableau[:, column].copy()
+    pivotColumn[row] = 0
+    tableau -= pivotColumn[:, np.newaxis] * tableau[row]
+    basis[row] = column
+    return leaving
+
+def lemkeHowsonPath(A, B, label):
+    """Follows the Lemke-Howson path of a bimatrix game one pivot at a time, so that several paths can be followed side by side
+
+    Args:
+        A (np.ndarray): player 1's positive payoff matrix
+        B (np.ndarray): player 2's positive payoff matrix
+        label (int): the label that is dropped first; 0,...,m - 1 are player 1's strategies and m,...,m + n - 1 are player 2's
+
+    Yields:
+        None after every pivot, then the equilibrium [[p_1, ..., p_m], [q_1, ..., q_n]] once the path ends, or [] if it is unbounded
+    """
+    numRows, numCols = A.shape
+    # the columns of both tableaus are the labels, then the right-hand side
+    # P = {x >= 0 : B^T x <= 1} with slacks labeled by player 2's strategies
+    tableauP = np.hstack([B.T, np.eye(numCols), np.ones((numCols, 1))])
+    basisP = list(range(numRows, numRows + numCols))
+    # Q = {y >= 0 : A y <= 1} with slacks labeled by player 1's strategies
+    tableauQ = np.hstack([np.eye(numRows), A, np.ones((numRows, 1))])
+    basisQ = list(range(numRows))
+    
+    inP = label < numRows
+    entering = label
+    while True:
+        if inP:
+            leaving = pivotTableau(tableauP, basisP, entering, range(numRows, numRows + numCols))
+        else:
+            leaving = pivotTableau(tableauQ, basisQ, entering, range(numRows))
+        if leaving == -1:
+            yield []
+            return
+        if leaving == label:
+            break
+        # the variable with the same label as the one that left enters the other tableau
+        entering = leaving
+        inP = not inP
+        yield None
+    
+    p = np.zeros(numRows)
+    q = np.zeros(numCols)
+    for row, var in enumerate(basisP):
+        if var < numRows:
+            p[var] = tableauP[row, -1]
+    for row, var in enumerate(basisQ):
+        if var >= numRows:
+            q[var - numRows] = tableauQ[row, -1]
+    yield [(p / p.sum()).tolist(), (q / q.sum()).tolist()]
+
+def enumerateVertices(tableau, basis, lexColumns, tol = 1e-9):
+    """Enumerates the vertices of a bounded polytope {z >= 0 : Mz <= 1} reachable with lexicographic pivots
+
+    Args:
+        tableau (np.ndarray): the starting feasible tableau, whose last column is the right-hand side
+        basis (list): basis[row] is the variable that is basic in row in the starting tableau
+        lexColumns (list): the columns that form the identity in the starting tableau, used to break ties
+        tol (float): entries no greater than tol are treated as 0
+
+    Returns:
+        np.ndarray: the values of all of the variables at each basis visited
+        np.ndarray: the bases visited, one per row
+    """
+    numVars = tableau.shape[1] - 1
+    tableaus = tableau[np.newaxis].astype(float)
+    bases = np.array([basis])
+    def isBasic(bases):
+        basic = np.zeros((len(bases), numVars), dtype=bool)
+        basic[np.arange(len(bases))[:, np.newaxis], bases] = True
+        return basic
+    seen = {np.packbits(isBasic(bases)[0]).tobytes()}
+    allValues = []
+    allBases = []
+    while len(tableaus):
+        values = np.zeros((len(tableaus), numVars))
+        values[np.arange(len(tableaus))[:, np.newaxis], bases] = tableaus[:, :, -1]
+        allValues.append(values)
+        allBases.append(bases)
+        
+        # the minimum ratio test for every nonbasic column of every tableau at once
+        coefficients = tableaus[:, :, :-1]
+        positive = coefficients > tol
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = np.where(positive, tableaus[:, :, -1:] / coefficients, np.inf)
+        ties = positive & (ratios <= ratios.min(axis=1, keepdims=True) + tol)
+        ties &= ~isBasic(bases)[:, np.newaxis, :]
+        for column in lexColumns:
+            tied = np.flatnonzero((ties.sum(axis=1) > 1).any(axis=1))
+            if len(tied) == 0:
+                break
+            with np.errstate(divide='ignore', invalid='ignore'):
+                lexRatios = np.where(ties[tied], tableaus[tied, :, column:column + 1] / coefficients[tied], np.inf)
+            ties[tied] &= lexRatios <= lexRatios.min(axis=1, keepdims=True) + tol
+        k, column = np.nonzero(ties.any(axis=1))
+        row = ties.argmax(axis=1)[k, column]
+        newBases = bases[k]
+        newBases[np.arange(len(k)), row] = column
+        
+        keys = np.packbits(isBasic(newBases), axis=1)
+        new = []
+        for n in range(len(k)):
+            key = keys[n].tobytes()
+            if key not in seen:
+                seen.add(key)
+                new.append(n)
+        k, column, row, bases = k[new], column[new], row[new], newBases[new]
+        old = tableaus[k]
+        n = np.arange(len(k))
+        pivotRows = old[n, row] / old[n, row, column][:, np.newaxis]
+        tableaus = old - old[n, :, column][:, :, np.newaxis] * pivotRows[:, np.newaxis, :]
+        tableaus[n, row] = pivotRows
+    return np.concatenate(allValues), np.concatenate(allBases)
+
+def solveCholesky(factors, rhs, blockSize = 32):
+    """Solves a stack of symmetric positive definite systems from their Cholesky factors, by blocked forward and back substitution
+
+    Args:
+        factors (np.ndarray): array of shape (k, m, m) of the lower triangular factors L, as returned by np.linalg.cholesky
+        rhs (np.ndarray): array of shape (k, m) of the right-hand sides
+        blockSize (int): the number of unknowns solved for at a time
+
+    Returns:
+        np.ndarray: array of shape (k, m) of the solutions x of L L^T x = rhs
+    """
+    size = factors.shape[1]
+    # L y = rhs
+    y = np.empty_like(rhs)
+    for start in range(0, size, blockSize):
+        end = min(start + blockSize, size)
+        block = rhs[:, start:end] - (factors[:, start:end, :start] @ y[:, :start, np.newaxis])[:, :, 0]
+        y[:, start:end] = np.linalg.solve(factors[:, start:end, start:end], block[:, :, np.newaxis])[:, :, 0]
+    # L^T x = y
+    x = np.empty_like(rhs)
+    for end in range(size, 0, -blockSize):
+        start = max(end - blockSize, 0)
+        block = y[:, start:end] - (x[:, np.newaxis, end:] @ factors[:, end:, start:end])[:, 0]
+        x[:, start:end] = np.linalg.solve(factors[:, start:end, start:end].transpose(0, 2, 1), block[:, :, np.newaxis])[:, :, 0]
+    return x
+
+def solveFractions(matrix, rhs):
+    """Solves a nonsingular square linear system exactly by Gauss-Jordan elimination over Fractions
+
+    Args:
+        matrix (list): the rows of the matrix, whose entries are Fractions or ints
+        rhs (list): the right-hand side
+
+    Returns:
+        list: the solution as Fractions
+    """
+    rows = [[Fraction(a) for a in row] + [Fraction(b)] for row, b in zip(matrix, rhs)]
+    size = len(rows)
+    for column in range(size):
+        pivot = next(row for row in range(column, size) if rows[row][column] != 0)
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        pivotRow = rows[column]
+        pivotRow[column:] = [a / pivotRow[column] for a in pivotRow[column:]]
+        for row in range(size):
+            factor = rows[row][column]
+            if row != column and factor != 0:
+                rows[row][column:] = [a - factor * b for a, b in zip(rows[row][column:], pivotRow[column:])]
+    return [row[-1] for row in rows]
+
+def solveIndifference(payoffs, ownSupports, otherSupports, tol = 1e-9):
+    """Solves the indifference conditions of support enumeration for a batch of pairs of supports
+
+    Args:
+        payoffs (np.ndarray): the indifferent player's payoffs, rows are their strategies and columns are the other player's
+        ownSupports (np.ndarray): the indifferent player's supports, one per row
+        otherSupports (np.ndarray): the other player's supports of the same size, one per row, paired with ownSupports
+        tol (float): the tolerance used when checking probabilities and best responses
+
+    Returns:
+        tuple: (mixtures, valid), where mixtures[n] are the probabilities on otherSupports[n] and valid[n] is whether they pass the checks
+    """
+    numPairs, k = ownSupports.shape
+    # [payoffs[I, J], -1; 1, 0] [mixture; value] = [0; 1]
+    systems = np.zeros((numPairs, k + 1, k + 1))
+    systems[:, :k, :k] = payoffs[ownSupports[:, :, np.newaxis], otherSupports[:, np.newaxis, :]]
+    systems[:, :k, k] = -1
+    systems[:, k, :k] = 1
+    rhs = np.zeros((numPairs, k + 1, 1))
+    rhs[:, k] = 1
+    try:
+        solutions = np.linalg.solve(systems, rhs)[..., 0]
+        nonsingular = np.ones(numPairs, dtype=bool)
+    except np.linalg.LinAlgError:
+        # singular systems have no isolated solution and are skipped, judged relative to their scale
+        nonsingular = np.linalg.matrix_rank(systems) == k + 1
+        systems[~nonsingular] = np.eye(k + 1)
+        solutions = np.linalg.solve(systems, rhs)[..., 0]
+    mixtures = solutions[:, :k]
+    values = solutions[:, k]
+    # no strategy may do better than the value against the mixture
+    bestValues = np.einsum("onk,nk->no", payoffs[:, otherSupports], mixtures).max(axis=1)
+    valid = nonsingular & (mixtures >= -tol).all(axis=1) & (bestValues <= values + tol)
+    return np.clip(mixtures, 0, None), valid
+
+def solveMatrixGame(A, tol = 1e-9, maxIter = 100):
+    """Solves a two-player zero-sum game, where the row player maximizes the payoffs A, with a primal-dual interior-point method
+
+    Args:
+        A (np.ndarray): the row player's payoffs
+        tol (float): the tolerance on the infeasibilities and the duality gap
+        maxIter (int): the maximum number of iterations
+
+    Returns:
+        float: the value of the game for the row player
+        np.ndarray: the row player's optimal mixed strategy
+        np.ndarray: the column player's optimal mixed strategy
+    """
+    values, p, q = solveMatrixGames(np.asarray(A, dtype=float)[np.newaxis], tol, maxIter)
+    return float(values[0]), p[0], q[0]
+
+def solveMatrixGames(A, tol = 1e-9, maxIter = 100):
+    """Solves a stack of two-player zero-sum games of the same shape at once, as solveMatrixGame does for one
+
+    Args:
+        A (np.ndarray): array of shape (k, m, n) of the row player's payoffs in each game
+        tol (float): the tolerance on the infeasibilities and the duality gaps
+        maxIter (int): the maximum number of iterations
+
+    Returns:
+        np.ndarray: the values of the games for the row player
+        np.ndarray: array of shape (k, m) of the row player's optimal mixed strategies
+        np.ndarray: array of shape (k, n) of the column player's optimal mixed strategies
+    """
+    payoffs = np.asarray(A, dtype=float)
+    numGames, numRows, numCols = payoffs.shape
+    if numRows > numCols:
+        # the normal equations are m x m, so solving the games from the column player's side when it's smaller
+        values, q, p = solveMatrixGames(-payoffs.transpose(0, 2, 1), tol, maxIter)
+        return -values, p, q
+    A = payoffs + (1 - payoffs.min(axis=(1, 2)))[:, np.newaxis, np.newaxis]
+    # min c^T z such that [A I] z = 1 and z = (y, s) >= 0, whose dual is max 1^T l such that [A I]^T l + w = c and w >= 0
+    c = np.concatenate([-np.ones(numCols), np.zeros(numRows)])
+    z = np.ones((numGames, numCols + numRows))
+    w = np.ones((numGames, numCols + numRows))
+    l = np.zeros((numGames, numRows))
+    def constraintTimes(A, v):
+        return np.einsum("kij,kj->ki", A, v[:, :numCols]) + v[:, numCols:]
+    def constraintTransposeTimes(A, u):
+        return np.concatenate([np.einsum("kij,ki->kj", A, u), u], axis=1)
+    def stepLength(v, dv):
+        decreasing = dv < 0
+        return np.minimum(1.0, np.where(decreasing, -v / np.where(decreasing, dv, -1), np.inf).min(axis=1))
+    
+    # the games that haven't converged yet
+    active = np.arange(numGames)
+    games = A
+    for iteration in range(maxIter):
+        za, la, wa = z[active], l[active], w[active]
+        primalResidual = constraintTimes(games, za) - 1
+        dualResidual = constraintTransposeTimes(games, la) + wa - c
+        gaps = (za * wa).sum(axis=1)
+        converged = (np.abs(primalResidual).max(axis=1) < tol) & (np.abs(dualResidual).max(axis=1) < tol) & (gaps < tol * (1 + np.abs(za @ c)))
+        if converged.any():
+            keep = ~converged
+            active, games, za, la, wa = active[keep], games[keep], za[keep], la[keep], wa[keep]
+            primalResidual, dualResidual, gaps = primalResidual[keep], dualResidual[keep], gaps[keep]
+            if len(active) == 0:
+                break
+        mu = gaps / za.shape[1]
+        # the normal equations [A I] D [A I]^T dl = r, where D = Z / W
+        d = za / wa
+        scaled = games * np.sqrt(d[:, np.newaxis, :numCols])
+        normal = scaled @ scaled.transpose(0, 2, 1)
+        normal[:, np.arange(numRows), np.arange(numRows)] += d[:, numCols:]
+        # large systems are factored once for both the predictor and the corrector; small ones are cheaper to solve twice
+        factors = None
+        if numRows > 128:
+            try:
+                factors = np.linalg.cholesky(normal)
+            except np.linalg.LinAlgError:
+                pass
+        def solveNormal(r):
+            if factors is not None:
+                return solveCholesky(factors, r)
+            try:
+                return np.linalg.solve(normal, r[:, :, np.newaxis])[:, :, 0]
+            except np.linalg.LinAlgError:
+                return np.stack([np.linalg.lstsq(normal[k], r[k], rcond=None)[0] for k in range(len(r))])
+        def direction(complementarity):
+            dl = solveNormal(-primalResidual - constraintTimes(games, complementarity / wa + d * dualResidual))
+            dw = -dualResidual - constraintTransposeTimes(games, dl)
+            dz = (complementarity - za * dw) / wa
+            return dz, dl, dw
+        
+        # the affine-scaling predictor, then the centering corrector
+        dz, dl, dw = direction(-za * wa)
+        primalStep = stepLength(za, dz)[:, np.newaxis]
+        dualStep = stepLength(wa, dw)[:, np.newaxis]
+        sigma = (((za + primalStep * dz) * (wa + dualStep * dw)).sum(axis=1) / za.shape[1] / mu) ** 3
+        dz, dl, dw = direction(-za * wa - dz * dw + (sigma * mu)[:, np.newaxis])
+        primalStep = np.minimum(1.0, 0.99 * stepLength(za, dz))[:, np.newaxis]
+        dualStep = np.minimum(1.0, 0.99 * stepLength(wa, dw))[:, np.newaxis]
+        z[active] = za + primalStep * dz
+        l[active] = la + dualStep * dl
+        w[active] = wa + dualStep * dw
+    
+    p = np.maximum(-l, 0)
+    q = np.maximum(z[:, :numCols], 0)
+    p /= p.sum(axis=1, keepdims=True)
+    q /= q.sum(axis=1, keepdims=True)
+    values = np.einsum("ki,kij,kj->k", p, payoffs, q)
+    
+    def indifferent(payoffs, ownSupport, otherSupport):
+        # the other player's mix on otherSupport that makes every strategy in ownSupport earn the same payoff
+        system = np.zeros((len(ownSupport) + 1, len(otherSupport) + 1))
+        system[:-1, :-1] = payoffs[np.ix_(ownSupport, otherSupport)]
+        system[:-1, -1] = -1
+        system[-1, :-1] = 1
+        rhs = np.zeros(len(ownSupport) + 1)
+        rhs[-1] = 1
+        solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+        return solution[:-1], solution[-1]
+    for k in range(numGames):
+        # solving the indifference conditions exactly on the supports found, which are where each variable is larger than its dual slack
+        rows = np.flatnonzero(-l[k] > z[k, numCols:])
+        cols = np.flatnonzero(z[k, :numCols] > w[k, :numCols])
+        polishedQ, valueQ = indifferent(payoffs[k], rows, cols)
+        polishedP, valueP = indifferent(payoffs[k].T, cols, rows)
+        if len(rows) > 0 and len(cols) > 0 and polishedQ.min() >= -tol and polishedP.min() >= -tol and abs(valueQ - valueP) <= tol ** 0.5:
+            newP = np.zeros(numRows)
+            newQ = np.zeros(numCols)
+            newP[rows] = np.maximum(polishedP, 0)
+            newQ[cols] = np.maximum(polishedQ, 0)
+            # keeping the polished strategies only if they are still optimal
+            if (newP @ payoffs[k]).min() >= valueP - tol and (payoffs[k] @ newQ).max() <= valueQ + tol:
+                values[k], p[k], q[k] = valueP, newP, newQ
+    return values, p, q
+
+def contractStrategies(array, strategies, skip):
+    """Takes the expectation of an array over the mixed strategies of every player whose axis isn't skipped
+
+    Args:
+        array (np.ndarray): an array with one axis per player, e.g. one player's payoffs payoffTensor[x]
+        strategies (list): strategies[y] is player y + 1's mixed strategy
+        skip (list): the players whose axes are kept
+
+    Returns:
+        np.ndarray: the array with only the skipped players' axes left, in order
+    """
+    operands = [array, list(range(len(strategies)))]
+    for y in range(len(strategies)):
+        if y not in skip:
+            operands += [strategies[y], [y]]
+    return np.einsum(*operands, sorted(skip))
+
+def batchContract(operands, output, memoryLimit = 2 ** 25):
+    """Evaluates an einsum given in sublist form, allowing intermediates of up to memoryLimit elements
+
+    Args:
+        operands (list): alternating arrays and their lists of axis labels, as passed to np.einsum
+        output (list): the axis labels of the result
+        memoryLimit (int): the largest number of elements allowed in an intermediate
+
+    Returns:
+        np.ndarray: the contraction
+    """
+    path = np.einsum_path(*operands, output, optimize=("greedy", memoryLimit))[0]
+    return np.einsum(*operands, output, optimize=path)
+
+def deviationPayoffs(tensor, strategies):
+    """Computes each player's expected payoff from each of their pure strategies when the others play their mixed strategies
+
+    Args:
+        tensor (np.ndarray): the payoff tensor, of shape (numPlayers, s_1, ..., s_n)
+        strategies (list): strategies[y] is player y + 1's mixed strategy
+
+    Returns:
+        list: payoffs[x][k] is player x + 1's expected payoff from strategy k
+    """
+    return [contractStrategies(tensor[x], strategies, [x]) for x in range(len(strategies))]
+
+def mixedProfileError(strategies, numStrats, batch = False):
+    """Checks that mixed strategies fit a game, for the methods that take mixed profiles
+
+    Args:
+        strategies (list or np.ndarray): strategies[x] is player x + 1's mixed strategy, or an array of them, one per row, if batch. An array holding every player's strategies, one row per player, works too.
+        numStrats (list): the number of strategies of each player
+        batch (bool): whether the strategies are batches of mixed strategies
+
+    Returns:
+        str: a description of the problem, or None if there is none
+    """
+    if isinstance(strategies, np.ndarray) and strategies.ndim == 2 + batch:
+        strategies = list(strategies)
+    if not isinstance(strategies, (list, tuple)) or len(strategies) != len(numStrats):
+        return f"Expected a list of {len(numStrats)} mixed strategies, one for each player."
+    sizes = set()
+    for x in range(len(numStrats)):
+        shape = np.shape(strategies[x])
+        if len(shape) != 1 + batch or shape[-1] != numStrats[x]:
+            expected = f"an array of shape (numProfiles, {numStrats[x]})" if batch else f"{numStrats[x]} probabilities"
+            return f"Expected {expected} for player {x + 1}, but received shape {shape} instead."
+        sizes.add(shape[0])
+    if batch and len(sizes) > 1:
+        return f"Expected the same number of profiles for every player, but received {sorted(sizes)}."
+    return None
+
+def deviationJacobian(tensor, strategies):
+    """Computes the derivatives of the deviation payoffs with respect to the other players' probabilities
+
+    Args:
+        tensor (np.ndarray): the payoff tensor, of shape (numPlayers, s_1, ..., s_n)
+        strategies (list): strategies[y] is player y + 1's mixed strategy
+
+    Returns:
+        list: jacobian[x][y][k][l] is the derivative of player x + 1's payoff from strategy k with respect to the probability of player y + 1's strategy l, which is 0 when x == y
+    """
+    numPlayers = len(strategies)
+    jacobian = [[None] * numPlayers for x in range(numPlayers)]
+    for x in range(numPlayers):
+        for y in range(numPlayers):
+            if x == y:
+                jacobian[x][y] = np.zeros((len(strategies[x]), len(strategies[y])))
+            else:
+                block = contractStrategies(tensor[x], strategies, [x, y])
+                jacobian[x][y] = block if x < y else block.T
+    return jacobian
+
+def polishEquilibrium(tensor, strategies, tol = 1e-9, maxIter = 20):
+    """Turns approximate equilibrium strategies into an exact equilibrium, if there is one nearby
+
+    Args:
+        tensor (np.ndarray): the payoff tensor, of shape (numPlayers, s_1, ..., s_n)
+        strategies (list): strategies[y] is player y + 1's approximate mixed strategy
+        tol (float): the tolerance on the indifference conditions and on the gains from deviating
+        maxIter (int): the maximum number of Newton iterations for each guess
+
+    Returns:
+        list: the equilibrium [[p_1, ..., p_m], [q_1, ..., q_n], ...], or None if no guess gave one
+    """
+    numPlayers = len(strategies)
+    for threshold in [1e-2, 1e-4, 1e-6]:
+        supports = [np.flatnonzero(strategy >= threshold * strategy.max()) for strategy in strategies]
+        starts = np.cumsum([0] + [len(support) for support in supports])
+        current = [np.zeros(len(strategy)) for strategy in strategies]
+        for x in range(numPlayers):
+            current[x][supports[x]] = strategies[x][supports[x]] / strategies[x][supports[x]].sum()
+        for iteration in range(maxIter):
+            payoffs = deviationPayoffs(tensor, current)
+            jacobian = deviationJacobian(tensor, current)
+            # u_k - u_first = 0 on each support, and each support's probabilities add up to 1
+            values = []
+            rows = []
+            for x in range(numPlayers):
+                support = supports[x]
+                values.append(payoffs[x][support[1:]] - payoffs[x][support[0]])
+                values.append([current[x][support].sum() - 1])
+                block = np.zeros((len(support), starts[-1]))
+                for y in range(numPlayers):
+                    columns = jacobian[x][y][:, supports[y]]
+                    block[:-1, starts[y]:starts[y + 1]] = columns[support[1:]] - columns[support[0]]
+                block[-1, starts[x]:starts[x + 1]] = 1
+                rows.append(block)
+            values = np.concatenate(values)
+            residual = np.abs(values).max()
+            # Newton's method converges quickly from a good guess, so giving up on the guess once it stops improving
+            if residual <= tol or not residual < 1e3 or (iteration >= 3 and residual >= previousResidual):
+                break
+            previousResidual = residual
+            step = np.linalg.lstsq(np.vstack(rows), values, rcond=None)[0]
+            for x in range(numPlayers):
+                current[x][supports[x]] -= step[starts[x]:starts[x + 1]]
+        if not np.abs(values).max() <= tol or min(strategy.min() for strategy in current) < -tol:
+            continue
+        current = [np.maximum(strategy, 0) / np.maximum(strategy, 0).sum() for strategy in current]
+        # no player can gain by deviating to a strategy outside of their support
+        payoffs = deviationPayoffs(tensor, current)
+        if all(payoffs[x].max() <= current[x] @ payoffs[x] + tol for x in range(numPlayers)):
+            return [strategy.tolist() for strategy in current]
+    return None
+
+def parseNumbers(text):
+    """Parses whitespace- or comma-separated numbers in bulk, falling back to reading them one at a time when there are rationals such as 3/2, as in Gambit files
+
+    Args:
+        text (str): the numbers
+
+    Returns:
+        np.ndarray: the numbers, or None if some aren't numbers
+    """
+    text = text.replace(",", " ")
+    if not text.strip():
+        return np.zeros(0)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            return np.fromstring(text, sep=" ")
+    except (ValueError, DeprecationWarning):
+        try:
+            return np.array([float(Fraction(token)) for token in text.split()])
+        except (ValueError, ZeroDivisionError):
+            return None
+
+def levelLikelihood(counts, levelStrategies, probabilities, noise = 1e-3):
+    """Computes the log-likelihood of observed play under the level-k model and its gradient with respect to the level probabilities
+
+    Args:
+        counts (list): counts[x][s] is the number of observations where player x + 1 played strategy s
+        levelStrategies (np.ndarray): levelStrategies[r][x] is the strategy player x + 1 plays at level L_r, as in kStrategies
+        probabilities (np.ndarray): probabilities[x][r] is the probability that player x + 1 is L_r
+        noise (float): the probability of a uniformly random strategy, in (0, 1) so that every observation has a positive likelihood
+
+    Returns:
+        tuple: (logLikelihood, gradient), where gradient[x][r] is the derivative with respect to probabilities[x][r]
+    """
+    logLikelihood = 0.0
+    gradient = np.zeros(np.shape(probabilities))
+    for x in range(len(counts)):
+        numStrats = len(counts[x])
+        # the probability of each strategy is the total probability of the levels that play it
+        distribution = (1 - noise) * np.bincount(levelStrategies[:, x], weights=probabilities[x], minlength=numStrats) + noise / numStrats
+        observed = counts[x] > 0
+        with np.errstate(divide="ignore"):
+            logLikelihood += counts[x][observed] @ np.log(distribution[observed])
+            ratios = np.where(observed, counts[x] / np.where(observed, distribution, 1), 0)
+        gradient[x] = (1 - noise) * ratios[levelStrategies[:, x]]
+    return float(logLikelihood), gradient
 
 class ListNode:
     head = None
@@ -234,65 +883,134 @@ class ListNode:
                 print("Index not present")
         return
 
+class PayoffNode:
+    """A single payoff in a payoff tensor, exposed with the payoff and bestResponse attributes of a ListNode
+    """
+    def __init__(self, game, tensor, index):
+        self.game = game
+        self.tensor = tensor
+        self.index = index
+
+    @property
+    def payoff(self):
+        return self.tensor[self.index].item()
+
+    @payoff.setter
+    def payoff(self, val):
+        if self.game is not None and not self.tensor.flags.writeable and self.tensor is self.game.payoffTensor:
+            # read-only payoffs, such as a subgame's or a wrapped read-only buffer, are copied on the first write
+            self.tensor = self.game.detach()
+        self.tensor[self.index] = val
+        if self.game is not None:
+            self.game.clearCaches(self.index)
+
+    @property
+    def bestResponse(self):
+        if self.game is None or self.tensor is not self.game.payoffTensor:
+            return False
+        return bool(self.game.computeBestResponses()[self.index])
+
+    def printListNode(self, end=""):
+        print(formatPayoff(self.payoff), end="")
+        return
+
+class OutcomeView:
+    """The payoffs of one strategy profile, read from and written to the payoff tensor through the interface of a ListNode
+    """
+    def __init__(self, game, tensor, profile):
+        self.game = game
+        self.tensor = tensor
+        self.profile = tuple(profile)
+
+    def getListNode(self, index):
+        """Gets the index-th payoff of the outcome
+
+        Args:
+            index (int): the index of the player
+
+        Returns:
+            PayoffNode: the desired payoff
+        """
+        if index < 0 or index >= self.tensor.shape[0]:
+            print("Index not present")
+            return
+        return PayoffNode(self.game, self.tensor, (index,) + self.profile)
+
+    def print(self):
+        print(", ".join(formatPayoff(payoff) for payoff in self.tensor[(slice(None),) + self.profile]), end=" ")
+        return
+
+    def printBestResponse(self):
+        print(", ".join(str(int(self.getListNode(x).bestResponse)) for x in range(self.size())), end=" ")
+        return
+
+    def size(self):
+        return self.tensor.shape[0]
+
+    def updateListNode(self, val, index):
+        self.getListNode(index).payoff = val
+        return
+
+class PayoffMatrixView:
+    """Compatibility accessor that exposes a payoff tensor as the list of payoff arrays of ListNodes, i.e. payoffMatrix[m][i][j].getListNode(x)
+    """
+    def __init__(self, game, tensor, index = ()):
+        self.game = game
+        self.tensor = tensor
+        self.index = index
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self)
+        if k < 0 or k >= len(self):
+            raise IndexError("payoff index out of range")
+        if len(self.index) == 0: # k is m, the index of the payoff array
+            trailing = np.unravel_index(k, self.tensor.shape[3:], order="F")
+            return PayoffMatrixView(self.game, self.tensor, (None, None) + tuple(int(c) for c in trailing))
+        elif self.index[0] is None: # k is i, the row
+            return PayoffMatrixView(self.game, self.tensor, (k,) + self.index[1:])
+        else: # k is j, the column
+            return OutcomeView(self.game, self.tensor, (self.index[0], k) + self.index[2:])
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield self[k]
+
+    def __len__(self):
+        if len(self.index) == 0:
+            return int(np.prod(self.tensor.shape[3:]))
+        elif self.index[0] is None:
+            return self.tensor.shape[1]
+        return self.tensor.shape[2]
+
 class Player:
     kChoice = -1
     numStrats = -1
     rationality = -1
+    rationalityProbabilities = None
     
     def __init__(self,numStrats = 2, rationality = 0):
         self.kChoice = -1
         self.numStrats = numStrats
         self.rationality = rationality
+        self.rationalityProbabilities = None # probability the player is L_r, when fit separately for each player
 
 class SimGame:
-    kMatrix = []
-    kOutcomes = [] # n-tuples that appear in kMatrix; won't be all of them
-    kStrategies = [[] for r in range(4)] # 2D matrix containing the strategies each player would play for k-levels 0, 1, 2, 3
+    """A simultaneous game with n players, n >= 2.
+    
+    Every game keeps its own state; nothing mutable is shared between instances, so separate games can be built and solved concurrently in different threads.
+    
+    Thread safety: calls that only read the game may be made on one instance from many threads at once. These are computeBestResponses, computeCognitiveHierarchy, computeIESDS, computePureEquilibria, compareStrategies, findDominatedStrategies, isBestResponse, maxStrat, paretoOptimal, print, restrict, saveToFile, toIndex, toProfile, ravel, and unravel. Their caches, and the set of subgames that restrict adds to, are changed under the instance's lock. Calls that change the game (enterData, readFromFile, readFromBinaryFile, appendStrategy, removeStrategy, setPayoffTensor, the eliminateStrictlyDominatedStrategies methods, and the level-k methods, which store their results on the game) need exclusive access to the instance.
+    """
     maxRationality = 4
-    mixedEquilibria = []
     numIESDSSteps = 0
     numPlayers = -1
     originalNumPlayers = -1 
-    originalNumStrats = []
-    originalPayoffMatrix = []
-    outcomeProbabilities = [] # probability of each outcome in kMatrix stored in kOutcomes; P(i, j)
-    payoffMatrix = []
-    players = []
-    pureEquilibria = []
-    rationalityProbabilities = [0.0 for i in range(4)] # probability a player is L_i, i = 0, 1, 2, 3
-    removedCols = []
-    removedMatrices = []
-    removedRows = []
-    removedStrategies = []
-    strategyNames = []
     
     def __init__(self, numPlayers = 2):
         numStrats = [2 for i in range(numPlayers)]
         rationalities = [0 for i in range(numPlayers)]
-        self.players = [Player(numStrats[i], rationalities[0]) for i in range(numPlayers)]
-        
-        # Creating kStrategies' 4 arrays of lists of size numPlayers and setting rationalityProbabilities
-        for r in range(4):
-            # resizing self.kStrategies[r]
-            if numPlayers > len(self.kStrategies[r]):
-                self.kStrategies[r] += [None] * (numPlayers - len(self.kStrategies[r]))
-            else:
-                self.kStrategies[r] = self.kStrategies[r][:numPlayers]
-            self.rationalityProbabilities[r] = 0.0
-            
-        # maximum rationality is 3, meaning there are 4 rationality levels
-        numMatrices = 1
-        if numPlayers > 2:
-            for x in range(2, numPlayers):
-                numMatrices *= self.players[x].numStrats
-        
-        for m in range(numMatrices):
-            self.kMatrix.append([])
-            for i in range(4):
-                self.kMatrix[m].append([])
-                for j in range(4):
-                    ell = [-1 for x in range(self.numPlayers)]
-                    self.kMatrix[m][i].append(ell)
+        self.initializeState([Player(numStrats[i], rationalities[0]) for i in range(numPlayers)])
         
         # Initializing strategy names
         if self.players[0].numStrats < 3:
@@ -322,1380 +1040,803 @@ class SimGame:
                     center = ["C(" + str(x + 1) + ", " + str(s) + ")" for s in range(1, self.players[x].numStrats - 1)]
                 self.strategyNames.append(["L(" + str(x + 1) + ")"] + center + ["R(" + str(x + 1) + ")"])
         
-        self.numPlayers = numPlayers
-        
-        # Creating the payoff matrix
-        self.payoffMatrix = []
-        if self.numPlayers < 3:
-            matrix = []
-            for i in range(self.players[0].numStrats):
-                row = []
-                for j in range(self.players[1].numStrats):
-                    outcome = ListNode()
-                    outcome.append(0, True)
-                    row.append(outcome)                        
-                matrix.append(row)
-            self.payoffMatrix.append(matrix)
-        else:
-            numMatrices = 1
-            for x in range(2, self.numPlayers):
-                numMatrices *= self.players[x].numStrats
-            for m in range(numMatrices):
-                matrix = []
-                for i in range(self.players[0].numStrats):
-                    row = []
-                    for j in range(self.players[1].numStrats):
-                        outcome = ListNode()
-                        for x in range(1, self.numPlayers):
-                            outcome.append(0, True)
-                        row.append(outcome)                 
-                    matrix.append(row)
-                self.payoffMatrix.append(matrix)
+        # Creating the payoff tensor; payoffTensor[x][s_1]...[s_n] is player x + 1's payoff at the profile (s_1, ..., s_n)
+        self.setPayoffTensor(np.zeros((self.numPlayers,) + tuple(numStrats)))
         
         self.originalNumPlayers = self.numPlayers
         self.originalNumStrats = [self.players[x].numStrats for x in range(self.numPlayers)]
-        self.originalPayoffMatrix = self.payoffMatrix
+        self.originalPayoffTensor = self.payoffTensor
         return
     
+    @property
+    def payoffMatrix(self):
+        """The payoffs as a list of payoff arrays of outcomes, i.e. payoffMatrix[m][i][j].getListNode(x).payoff. Reads and writes go through to payoffTensor.
+        """
+        return PayoffMatrixView(self, self.payoffTensor)
+    
+    @payoffMatrix.setter
+    def payoffMatrix(self, matrices):
+        self.setPayoffTensor(matricesToTensor(np.array([[[outcomeToList(outcome) for outcome in row] for row in matrix] for matrix in matrices], dtype=float), [self.players[x].numStrats for x in range(self.numPlayers)]))
+    
+    @property
+    def originalPayoffMatrix(self):
+        """The payoffs from before strategies were eliminated, as a list of payoff arrays of outcomes
+        """
+        return PayoffMatrixView(None, self.originalPayoffTensor)
+    
     def appendStrategy(self, x, payoffs):
         """Appends a strategy to player x + 1's list of strategies
 
         Args:
             x (int): the index of the player
-            payoffs (list of lists of ListNodes or list of lists of lists of ListNodes): the payoffs of the strategy to be appended, lists of outcomes
+            payoffs (list of lists of ListNodes or list of lists of lists of ListNodes): the payoffs of the strategy to be appended, lists of outcomes. For x = 0, one row per payoff array; for x = 1, one column per payoff array; for x > 1, the payoff arrays to add, one for each combination of the other players' strategies.
         """
         if not isinstance(x, int):
             print(Fore.RED + f"appendStrategy: invalid input. Expected an integer player index, but received {x} instead." + Style.RESET_ALL)
             return
-        #################################################################
-        if x == 0: # add a new row to every matrix
-            # if list of list of lists, convert to list of list of ListNodes
-            if isinstance(payoffs[0][0], list):
-                newPayoffs = []
-                for row in payoffs:
-                    newRow = []
-                    for ell in row:
-                        if isinstance(ell, list):
-                            outcome = ListNode()
-                            outcome = outcome.load(ell)
-                            newRow.append(outcome)
-                        elif isinstance(ell, ListNode):
-                            newRow.append(ell)
-                        else:
-                            print(Fore.RED + f"appendStrategy: invalid input. The outcomes must be either lists or ListNodes. Received {type(ell).__name__} instead." + Style.RESET_ALL)
-                            return
-                    newPayoffs.append(newRow)
-                payoffs = newPayoffs
-            
-            # payoffs will be a list of list of ListNodes that should be numPlayers-long.
-            inputValid = True
-            numMatrices = 1
-            for y in range(2, self.numPlayers):
-                numMatrices *= self.players[y].numStrats
-            correctNumRows = True
-            if len(payoffs) != numMatrices:
-                correctNumRows = False
-                
-            correctNumOutcomes = True
-            for row in payoffs:
-                if len(row) != self.players[x].numStrats:
-                    wrongNumOutcomes = len(row)
-                    correctNumOutcomes = False
-                    break
-                
-            correctNumPayoffs = True
-            for row in payoffs:
-                for outcome in row:
-                    if outcome.size() != self.numPlayers:
-                        wrongSize = outcome.size()
-                        correctNumPayoffs = False
-                        
-            allFloats = True
-            broke = False
-            wrongType = ""
-            for row in payoffs:
-                for outcome in row:
-                    triple = outcome.checkIfFloats()
-                    if not triple[0]:
-                        wrongType = triple[1]
-                        # if wrongType is integer, we can simply convert it to a float
-                        if wrongType == "int":
-                            outcome = triple[2]
-                        else:
-                            allFloats = False
-                            broke = True
-                            break
-                if broke:
-                    break
-                    
-            if correctNumRows and correctNumOutcomes and correctNumPayoffs and isinstance(x, int) and x > -1 and x < self.numPlayers and isinstance(payoffs, list) and len(payoffs) > 0 and allFloats:
-                inputValid = True
-            else:
-                inputValid = False
-            if inputValid:
-                self.players[x].numStrats += 1
-                for m in range(numMatrices):
-                    self.payoffMatrix[m].append(payoffs[m])
-            elif not correctNumRows:
-                if numMatrices == 1:
-                    if len(payoffs) == 1:
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatrices} row, but {len(payoffs)} was provided." + Style.RESET_ALL)
-                    else: 
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatrices} row, but {len(payoffs)} were provided." + Style.RESET_ALL)
-                else:
-                    if len(payoffs) == 1:
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatrices} rows, but {len(payoffs)} was provided." + Style.RESET_ALL)
-                    else:
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatrices} rows, but {len(payoffs)} were provided." + Style.RESET_ALL)
-            elif not correctNumOutcomes:
-                if wrongNumOutcomes == 1:
-                    print(Fore.RED + f"appendStrategy: invalid input. Expected {self.players[x].numStrats} outcomes. Received a row with {wrongNumOutcomes} outcome." + Style.RESET_ALL)
-                else:
-                    print(Fore.RED + f"appendStrategy: invalid input. Expected {self.players[x].numStrats} outcomes. Received a row with {wrongNumOutcomes} outcomes." + Style.RESET_ALL)
-            elif not correctNumPayoffs:
-                if wrongSize == 1:
-                    print(Fore.RED + f"appendStrategy: invalid input. expected outcomes with {self.numPlayers} payoffs. An outcome with {wrongSize} payoff was provided." + Style.RESET_ALL)
-                else:
-                    print(Fore.RED + f"appendStrategy: invalid input. expected outcomes with {self.numPlayers} payoffs. An outcome with {wrongSize} payoffs was provided." + Style.RESET_ALL)
-            elif not isinstance(x, int):
-                print(Fore.RED + f"appendStrategy: invalid input. Expected an integer player index, but received {x} instead." + Style.RESET_ALL)
-            elif x < 0 or x >= self.numPlayers:
-                print(Fore.RED + f"appendStrategy: invalid input. Expected a player index between 0 and {self.numPlayers - 1}, but received {x} instead." + Style.RESET_ALL)
-            elif not isinstance(payoffs, list):
-                print(Fore.RED + f"appendStrategy: invalid input. Expected a list of payoffs, but received a {type(payoffs).__name__} instead" + Style.RESET_ALL)
-            elif len(payoffs) == 0:
-                print(Fore.RED + f"appendStrategy: invalid input. The payoffs parameter must be a nonempty list." + Style.RESET_ALL)
-            elif not allFloats:
-                print(Fore.RED + f"appendStrategy: invalid input. The payoffs must be floats. Received {wrongType} instead." + Style.RESET_ALL)      
-        #################################################################
-        elif x == 1: # add a new column to every matrix
-            # if list of list of lists, convert to list of list of ListNodes
-            if isinstance(payoffs[0][0], list):
-                newPayoffs = []
-                for col in payoffs:
-                    newCol = []
-                    for ell in col:
-                        if isinstance(ell, list):
-                            outcome = ListNode()
-                            outcome = outcome.load(ell)
-                            newCol.append(outcome)
-                        elif isinstance(ell, ListNode):
-                            newCol.append(ell)
-                        else:
-                            print(Fore.RED + f"appendStrategy: invalid input. The outcomes must be either lists or ListNodes. Received {type(ell).__name__} instead." + Style.RESET_ALL)
-                            return
-                    newPayoffs.append(newCol)
-                payoffs = newPayoffs
-            
-            inputValid = True
-            numMatrices = 1
-            for y in range(2, self.numPlayers):
-                numMatrices *= self.players[y].numStrats
-            correctNumCols = True
-            if len(payoffs) != numMatrices:
-                correctNumRows = False
-            
-            correctNumOutcomes = True
-            for col in payoffs:
-                if len(col) != self.players[x].numStrats:
-                    wrongNumOutcomes = len(col)
-                    correctNumOutcomes = False
-                    break
-                
-            correctNumPayoffs = True
-            for row in payoffs:
-                for outcome in row:
-                    if isinstance(outcome, ListNode):
-                        if outcome.size() != self.numPlayers:
-                            wrongSize = outcome.size()
-                            correctNumPayoffs = False
-                    elif isinstance(outcome, list):
-                        if len(outcome) != self.numPlayers:
-                            wrongSize = outcome.size()
-                            correctNumPayoffs = False
-                    else:
-                        print(Fore.RED + f"appendStrategy: invalid input. Outcomes must be either lists or ListNodes. Received {type(outcome).__name__} instead." + Style.RESET_ALL) 
-                        
-            allFloats = True
-            broke = False
-            wrongType = ""
-            for row in payoffs:
-                for outcome in row:
-                    if isinstance(outcome, ListNode): 
-                        triple = outcome.checkIfFloats()
-                        if not triple[0]:
-                            wrongType = triple[1]
-                            if wrongType == "int":
-                                outcome = triple[2]
-                            else:
-                                allFloats = False
-                                broke = True
-                                break
-                    elif isinstance(outcome, list):
-                        triple = checkIfFloats(outcome)
-                        if not triple[0]:
-                            wrongType = triple[1]
-                            if wrongType == "int":
-                                outcome = triple[2]
-                            else:
-                                allFloats = False
-                                broke = True
-                                break
-                if broke:
-                    break
-                        
-            if correctNumCols and correctNumOutcomes and correctNumPayoffs and isinstance(x, int) and x > -1 and x < self.numPlayers and isinstance(payoffs, list) and len(payoffs) > 0 and allFloats:
-                inputValid = True
-            else:
-                inputValid = False
-            if inputValid:
-                self.players[x].numStrats += 1
-                
-                for m in range(numMatrices):
-                    # FIXME
-                    print("len 1: ", len(self.payoffMatrix[m]))
-                    print("len 2: ", len(payoffs[m]))
-                    for j in range(len(payoffs[0])):
-                        print("\tj: ", j)
-                        self.payoffMatrix[m][j].append(payoffs[m][j])
-            elif not correctNumCols:
-                if numMatrices == 1:
-                    if len(payoffs) == 1:
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatrices} column, but {len(payoffs)} was provided." + Style.RESET_ALL)
-                    else:
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatrices} column, but {len(payoffs)} were provided." + Style.RESET_ALL)
-                else:
-                    if len(payoffs) == 1:
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatrices} columns, but {len(payoffs)} was provided." + Style.RESET_ALL)
-                    else:
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatrices} columns, but {len(payoffs)} were provided." + Style.RESET_ALL)
-            elif not correctNumOutcomes:
-                if wrongNumOutcomes == 1:
-                    print(Fore.RED + f"appendStrategy: invalid input. Expected {self.players[x].numStrats} outcomes. Received a column with {wrongNumOutcomes} outcome." + Style.RESET_ALL)
-                else:
-                    print(Fore.RED + f"appendStrategy: invalid input. Expected {self.players[x].numStrats} outcomes. Received a column with {wrongNumOutcomes} outcomes." + Style.RESET_ALL)
-            elif not correctNumPayoffs:
-                if wrongSize == 1:
-                    print(Fore.RED + f"appendStrategy: invalid input. expected outcomes with {self.numPlayers} payoffs. An outcome with {wrongSize} payoff was provided." + Style.RESET_ALL)
-                else:
-                    print(Fore.RED + f"appendStrategy: invalid input. expected outcomes with {self.numPlayers} payoffs. An outcome with {wrongSize} payoffs was provided." + Style.RESET_ALL)
-            elif not isinstance(x, int):
-                print(Fore.RED + f"appendStrategy: invalid input. Expected an integer player index, but received {x} instead." + Style.RESET_ALL)
-            elif x < 0 or x >= self.numPlayers:
-                print(Fore.RED + f"appendStrategy: invalid input. Expected a player index between 0 and {self.numPlayers - 1}, but received {x} instead." + Style.RESET_ALL)
-            elif not isinstance(payoffs, list):
-                print(Fore.RED + f"appendStrategy: invalid input. Expected a list of payoffs, but received a {type(payoffs).__name__} instead" + Style.RESET_ALL)
-            elif len(payoffs) == 0:
-                print(Fore.RED + f"appendStrategy: invalid input. The payoffs parameter must be a nonempty list." + Style.RESET_ALL)
-            elif not allFloats:
-                print(Fore.RED + f"appendStrategy: invalid input. The payoffs must be floats. Received {wrongType} instead." + Style.RESET_ALL)  
-        #################################################################
+        if x < 0 or x >= self.numPlayers:
+            print(Fore.RED + f"appendStrategy: invalid input. Expected a player index between 0 and {self.numPlayers - 1}, but received {x} instead." + Style.RESET_ALL)
+            return
+        if not isinstance(payoffs, list):
+            print(Fore.RED + f"appendStrategy: invalid input. Expected a list of payoffs, but received a {type(payoffs).__name__} instead" + Style.RESET_ALL)
+            return
+        if len(payoffs) == 0:
+            print(Fore.RED + f"appendStrategy: invalid input. The payoffs parameter must be a nonempty list." + Style.RESET_ALL)
+            return
+        
+        # The shape of the game after appending, with player x having only the new strategy
+        newNumStrats = [self.players[y].numStrats for y in range(self.numPlayers)]
+        newNumStrats[x] = 1
+        numMatrices = 1
+        for y in range(2, self.numPlayers):
+            numMatrices *= newNumStrats[y]
+        if x == 0:
+            expectedShape = (numMatrices, self.players[1].numStrats)
+            containers = ["row", "rows", "outcome", "outcomes"]
+        elif x == 1:
+            expectedShape = (numMatrices, self.players[0].numStrats)
+            containers = ["column", "columns", "outcome", "outcomes"]
         else: # x > 1 add new matrices
-            # if list of list of lists, convert to list of list of ListNodes
-            if isinstance(payoffs[0][0][0], list):
-                newPayoffs = []
-                for matrix in payoffs:
-                    newMatrix = []
-                    for col in matrix:
-                        newCol = []
-                        for ell in col:
-                            if isinstance(ell, list):
-                                outcome = ListNode()
-                                outcome = outcome.load(ell)
-                                newCol.append(outcome)
-                            elif isinstance(ell, ListNode):
-                                newCol.append(ell)
-                            else:
-                                print(Fore.RED + f"appendStrategy: invalid input. The outcomes must be either lists or ListNodes. Received {type(ell).__name__} instead." + Style.RESET_ALL)
-                                return
-                        newMatrix.append(newCol)
-                    newPayoffs.append(newMatrix)
-                payoffs = newPayoffs
-            # We want to insert after the product of numStrats *below* player x + 1 for each number 1, 2,...,prodNumStratsAboveX, *plus* the number of matrices we've added
-            inputValid = True
-            numMatricesToAdd = 1
-            for y in range(2, self.numPlayers):
-                if y != x:
-                    numMatricesToAdd *= self.players[y].numStrats
-            correctNumMatrices = True
-            if len(payoffs) != numMatricesToAdd:
-                correctNumMatrices = False
-            
-            # Ensuring the arrays have the correct dimensions
-            correctNumRows = True
-            correctNumCols = True
-            broke = False
-            for matrix in payoffs:
-                if len(matrix) != self.players[0].numStrats:
-                    wrongNumRows = len(matrix)
-                    correctNumRows = False
-                for row in matrix:
-                    if len(row) != self.players[1].numStrats:
-                        wrongNumCols = len(row)
-                        correctNumCols = False
-                        broke = True
-                        break
-                if broke:
-                    break
-            
-            correctNumPayoffs = True
-            for matrix in payoffs:
-                for row in matrix:
-                    for outcome in row:
-                        if outcome.size() != self.numPlayers:
-                            wrongSize = outcome.size()
-                            correctNumPayoffs = False
-            
-            # Ensuring all the payoffs are floats
-            allFloats = True
-            broke = False
-            wrongType = ""
-            for matrix in payoffs:
-                for row in matrix:
-                    for outcome in row:
-                        triple = outcome.checkIfFloats()
-                        if not triple[0]:
-                            wrongType = triple[1]
-                            if wrongType == "int":
-                                outcome = triple[2]
-                            else:
-                                allFloats = False
-                                broke = True
-                                break
-                    if broke:
-                        if not broke:
-                            broke = True
-                        break   
-                if broke:
-                    break
-            
-            # Input validation
-            if correctNumMatrices and correctNumRows and correctNumCols and correctNumPayoffs and isinstance(x, int) and x > -1 and x < self.numPlayers and isinstance(payoffs, list) and len(payoffs) > 0 and allFloats:
-                inputValid = True
-            else:
-                inputValid = False
-            if inputValid:
-                numMatricesBeforeX = 1
-                for y in range(2, x):
-                    numMatricesBeforeX *= self.players[y].numStrats
-                numMatricesUpToX = 1
-                for y in range(2, x + 1):
-                    numMatricesUpToX *= self.players[y].numStrats
-                productNumStratsAboveX = 1
-                for y in range(x + 1, self.numPlayers):
-                    productNumStratsAboveX *= self.players[y].numStrats
-                numMatricesAdded = 0
-                multiplicand = 1
-                while len(payoffs) > 0:
-                    # Inserting the new matrix
-                    self.payoffMatrix.insert(numMatricesUpToX * multiplicand + numMatricesAdded, payoffs[0])
-                    payoffs.pop(0)
-                    numMatricesAdded += 1
-                    if numMatricesAdded % numMatricesBeforeX == 0:
-                        multiplicand += 1
-                self.players[x].numStrats += 1
-            elif not correctNumMatrices:
-                if numMatricesToAdd == 1:
-                    if len(payoffs) == 1:
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatricesToAdd} array. Payoffs with {len(payoffs)} array were provided." + Style.RESET_ALL)
-                    else: 
-                        print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatricesToAdd} array. Payoffs with {len(payoffs)} arrays were provided." + Style.RESET_ALL)
-                else:
-                    print(Fore.RED + f"appendStrategy: invalid input. Expected {numMatricesToAdd} arrays. Payoffs with {len(payoffs)} arrays were provided." + Style.RESET_ALL)
-            elif not correctNumRows and not correctNumCols:
-                print(Fore.RED + f"appendStrategy: invalid input. Expected arrays with {self.players[0].numStrats} rows and {self.players[1].numStrats} columns. An array with {wrongNumRows} rows and {wrongNumCols} columns was provided." + Style.RESET_ALL)
-            elif not correctNumRows and correctNumCols:
-                print(Fore.RED + f"appendStrategy: invalid input. Expected arrays with {self.players[0].numStrats} rows and {self.players[1].numStrats} columns. An array with {wrongNumRows} rows was provided." + Style.RESET_ALL)
-            elif correctNumRows and not correctNumCols:
-                print(Fore.RED + f"appendStrategy: invalid input. Expected arrays with {self.players[0].numStrats} rows and {self.players[1].numStrats} columns. An array with {wrongNumCols} columns was provided." + Style.RESET_ALL)
-            elif not correctNumRows:
-                if wrongNumRows == 1:
-                    print(Fore.RED + f"appendStrategy: invalid input. Expected arrays with {self.players[0].numStrats} rows. Received a matrix with {wrongNumRows} row.")
-                else:
-                    print(Fore.RED + f"appendStrategy: invalid input. Expected arrays with {self.players[0].numStrats} rows. Received a matrix with {wrongNumRows} rows.")
-            elif not correctNumCols:
-                if wrongNumRows == 1:
-                    print(Fore.RED + f"appendStrategy: invalid input. Expected arrays with {self.players[0].numStrats} columns. Received a matrix with {wrongNumCols} colum.")
-                else:
-                    print(Fore.RED + f"appendStrategy: invalid input. Expected arrays with {self.players[0].numStrats} rows. Received a matrix with {wrongNumCols} columns.")
-            elif not correctNumPayoffs:
-                if wrongSize == 1:
-                    print(Fore.RED + f"appendStrategy: invalid input. expected outcomes with {self.numPlayers} payoffs. An outcome with {wrongSize} payoff was provided." + Style.RESET_ALL)
+            expectedShape = (numMatrices, self.players[0].numStrats, self.players[1].numStrats)
+            containers = ["array", "arrays", "row", "rows"]
+        
+        # converting the ListNodes and lists to a single array of payoffs
+        def convert(entry, depth):
+            if depth == len(expectedShape):
+                outcome = outcomeToList(entry)
+                if outcome is None:
+                    print(Fore.RED + f"appendStrategy: invalid input. The outcomes must be either lists or ListNodes. Received {type(entry).__name__} instead." + Style.RESET_ALL)
+                    return None
+                if len(outcome) != self.numPlayers:
+                    if len(outcome) == 1:
+                        print(Fore.RED + f"appendStrategy: invalid input. expected outcomes with {self.numPlayers} payoffs. An outcome with {len(outcome)} payoff was provided." + Style.RESET_ALL)
+                    else:
+                        print(Fore.RED + f"appendStrategy: invalid input. expected outcomes with {self.numPlayers} payoffs. An outcome with {len(outcome)} payoffs was provided." + Style.RESET_ALL)
+                    return None
+                for payoff in outcome:
+                    if isinstance(payoff, bool) or not isinstance(payoff, (int, float, np.integer, np.floating)):
+                        print(Fore.RED + f"appendStrategy: invalid input. The payoffs must be floats. Received {type(payoff).__name__} instead." + Style.RESET_ALL)
+                        return None
+                return [float(payoff) for payoff in outcome]
+            if len(entry) != expectedShape[depth]:
+                if depth == 0:
+                    noun = containers[0] if expectedShape[0] == 1 else containers[1]
+                    verb = "was" if len(entry) == 1 else "were"
+                    print(Fore.RED + f"appendStrategy: invalid input. Expected {expectedShape[0]} {noun}, but {len(entry)} {verb} provided." + Style.RESET_ALL)
                 else:
-                    print(Fore.RED + f"appendStrategy: invalid input. expected outcomes with {self.numPlayers} payoffs. An outcome with {wrongSize} payoffs was provided." + Style.RESET_ALL)
-            elif not isinstance(x, int):
-                print(Fore.RED + f"appendStrategy: invalid input. Expected an integer player index, but received {x} instead." + Style.RESET_ALL)
-            elif x < 0 or x >= self.numPlayers:
-                print(Fore.RED + f"appendStrategy: invalid input. Expected a player index between 0 and {self.numPlayers - 1}, but received {x} instead." + Style.RESET_ALL)
-            elif not isinstance(payoffs, list):
-                print(Fore.RED + f"appendStrategy: invalid input. Expected a list of payoffs, but received a {type(payoffs).__name__} instead" + Style.RESET_ALL)
-            elif len(payoffs) == 0:
-                print(Fore.RED + f"appendStrategy: invalid input. The payoffs parameter must be a nonempty list." + Style.RESET_ALL)
-            elif not allFloats:
-                print(Fore.RED + f"appendStrategy: invalid input. The payoffs must be floats. Received {wrongType} instead." + Style.RESET_ALL)
+                    noun = containers[2] if len(entry) == 1 else containers[3]
+                    print(Fore.RED + f"appendStrategy: invalid input. Expected {expectedShape[depth]} {containers[3]}. Received {len(entry)} {noun}." + Style.RESET_ALL)
+                return None
+            converted = []
+            for item in entry:
+                item = convert(item, depth + 1)
+                if item is None:
+                    return None
+                converted.append(item)
+            return converted
+        
+        newPayoffs = convert(payoffs, 0)
+        if newPayoffs is None:
+            return
+        newPayoffs = np.array(newPayoffs, dtype=float)
+        if x == 0:
+            newPayoffs = newPayoffs[:, np.newaxis, :, :]
+        elif x == 1:
+            newPayoffs = newPayoffs[:, :, np.newaxis, :]
+        
+        self.appendStrategies(x, matricesToTensor(newPayoffs, newNumStrats))
         return
     
-    def computeBestResponses(self):
-        if self.numPlayers < 3:
-            for i in range(self.players[0].numStrats):
-                for j in range(self.players[1].numStrats):
-                    br = self.isBestResponse([i, j])
-                    for x in range(self.numPlayers):
-                        self.payoffMatrix[0][i][j].getListNode(x).bestResponse = br[x]
-        else: 
-            for m in range(len(self.payoffMatrix)):
-                for i in range(self.players[0].numStrats):
-                    for j in range(self.players[1].numStrats):
-                        br = self.isBestResponse([i, j] + self.toProfile(m)[2:])
-                        for x in range(self.numPlayers):
-                            self.payoffMatrix[m][i][j].getListNode(x).bestResponse = br[x]
-        return
+    def appendStrategies(self, x, block):
+        """Appends many strategies to player x + 1's list of strategies at once
 
-    def computeEquilibria(self):
-        equilibria = self.computePureEquilibria() + self.computeMixedEquilibria()
-        numEquilibria = len(equilibria)
-        if numEquilibria % 2 == 0:
-            warnings.warn(f"An even number ({numEquilibria}) of equilibria was returned. This indicates that the game is degenerate. Consider using another algorithm to investigate.", RuntimeWarning)
-        return equilibria
-    
-    def computeKChoices(self):
-        computeKStrategies()
+        Args:
+            x (int): the index of the player
+            block (np.ndarray): the payoffs of the new strategies in the layout of the payoff tensor, of shape (numPlayers, s_1, ..., k, ..., s_n) with the k new strategies on player x + 1's axis
+        """
+        if isinstance(x, bool) or not isinstance(x, (int, np.integer)) or x < 0 or x >= self.numPlayers:
+            print(Fore.RED + f"appendStrategies: invalid input. Expected a player index between 0 and {self.numPlayers - 1}, but received {x} instead." + Style.RESET_ALL)
+            return
+        block = np.asarray(block, dtype=float)
+        shape = list(self.payoffTensor.shape)
+        if block.ndim != len(shape) or any(block.shape[k] != shape[k] for k in range(len(shape)) if k != x + 1):
+            shape[x + 1] = "k"
+            print(Fore.RED + f"appendStrategies: invalid input. Expected payoffs of shape ({', '.join(str(k) for k in shape)}), but received shape {block.shape} instead." + Style.RESET_ALL)
+            return
+        
+        size = shape[x + 1]
+        capacity = size if self.payoffBuffer is None else self.payoffBuffer.shape[x + 1]
+        if self.payoffBuffer is None or size + block.shape[x + 1] > capacity:
+            self.reserve(x, max(size + block.shape[x + 1], 2 * capacity))
+        shape[x + 1] = size + block.shape[x + 1]
+        corner = tuple(slice(0, k) for k in shape)
+        newStrategies = corner[:x + 1] + (slice(size, shape[x + 1]),) + corner[x + 2:]
+        self.payoffBuffer[newStrategies] = block
+        self.setPayoffTensor(self.payoffBuffer[corner])
+        # the new strategies are numbered, as fromNFG numbers unnamed strategies
+        names = list(self.strategyNames[x][:size])
+        self.strategyNames[x] = names + [str(s + 1) for s in range(len(names), shape[x + 1])]
         return
     
-    def computeKExpectedUtilities(self):
-        EU = [0.0 for x in range(self.numPlayers)]
-        for x in range(self.numPlayers):
-            EU[x] = 0.0
-            for num in range(len(self.kOutcomes)):
-                if self.numPlayers < 3:
-                    curList = self.payoffMatrix[0][self.kOutcomes[num][0]][self.kOutcomes[num][1]]
-                else:
-                    curList = payoffMatrix[self.toIndex(self.kOutcomes[num])][self.kOutcomes[num][0]][self.kOutcomes[num][1]]
-                EU[x] += curList.getListNode(x).payoff * self.outcomeProbabilities[num]
-        return EU
-    
-    def computeKMatrix(self, probabilities):
-        """Computes the kMatrix as well as kOutcomes in the process
-        """
-        curEntry = []
-        temp = []
-        inOutcomes = False
-        probability = -1.0
-        self.kOutcomes = []
-        self.computeKStrategies()
-        for m in range(len(self.kMatrix)):
-            for r1 in range(4):
-                for r2 in range(4):
-                    temp.append(self.kStrategies[r1][0])
-                    temp.append(self.kStrategies[r2][1])
-                    for x in range(2, self.numPlayers):
-                        temp.append(kStrategies[kToProfile(m)[x]][x])
-                        
-                    self.kMatrix[m][r1][r2] = temp
-                    
-                    inOutcomes = False
-                    for n in range(len(self.kOutcomes)):
-                        if self.kOutcomes[n] == temp:
-                            inOutcomes = True
-                    if not inOutcomes:
-                        self.kOutcomes.append(temp)
-                    temp = []
-        
-        self.computeOutcomeProbabilities()
-        
-        EU = self.computeKExpectedUtilities()
-                
-        self.probabilizeKChoices()
-        print()
+    def batchDeviationPayoffs(self, mixedProfiles, player):
+        """Computes a player's expected payoff from each of their pure strategies against many mixed profiles of the other players at once, with a single einsum
+
+        Args:
+            mixedProfiles (list of np.ndarrays): mixedProfiles[y][k] is player y + 1's mixed strategy in profile k. The player's own entry is only checked for its shape.
+            player (int): the index of the player
+
+        Returns:
+            np.ndarray: payoffs[k][s] is the player's expected payoff from strategy s against profile k
+        """
+        error = mixedProfileError(mixedProfiles, [self.players[x].numStrats for x in range(self.numPlayers)], batch=True)
+        if error is not None:
+            print(Fore.RED + "batchDeviationPayoffs: invalid input. " + error + Style.RESET_ALL)
+            return
+        operands = [self.payoffTensor[player], list(range(1, self.numPlayers + 1))]
+        for y in range(self.numPlayers):
+            if y != player:
+                operands += [np.asarray(mixedProfiles[y], dtype=float), [0, y + 1]]
+        return batchContract(operands, [0, player + 1])
+    
+    def batchExpectedPayoffs(self, mixedProfiles):
+        """Computes every player's expected payoff under many mixed profiles at once, with a single einsum over the payoff tensor
+
+        Args:
+            mixedProfiles (list of np.ndarrays): mixedProfiles[x][k] is player x + 1's mixed strategy in profile k
+
+        Returns:
+            np.ndarray: payoffs[k][x] is player x + 1's expected payoff under profile k
+        """
+        error = mixedProfileError(mixedProfiles, [self.players[x].numStrats for x in range(self.numPlayers)], batch=True)
+        if error is not None:
+            print(Fore.RED + "batchExpectedPayoffs: invalid input. " + error + Style.RESET_ALL)
+            return
+        operands = [self.payoffTensor, list(range(1, self.numPlayers + 2))]
         for x in range(self.numPlayers):
-            print("EU_" + str(x) + " = " + str(EU[x]))
-        
-    def computeKOutcomes(self):
-        """Computes kOutcomes
+            operands += [np.asarray(mixedProfiles[x], dtype=float), [0, x + 2]]
+        return batchContract(operands, [0, 1])
+    
+    def batchIsEpsilonEquilibrium(self, profiles, eps = 1e-9):
+        """Checks many profiles at once for whether they are epsilon-equilibria. See batchRegret.
+
+        Args:
+            profiles (np.ndarray or list of np.ndarrays): the profiles, pure or mixed, as accepted by batchRegret
+            eps (float): the largest gain from deviating that is allowed
+
+        Returns:
+            np.ndarray: whether each profile is an epsilon-equilibrium
         """
-        curEntry = []
-        temp = []
-        inOutcomes = False
-        probability = -1.0
-        EU = [0.0 for x in range(self.numPlayers)]
-        self.kOutcomes = []
-        self.computeKStrategies()
-        for m in range(len(self.kMatrix)):
-            for r1 in range(4):
-                for r2 in range(4):
-                    temp.append(self.kStrategies[r1][0])
-                    temp.append(self.kStrategies[r2][1])
-                    for x in range(2, self.numPlayers):
-                        temp.append(kStrategies[kToProfile(m)[x]][x])
-                    
-                    inOutcomes = False
-                    for n in range(len(self.kOutcomes)):
-                        if self.kOutcomes[n] == temp:
-                            inOutcomes = True
-                    if not inOutcomes:
-                        self.kOutcomes.append(temp)
-                    temp = []
-    
-    def computeKStrategies(self):
-        """Computes the strategies that would be chosen for each rationality level
+        regrets = self.batchRegret(profiles)
+        if regrets is None:
+            return
+        return regrets.max(axis=1) <= eps
+    
+    def batchRegret(self, profiles):
+        """Computes how much each player could gain by deviating to a pure strategy, for many profiles at once
+
+        Args:
+            profiles (np.ndarray or list of np.ndarrays): either an integer array of shape (numProfiles, numPlayers) of pure profiles, or mixed profiles as a list with one array of shape (numProfiles, s_x) per player, or a single array of shape (numPlayers, numProfiles, s), where profiles[x][k] is player x + 1's mixed strategy in profile k
+
+        Returns:
+            np.ndarray: regrets[k][x] is how much player x + 1 could gain by deviating from profile k
         """
-        self.computeBestResponses()
-        maxStrat = -10000000
-        num = -1
-        others = []
-        
-        for r in range(4):
+        numStrats = [self.players[x].numStrats for x in range(self.numPlayers)]
+        if isinstance(profiles, np.ndarray) and profiles.ndim == 3 or isinstance(profiles, (list, tuple)) and len(profiles) == self.numPlayers and all(np.ndim(strategies) == 2 for strategies in profiles):
+            error = mixedProfileError(profiles, numStrats, batch=True)
+            if error is not None:
+                print(Fore.RED + "batchRegret: invalid input. " + error + Style.RESET_ALL)
+                return
+            regrets = np.empty((len(profiles[0]), self.numPlayers))
             for x in range(self.numPlayers):
-                maxStrat = -10000000
-                
-                if r == 0:
-                    num = self.maxStrat(x) # num is what player x will do at L_0
-                    self.kStrategies[0][x] = num
-                else:
-                    others = [0 for y in range(self.numPlayers)]
-                    for y in range(self.numPlayers):
-                        if y == x:
-                            others[y] = -1
-                        else:
-                            others[y] = self.kStrategies[r - 1][y]
-                            
-                    # Finding the maximum in each row/column/array that has already been chosen
-                    if x == 0:
-                        for i in range(self.players[x].numStrats):
-                            if self.payoffMatrix[self.toIndex(others)][i][others[1]].getListNode(x).bestResponse:
-                                maxStrat = i
-                    elif x == 1:
-                        for j in range(self.players[x].numStrats):
-                            if self.payoffMatrix[self.toIndex(others)][others[0]][j].getListNode(x).bestResponse:
-                                maxStrat = j
-                    else: # x > 1
-                        for m in range(len(self.payoffMatrix)):
-                            for i in range(self.players[0].numStrats):
-                                for j in range(self.players[1].numStrats):
-                                    if self.payoffMatrix[m][others[0]][others[1]].getListNode(x).bestResponse:
-                                        maxStrat = self.toProfile(m)[x]
-                    self.kStrategies[r][x] = maxStrat
-                if r == self.players[x].rationality:
-                    self.players[x].kChoice = self.kStrategies[r][x]
+                payoffs = self.batchDeviationPayoffs(profiles, x)
+                regrets[:, x] = payoffs.max(axis=1) - np.einsum("ks,ks->k", payoffs, np.asarray(profiles[x], dtype=float))
+            return regrets
+        
+        profiles = np.asarray(profiles)
+        if profiles.ndim != 2 or profiles.shape[1] != self.numPlayers or not np.issubdtype(profiles.dtype, np.integer) or np.any(profiles < 0) or np.any(profiles >= numStrats):
+            print(Fore.RED + f"batchRegret: invalid input. Expected an integer array of shape (numProfiles, {self.numPlayers}) of pure profiles or a list of {self.numPlayers} arrays of mixed strategies." + Style.RESET_ALL)
+            return
+        regrets = np.empty(profiles.shape)
+        for x in range(self.numPlayers):
+            # the payoffs of every one of player x + 1's strategies with the others' strategies fixed
+            index = [profiles[:, y, np.newaxis] for y in range(self.numPlayers)]
+            index[x] = np.arange(numStrats[x])
+            payoffs = self.payoffTensor[x][tuple(index)]
+            regrets[:, x] = payoffs.max(axis=1) - payoffs[np.arange(len(profiles)), profiles[:, x]]
+        return regrets
+    
+    def clearCaches(self, index = None):
+        """Discards everything computed from the payoffs. Called whenever the payoff tensor changes.
+
+        Args:
+            index (tuple of ints): the (x, s_1, ..., s_n) of the payoff that changed, if only one did, so that subgames copy just that payoff
+        """
+        self.bestResponseMask = None
+        self.version += 1
+        if index is not None:
+            with self.lock:
+                subgames = list(self.subgames)
+            for subgame in subgames:
+                subgame.parentChanged(index)
         return
+    
+    def compareStrategies(self, x, a, b):
+        """Compares two of player x + 1's strategies over every combination of the other players' strategies
 
-    def computeMixedEquilibria(self):       
-        if self.numPlayers < 3:
-            pVars = []
-            for i in range(self.players[0].numStrats - 1):
-                pVars.append(sympy.symbols('p_' + str(i)))
-            qVars = []
-            for j in range(self.players[1].numStrats - 1):
-                qVars.append(sympy.symbols('q_' + str(j)))
-            # Getting the coefficients for the polynomials, EU_1_coefs[n] is the set of coefficients for the n-th polynomial
-            EU_1_coefs = []
-            EU_2_coefs = []
-            for i in range(self.players[0].numStrats):
-                EU_1_coefs.append([self.payoffMatrix[0][i][j].getListNode(0).payoff for j in range(self.players[1].numStrats)])
-            for j in range(self.players[0].numStrats):
-                EU_2_coefs.append([self.payoffMatrix[0][i][j].getListNode(1).payoff for i in range(self.players[0].numStrats)])
-            
-            # Building polynomials for player 1
-            polynomials1 = []
-            for i in range(self.players[0].numStrats):
-                poly = 0
-                # building all but the last terms in poly
-                # it's range(nS1 - 1) because there are that many variables for all but he last term
-                for j in range(self.players[1].numStrats - 1):
-                    poly += EU_1_coefs[i][j] * qVars[j]
-                # building the last 1 - q0 - q1 - ... - qnS1 term
-                lastTerm = 1
-                for j in range(self.players[1].numStrats - 1):
-                    lastTerm -= qVars[j]
-                poly += EU_1_coefs[i][self.players[1].numStrats - 1] * lastTerm
-                polynomials1.append(poly)
-                
-            # Building polynomials for player 2
-            polynomials2 = []
-            for j in range(self.players[1].numStrats):
-                poly = 0
-                # building all but the last terms in poly
-                # it's range(nS0 - 1) because there are that many variables for all but he last term
-                for i in range(self.players[0].numStrats - 1):
-                    poly += EU_2_coefs[j][i] * pVars[i]
-                # building the last 1 - q0 - q1 - ... - qnS1 term
-                lastTerm = 1
-                for i in range(self.players[0].numStrats - 1):
-                    lastTerm -= pVars[i]
-                poly += EU_2_coefs[j][self.players[0].numStrats - 1] * lastTerm
-                polynomials2.append(poly)
-            
-            # Collecting the equations to be solved
-            equations1 = []
-            if self.players[0].numStrats % 2 == 0:
-                for i in range(0, self.players[0].numStrats, 2):
-                    equations1.append(sympy.Eq(polynomials1[i], polynomials1[i + 1]))
-            else:
-                for i in range(0, self.players[0].numStrats - 1, 2):
-                    equations1.append(sympy.Eq(polynomials1[i], polynomials1[i + 1]))
-                    # adding an equation that contains the last polynomial
-                    equations1.append(sympy.Eq(polynomials1[0], polynomials1[-1]))
-                    
-            equations2 = []
-            if self.players[1].numStrats % 2 == 0:
-                for j in range(0, self.players[1].numStrats, 2):
-                    equations2.append(sympy.Eq(polynomials2[j], polynomials2[j + 1]))
-            else:
-                for j in range(0, self.players[1].numStrats - 1, 2):
-                    equations2.append(sympy.Eq(polynomials2[j], polynomials2[j + 1]))
-                    # adding an equation that contains the last polynomial
-                    equations2.append(sympy.Eq(polynomials2[0], polynomials2[-1]))
-            
-            # solving the equations
-            dict1 = sympy.solve(tuple(equations1), tuple(qVars), set=True)
-            dict2 = sympy.solve(tuple(equations2), tuple(pVars), set=True)
-            if dict1[1] == set() or dict2 == set():
-                return []
-            L1 = []
-            L2 = []
-            for j in range(1, len(dict1), 2):
-                L1.append(float(list(list(dict1[j])[0])[0]))
-            for i in range(1, len(dict2), 2):
-                L2.append(float(list(list(dict2[i])[0])[0]))
-            
-            sum1 = sum(L1)
-            sum2 = sum(L2)
-            if sum1 == 0 or sum2 == 0:
-                return []
-            else:
-                L1.append(1 - sum1)
-                L2.append(1 - sum2)
-                return [[L1] + [L2]]
-        else: # numPLayers >= 3
-            if self.numPlayers < 53: # assuming numPlayers <= 26.
-                alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-                alphabetVars = [[] for x in range(self.numPlayers)]
+        Args:
+            x (int): the index of the player
+            a (int): the index of the first strategy
+            b (int): the index of the second strategy
+
+        Returns:
+            int: 1 if a strictly dominates b, -1 if b strictly dominates a, 0 otherwise
+        """
+        payoffsA = np.take(self.payoffTensor[x], a, axis=x)
+        payoffsB = np.take(self.payoffTensor[x], b, axis=x)
+        if np.all(payoffsA > payoffsB):
+            return 1
+        elif np.all(payoffsA < payoffsB):
+            return -1
+        return 0
+    
+    def computeBestResponses(self):
+        """Computes which strategies are best responses to the other players' strategies, caching the result until the payoffs change
+
+        Returns:
+            np.ndarray: boolean tensor of shape (numPlayers, s_1, ..., s_n), where [x][profile] is whether player x + 1's strategy in profile is a best response
+        """
+        with self.lock:
+            if self.bestResponseMask is None:
+                bestResponseMask = np.empty(self.payoffTensor.shape, dtype=bool)
                 for x in range(self.numPlayers):
-                    for k in range(self.players[x].numStrats - 1):
-                        alphabetVars[x].append(sympy.symbols(alphabet[x] + "_" + str(k)))
+                    bestResponseMask[x] = self.payoffTensor[x] == self.payoffTensor[x].max(axis=x, keepdims=True)
+                self.bestResponseMask = bestResponseMask
+            return self.bestResponseMask
 
-                playerVars = [alphabetVars[x][0] for x in range(self.numPlayers)] # the variables that are in the polynomials
-                
-                # polynomials that are multiplied by the coefficients
-                polysToMultiply = [[] for x in range(self.numPlayers)]
+    def computeCognitiveHierarchy(self, tau = 1.5, maxLevel = 3):
+        """Computes the choices of the Poisson cognitive hierarchy model, where each level best responds to the levels below it
+
+        Args:
+            tau (float): the mean number of thinking steps
+            maxLevel (int): the highest level
+
+        Returns:
+            tuple: (choices, outcomeDistribution), where choices[k][x] is player x + 1's mixed strategy at level L_k and outcomeDistribution[s_1]...[s_n] is the predicted probability of the profile (s_1, ..., s_n) over the whole population
+        """
+        if isinstance(tau, bool) or not isinstance(tau, (int, float, np.integer, np.floating)) or tau < 0:
+            print(Fore.RED + f"computeCognitiveHierarchy: invalid input. Expected a nonnegative tau, but received {tau} instead." + Style.RESET_ALL)
+            return None, None
+        if isinstance(maxLevel, bool) or not isinstance(maxLevel, (int, np.integer)) or maxLevel < 0:
+            print(Fore.RED + f"computeCognitiveHierarchy: invalid input. Expected a nonnegative integer maxLevel, but received {maxLevel} instead." + Style.RESET_ALL)
+            return None, None
+        
+        # the truncated Poisson shares, kept apart from the level-k model's rationalityProbabilities f(0), ..., f(maxLevel)
+        shares = np.empty(maxLevel + 1)
+        shares[0] = 1.0
+        for k in range(1, maxLevel + 1):
+            shares[k] = shares[k - 1] * tau / k
+        shares /= shares.sum()
+        
+        tensor = self.payoffTensor
+        choices = [[np.full(self.players[x].numStrats, 1.0 / self.players[x].numStrats) for x in range(self.numPlayers)]]
+        # beliefs[x] is the running sum of f(h) times player x + 1's strategy at L_h over the lower levels h
+        beliefs = [shares[0] * strategy for strategy in choices[0]]
+        for k in range(1, maxLevel + 1):
+            payoffs = deviationPayoffs(tensor, [belief / shares[:k].sum() for belief in beliefs])
+            level = []
+            for x in range(self.numPlayers):
+                best = payoffs[x] == payoffs[x].max()
+                level.append(best / np.count_nonzero(best))
+                beliefs[x] = beliefs[x] + shares[k] * level[x]
+            choices.append(level)
+        
+        # the players choose independently, so the outcome distribution is the product of the population's strategies
+        outcomeDistribution = np.ones(())
+        for belief in beliefs:
+            outcomeDistribution = np.multiply.outer(outcomeDistribution, belief)
+        return [[strategy.tolist() for strategy in level] for level in choices], outcomeDistribution
+    
+    def computeEquilibria(self):
+        equilibria = self.computePureEquilibria() + self.computeMixedEquilibria()
+        numEquilibria = len(equilibria)
+        if numEquilibria % 2 == 0:
+            warnings.warn(f"An even number ({numEquilibria}) of equilibria was returned. This indicates that the game is degenerate. Consider using vertexEnumeration to investigate.", RuntimeWarning)
+        return equilibria
+    
+    def computeIESDS(self, mixed = False, workers = None):
+        """Iteratively eliminates strictly dominated strategies without changing the game
+
+        Args:
+            mixed (bool): whether to also eliminate strategies that are only dominated by mixed strategies
+            workers (int): the number of threads used to check the players for mixed dominance, or None for the default
+
+        Returns:
+            list: survivors[x] is a boolean mask of player x + 1's strategies that survive
+            list: the eliminations [x, s, mixture] in the order they were made, where s indexes player x + 1's strategies in the game and mixture is the mixed strategy over them that dominated s when it was eliminated
+        """
+        tensor = self.payoffTensor
+        numStrats = tensor.shape[1:]
+        survivors = [np.ones(numStrats[x], dtype=bool) for x in range(self.numPlayers)]
+        def payoffsAt(x, strategies, profiles):
+            # player x + 1's payoffs from each strategy against each flat profile of the others, read from the tensor without copying it
+            others = np.unravel_index(profiles, [numStrats[y] for y in range(self.numPlayers) if y != x])
+            index = [other[np.newaxis, :] for other in others]
+            index.insert(x, strategies[:, np.newaxis])
+            return tensor[x][tuple(index)]
+        def othersAlive(x):
+            alive = np.ones(1, dtype=bool)
+            for y in range(self.numPlayers):
+                if y != x:
+                    alive = np.logical_and.outer(alive, survivors[y]).ravel()
+            return alive
+        def otherStrategy(x, y, profiles):
+            # player y + 1's strategy in player x + 1's flat profiles of the others
+            others = [numStrats[z] for z in range(self.numPlayers) if z != x]
+            axis = y if y < x else y - 1
+            return profiles // int(np.prod(others[axis + 1:])) % others[axis]
+        def findWitnesses(x, a, b):
+            # the first surviving profile where b does at least as well as a, or -1 if there is none
+            profiles = np.flatnonzero(othersAlive(x))
+            witnesses = np.full(len(a), -1)
+            # most pairs have a witness early on, so searching blocks of profiles that double in size
+            pending = np.arange(len(a))
+            start = 0
+            width = 16
+            while len(pending) > 0 and start < len(profiles):
+                block = profiles[start:start + width]
+                stillPending = []
+                chunk = max(1, 2 ** 22 // len(block))
+                for first in range(0, len(pending), chunk):
+                    pairs = pending[first:first + chunk]
+                    atLeast = payoffsAt(x, b[pairs], block) >= payoffsAt(x, a[pairs], block)
+                    position = atLeast.argmax(axis=1)
+                    found = atLeast[np.arange(len(pairs)), position]
+                    witnesses[pairs[found]] = block[position[found]]
+                    stillPending.append(pairs[~found])
+                pending = np.concatenate(stillPending)
+                start += width
+                width *= 2
+            return witnesses
+        
+        witnesses = []
+        for x in range(self.numPlayers):
+            a, b = np.nonzero(~np.eye(numStrats[x], dtype=bool))
+            witnesses.append(np.full((numStrats[x], numStrats[x]), -1))
+            witnesses[x][a, b] = findWitnesses(x, a, b)
+        
+        eliminations = []
+        # the thread pool is only needed to check for mixed dominance
+        with ThreadPoolExecutor(workers) if mixed else nullcontext() as pool:
+            while True:
+                found = []
                 for x in range(self.numPlayers):
-                    for k in range(self.players[x].numStrats - 1):
-                        polysToMultiply[x].append(alphabetVars[x][k])
-                    lastPoly = 1
-                    for k in range(self.players[x].numStrats - 1):
-                        lastPoly -= polysToMultiply[x][k]
-                    polysToMultiply[x].append(lastPoly)
-
-                # Getting the coefficients for the polynomials, EU_coefs[x][k] is the set of coefficients for the k-th polynomial for player x + 1, EU_polynomials[x][k] is the k-th polynomial for player x + 1
-                EU_coefs = [[] for x in range(self.numPlayers)]
-                EU_polynomials = [[] for x in range(self.numPlayers)]
-                # getting for player 1
-                for i in range(self.players[0].numStrats):
-                    poly_coefs = []
-                    poly = 0
-                    for m in range(len(self.payoffMatrix)):
-                        for j in range(self.players[1].numStrats):
-                            coef = self.payoffMatrix[m][i][j].getListNode(0).payoff
-                            poly_coefs.append(coef)
-                            term = coef
-                            for x in range(1, self.numPlayers):
-                                if x == 1:
-                                    term *= polysToMultiply[x][j]
-                                else: # x > 1
-                                    term *= polysToMultiply[x][self.toProfile(m)[x]]
-                            poly += term
-                    EU_coefs[0].append(poly_coefs)
-                    EU_polynomials[0].append(poly)
-            
-                # getting polynomials for player 2
-                for j in range(self.players[1].numStrats):
-                    poly_coefs = []
-                    poly = 0
-                    for m in range(len(self.payoffMatrix)):
-                        for i in range(self.players[0].numStrats):
-                            coef = self.payoffMatrix[m][i][j].getListNode(1).payoff
-                            poly_coefs.append(coef)
-                            term = coef
-                            for x in range(self.numPlayers):
-                                if x != 1:
-                                    if x == 0:
-                                        term *= polysToMultiply[x][i]
-                                    else: # x > 1
-                                        term *= polysToMultiply[x][self.toProfile(m)[x]]
-                            poly += term
-                    EU_coefs[1].append(poly_coefs)
-                    EU_polynomials[1].append(poly)
-                    
-                # getting polynomials for players 3, 4,...
-                for x in range(2, self.numPlayers):
-                    poly_coefs = []
-                    for k in range(self.players[x].numStrats - 1):
-                        m = 0
-                        product = 1
-                        firstProfile = [0 for y in range(self.numPlayers)]
-                        firstProfile[x] = k
-                        
-                        numToAdd = 1
-                        for y in range(2, self.numPlayers):
-                            numToAdd *= self.players[y].numStrats
-                                
-                        numAdded = 0
-                        while numAdded < numToAdd:
-                            term = 0
-                            poly_coefs = []
-                            poly = 0
-                            # Add all values in the current matrix
-                            for i in range(self.players[0].numStrats):
-                                for j in range(self.players[1].numStrats):
-                                    coef = self.payoffMatrix[m][i][j].getListNode(x).payoff
-                                    poly_coefs.append(coef)
-                                    term = coef
-                                    for y in range(self.numPlayers):
-                                        if y != x:
-                                            if y == 0:
-                                                term *= polysToMultiply[y][i]
-                                            elif y == 1:
-                                                term *= polysToMultiply[y][j]
-                                            else: # y > 1
-                                                term *= polysToMultiply[y][self.toProfile(m)[y]]
-                                    poly += term
-                            numAdded += 1
-                    
-                            # obtaining the next profile in the sequence
-                            if x == self.numPlayers - 1:
-                                product = 1
-                            else:
-                                if x == 2 and self.numPlayers > 3:
-                                    product = self.players[x].numStrats
-                                else:
-                                    allBelowPlayerAtMaxStrat = True
-                                    mProfile = self.toProfile(m)
-                                    for y in range(2, x):
-                                        if mProfile[y] != self.players[y].numStrats - 1:
-                                            allBelowPlayerAtMaxStrat = False
-                                    if mProfile[x] == k and allBelowPlayerAtMaxStrat:
-                                        productBelowPlayer = 1
-                                        for y in range(2, x):
-                                            productBelowPlayer *= self.players[y].numStrats
-                                        product += productBelowPlayer * (self.players[x].numStrats - 1)
-                                    else:
-                                        product = 1
-                            m += product
-                            EU_coefs[x].append(poly_coefs)
-                            EU_polynomials[x].append(poly)
-                
-                print("POLYNOMIALS:")
-                for player in EU_polynomials:
-                    for poly in player:
-                        print(poly)
-                    print()
+                    # b is dominated if a surviving a has no witness against dominating it
+                    dominates = (witnesses[x] == -1) & survivors[x][:, np.newaxis] & survivors[x][np.newaxis, :]
+                    np.fill_diagonal(dominates, False)
+                    found.append([])
+                    for s in np.flatnonzero(dominates.any(axis=0)):
+                        mixture = np.zeros(numStrats[x])
+                        mixture[np.flatnonzero(dominates[:, s])[0]] = 1
+                        found[x].append([int(s), mixture.tolist()])
+                if not any(found) and mixed:
+                    found = list(pool.map(lambda x: self.findDominatedStrategies(x, survivors, True), range(self.numPlayers)))
+                if not any(found):
+                    break
                 
-                # Collecting the equations to be solved
-                diffs = []
-                EU_equations = [[] for x in range(self.numPlayers)]
-                alt = [[] for x in range(self.numPlayers)]
                 for x in range(self.numPlayers):
-                    if self.players[x].numStrats % 2 == 0:
-                        print("EVEN")
-                        for k in range(0, self.players[x].numStrats, 2):
-                            print("k:", k)
-                            EU_equations[x].append(sympy.Eq(simplify(EU_polynomials[x][k]), simplify(EU_polynomials[x][k + 1])))
-                            print("appending:", EU_polynomials[x][k] - EU_polynomials[x][k + 1])
-                            diffs.append(simplify(EU_polynomials[x][k] - EU_polynomials[x][k + 1]))
-                            alt[x].append(sympy.Eq(simplify(EU_polynomials[x][k] - EU_polynomials[x][k + 1]), 0))
-                    else:
-                        print("ODD")
-                        for k in range(0, self.players[x].numStrats - 1, 2):
-                            print("K:", k)
-                            EU_equations[x].append(sympy.Eq(EU_polynomials[x][k], EU_polynomials[x][k + 1]))       
-                            # adding an equation that contains the last polynomial
-                            EU_equations[x].append(sympy.Eq(simplify(EU_polynomials[x][0]), simplify(EU_polynomials[x][-1])))
-                            print("appending:", EU_polynomials[x][k] - EU_polynomials[x][k + 1])
-                            diffs.append(simplify(EU_polynomials[x][k] - EU_polynomials[x][k + 1]))
-                            alt[x].append(sympy.Eq(simplify(EU_polynomials[x][k] - EU_polynomials[x][k + 1]), 0))
-
-                print("DIFFS:")
-                for poly in diffs:
-                    print(poly)
-                
-                new_eqs = []
-                for p in diffs:
-                    new_eqs.append(sympy.Eq(p, 0))
-                
-                for player in alt:
-                    for eq in player:
-                        print(eq)
-                    print()
-                
-                print("playerVars:", playerVars)
-                
-                # Solving the equations
-                EU_dicts = [sympy.solve(diffs[x], tuple(playerVars), dict=True) for x in range(self.numPlayers)]
-                
-                for item in EU_dicts:
-                    print(item)
-                
-                new_dict = {}
-                for d in EU_dicts:
-                    new_dict.update(d[0])
-                
-                solution = self.solve_system(new_dict, playerVars)
-                
-                # FIXME: finish for n >= 3 players when there actually is a MSE
-                return solution
-                
-            else: # numPlayers >= 53
-                print(f"Error: not enough letters to have variables for all {self.numPlayers} players")
-            return []
-        return []
+                    for s, mixture in found[x]:
+                        survivors[x][s] = False
+                        eliminations.append([x, s, mixture])
+                # searching again only for the pairs whose witnesses used an eliminated strategy
+                for x in range(self.numPlayers):
+                    stale = np.zeros((numStrats[x], numStrats[x]), dtype=bool)
+                    for y in range(self.numPlayers):
+                        if y != x and found[y]:
+                            removed = [s for s, mixture in found[y]]
+                            stale |= (witnesses[x] >= 0) & np.isin(otherStrategy(x, y, witnesses[x]), removed)
+                    stale &= survivors[x][:, np.newaxis] & survivors[x][np.newaxis, :]
+                    a, b = np.nonzero(stale)
+                    if len(a) > 0:
+                        witnesses[x][a, b] = findWitnesses(x, a, b)
+        return survivors, eliminations
     
-    def computeOutcomeProbabilities(self):
+    def computeKChoices(self):
         self.computeKStrategies()
-        self.computeKOutcomes()
+        return
+    
+    def computeKExpectedUtilities(self):
+        """Computes each player's expected payoff under the outcome probabilities found by computeOutcomeProbabilities
+
+        Returns:
+            list of floats: EU[x] is player x + 1's expected payoff
+        """
+        if len(self.kOutcomes) == 0:
+            return [0.0 for x in range(self.numPlayers)]
+        indices = self.ravel(self.kOutcomes)
+        return (self.payoffTensor.reshape(self.numPlayers, -1)[:, indices] @ np.array(self.outcomeProbabilities)).tolist()
+    
+    def computeKMatrix(self, probabilities = None):
+        """Computes the kMatrix, the outcome for every profile of rationality levels, and prints the outcome probabilities and expected payoffs
 
-        self.outcomeProbabilities = [0.0 for n in range(len(self.kOutcomes))]
+        Args:
+            probabilities (list of floats): the probability that a player is L_r for each level r, which also sets the number of levels. If None, rationalityProbabilities is used.
+        """
+        if probabilities is not None:
+            if len(probabilities) != self.maxRationality:
+                self.setMaxLevel(len(probabilities) - 1)
+            self.rationalityProbabilities = list(probabilities)
+        kStrategies = np.array(self.computeKStrategies(), dtype=np.int64)
         
-        for r1 in range(4):
-            for r2 in range(4):
-                probability = 0.0
-                
-                # find which outcome the kMatrix entry corresponds to
-                index = 0 
-                while self.kOutcomes[index][0] != self.kStrategies[r1][0] or self.kOutcomes[index][1] != self.kStrategies[r2][1]:
-                    index += 1
-                
-                probability += self.rationalityProbabilities[r1] * self.rationalityProbabilities[r2]
-                
-                self.outcomeProbabilities[index] += probability
+        # kMatrix[m][r_1][r_2][x] = kStrategies[r_x][x], where m runs over the levels of players 3,...,n
+        levels = self.maxRationality
+        outcomes = np.empty((levels,) * self.numPlayers + (self.numPlayers,), dtype=np.int64)
+        for x in range(self.numPlayers):
+            outcomes[..., x] = kStrategies[:, x].reshape((1,) * x + (levels,) + (1,) * (self.numPlayers - x - 1))
+        self.kMatrix = toMatrixLayout(outcomes, self.numPlayers).tolist()
+        
+        self.probabilizeKChoices(kStrategies)
+        EU = self.computeKExpectedUtilities()
+        print()
+        for x in range(self.numPlayers):
+            print("EU_" + str(x) + " = " + str(EU[x]))
+        
+    def computeKOutcomes(self, kStrategies = None):
+        """Computes kOutcomes, every outcome that some profile of rationality levels leads to
+
+        Args:
+            kStrategies (list of lists of ints): the strategies of each level as computed by computeKStrategies. If None, they are computed.
+
+        Returns:
+            tuple: (supports, indices), where supports[x] is the strategies player x + 1 plays at some level and indices are the profile indices of kOutcomes
+        """
+        if kStrategies is None:
+            kStrategies = self.computeKStrategies()
+        kStrategies = np.array(kStrategies, dtype=np.int64)
+        supports = [np.unique(kStrategies[:, x]) for x in range(self.numPlayers)]
+        
+        # adding up each player's part of the profile index over the product of the supports
+        strides = self.getStrides()[1]
+        indices = np.zeros(())
+        for x in range(self.numPlayers):
+            indices = np.add.outer(indices, supports[x] * strides[x])
+        indices = indices.ravel().astype(np.int64)
+        self.kOutcomes = self.unravel(indices).tolist()
+        return supports, indices
+    
+    def computeKStrategies(self, maxLevel = None):
+        """Computes the strategies that would be chosen for each rationality level
+
+        Args:
+            maxLevel (int): the highest level to compute, which changes the number of levels. If None, the current number of levels is kept.
+
+        Returns:
+            list of lists of ints: kStrategies, where kStrategies[r][x] is the strategy player x + 1 plays at level L_r
+        """
+        if maxLevel is not None and maxLevel + 1 != self.maxRationality:
+            self.setMaxLevel(maxLevel)
+        numStrats = np.array([self.players[x].numStrats for x in range(self.numPlayers)])
+        starts = np.concatenate(([0], np.cumsum(numStrats)[:-1]))
+        # row k of the gather is the k-th strategy of its player, with everyone else fixed
+        owners = np.repeat(np.arange(self.numPlayers), numStrats)
+        own = np.arange(numStrats.sum()) - starts[owners]
+        isOwn = owners[:, np.newaxis] == np.arange(self.numPlayers)
+        
+        strategies = np.array([self.maxStrat(x) for x in range(self.numPlayers)])
+        kStrategies = [strategies.tolist()]
+        for r in range(1, self.maxRationality):
+            profiles = np.where(isOwn, own[:, np.newaxis], strategies)
+            payoffs = self.payoffTensor[(owners,) + tuple(profiles.T)]
+            best = np.maximum.reduceat(payoffs, starts)
+            strategies = np.maximum.reduceat(np.where(payoffs == best[owners], own, -1), starts)
+            kStrategies.append(strategies.tolist())
+        
+        self.kStrategies = kStrategies
+        for x in range(self.numPlayers):
+            if 0 <= self.players[x].rationality < self.maxRationality:
+                self.players[x].kChoice = self.kStrategies[self.players[x].rationality][x]
+        return self.kStrategies
+
+    def computeMixedEquilibria(self, tol = 1e-9):       
+        if self.isConstantSum():
+            # a linear program solves constant-sum games in polynomial time; its strategies keep tiny weights off the support
+            value, p, q = self.solveZeroSum(tol)
+            if np.count_nonzero(np.array(p) > tol) > 1 or np.count_nonzero(np.array(q) > tol) > 1:
+                return [[p, q]]
+            return []
+        elif self.numPlayers < 3:
+            # the equilibria that aren't pure, i.e. where a player mixes over more than one strategy
+            mixedEquilibria = []
+            for equilibrium in self.supportEnumeration():
+                if np.count_nonzero(equilibrium[0]) > 1 or np.count_nonzero(equilibrium[1]) > 1:
+                    mixedEquilibria.append(equilibrium)
+            return mixedEquilibria
+        else: # numPLayers >= 3
+            # following the logit branch numerically, which finds one equilibrium
+            equilibrium = self.logitHomotopy()
+            if any(np.count_nonzero(strategy) > 1 for strategy in equilibrium):
+                return [equilibrium]
+            return []
+    
+    def computeOutcomeProbabilities(self, kStrategies = None):
+        """Computes the probability of each outcome in kOutcomes when every player's level is drawn independently from rationalityProbabilities
+
+        Args:
+            kStrategies (list of lists of ints): the strategies of each level as computed by computeKStrategies. If None, they are computed.
+
+        Returns:
+            dict: the probability of each outcome, keyed by its profile index
+        """
+        if kStrategies is None:
+            kStrategies = self.computeKStrategies()
+        kStrategies = np.array(kStrategies, dtype=np.int64)
+        supports, indices = self.computeKOutcomes(kStrategies)
+        
+        probabilities = np.ones(())
+        for x in range(self.numPlayers):
+            distribution = np.bincount(kStrategies[:, x], weights=self.rationalityProbabilities, minlength=self.players[x].numStrats)
+            probabilities = np.multiply.outer(probabilities, distribution[supports[x]])
+        self.outcomeProbabilities = probabilities.ravel().tolist()
+        return dict(zip(indices.tolist(), self.outcomeProbabilities))
  
     def computePureEquilibria(self):
-        self.computeBestResponses()
-        br = []
-        for m in range(len(self.payoffMatrix)):
-            for i in range(self.players[0].numStrats):
-                for j in range(self.players[1].numStrats):
-                    allBR = True
-                    for x in range(self.numPlayers):
-                        if self.payoffMatrix[m][i][j].getListNode(x).bestResponse == False:
-                            allBR = False
-                            break
-                    if allBR:
-                        br.append([i, j] + self.toProfile(m)[2:])
-        return br
-    
-    def eliminateStrictlyDominatedStrategies_full(self):
+        br = np.argwhere(self.computeBestResponses().all(axis=0))
+        # ordering the equilibria by payoff array, then row, then column
+        br = br[np.lexsort((br[:, 1], br[:, 0], br @ self.getStrides()[0]))]
+        return br.tolist()
+    
+    def countObservedStrategies(self, observations, chunkSize = 2 ** 20):
+        """Counts how often each player played each strategy in a log of observed profiles, reading it one chunk at a time
+
+        Args:
+            observations (np.ndarray, str, or iterable): the flat profile indices of the observed profiles, as from ravel. Either an array, which may be an np.memmap, the name of a .npy file, which is memory-mapped, or an iterable of arrays of indices, e.g. a generator reading them from disk.
+            chunkSize (int): the number of observations read at once from an array or file
+
+        Returns:
+            list of np.ndarrays: counts[x][s] is the number of observations where player x + 1 played strategy s, or None if an index isn't a profile of the game
+        """
+        if isinstance(observations, str):
+            observations = np.load(observations, mmap_mode="r")
+        if isinstance(observations, np.ndarray):
+            observations = observations.ravel()
+            chunks = (observations[start:start + chunkSize] for start in range(0, len(observations), chunkSize))
+        else:
+            chunks = observations
+        
+        numProfiles = int(np.prod(self.payoffTensor.shape[1:]))
+        counts = [np.zeros(self.players[x].numStrats, dtype=np.int64) for x in range(self.numPlayers)]
+        for chunk in chunks:
+            chunk = np.asarray(chunk).ravel()
+            if len(chunk) == 0:
+                continue
+            if not np.issubdtype(chunk.dtype, np.integer) or chunk.min() < 0 or chunk.max() >= numProfiles:
+                print(Fore.RED + f"countObservedStrategies: invalid input. Expected profile indices between 0 and {numProfiles - 1}." + Style.RESET_ALL)
+                return
+            profiles = self.unravel(chunk)
+            for x in range(self.numPlayers):
+                counts[x] += np.bincount(profiles[:, x], minlength=self.players[x].numStrats)
+        return counts
+    
+    def detach(self):
+        """Copies the payoffs into a writeable array if they're read-only, e.g. when they wrap a read-only buffer
+
+        Returns:
+            np.ndarray: the game's writeable payoff tensor
+        """
+        if not self.payoffTensor.flags.writeable:
+            self.setPayoffTensor(np.array(self.payoffTensor))
+        return self.payoffTensor
+    
+    def deviationPayoffs(self, mixedProfile, player = None):
+        """Computes a player's expected payoff from each of their pure strategies when the other players play a mixed profile
+
+        Args:
+            mixedProfile (list or np.ndarray): mixedProfile[y] is player y + 1's mixed strategy. The player's own strategy is only checked for its length.
+            player (int): the index of the player, or None for every player
+
+        Returns:
+            np.ndarray or list of np.ndarrays: payoffs[s] is the player's expected payoff from strategy s, or one such array per player if player is None
+        """
+        error = mixedProfileError(mixedProfile, [self.players[x].numStrats for x in range(self.numPlayers)])
+        if error is not None:
+            print(Fore.RED + "deviationPayoffs: invalid input. " + error + Style.RESET_ALL)
+            return
+        strategies = [np.asarray(strategy, dtype=float) for strategy in mixedProfile]
+        if player is None:
+            return deviationPayoffs(self.payoffTensor, strategies)
+        return contractStrategies(self.payoffTensor[player], strategies, [player])
+    
+    def doubleOracle(self, oracle = None, payoffFunction = None, numStrats = None, initialStrategies = None, tol = 1e-9, maxIter = 1000):
+        """Computes a Nash equilibrium with the double oracle method, which only ever solves a small restricted game
+
+        Args:
+            oracle (function): called as oracle(x, strategies, probabilities) to get player x + 1's best response, where strategies[y] are the strategies player y + 1 plays in the restricted equilibrium and probabilities[y] their probabilities. If None, the best response is found by scanning all of player x + 1's strategies against the others' supports.
+            payoffFunction (function): called as payoffFunction(profiles) with an integer array of shape (k, numPlayers) of profiles to get their payoffs as an array of shape (k, numPlayers), for games whose payoffs are only computed on demand. If None, the payoffs are read from payoffTensor.
+            numStrats (list of ints): the number of strategies of each player. If None, the game's numbers of strategies are used.
+            initialStrategies (list of lists of ints): the strategies each player starts with. If None, everyone starts with strategy 0.
+            tol (float): how much better than the restricted equilibrium a best response must do to be added
+            maxIter (int): the maximum number of iterations
+
+        Returns:
+            tuple: (equilibrium, strategies), where equilibrium[x] is player x + 1's mixed strategy over all of their strategies and strategies[x] are the strategies in the final restricted game, or (None, None) if the restricted game couldn't be solved
+        """
+        if numStrats is None:
+            numStrats = [self.players[x].numStrats for x in range(self.numPlayers)]
+        numPlayers = len(numStrats)
+        if payoffFunction is None:
+            tensor = self.payoffTensor
+            def payoffFunction(profiles):
+                return tensor[(slice(None),) + tuple(profiles.T)].T
+        if initialStrategies is None:
+            initialStrategies = [[0] for x in range(numPlayers)]
+        if len(initialStrategies) != numPlayers or any(len(initialStrategies[x]) == 0 or min(initialStrategies[x]) < 0 or max(initialStrategies[x]) >= numStrats[x] for x in range(numPlayers)):
+            print(Fore.RED + f"doubleOracle: invalid input. Expected a nonempty list of strategies for each of the {numPlayers} players, but received {initialStrategies} instead." + Style.RESET_ALL)
+            return None, None
+        strategies = [list(dict.fromkeys(int(s) for s in initialStrategies[x])) for x in range(numPlayers)]
+        
+        def productProfiles(lists):
+            # every profile of the product of the lists, with the last player changing fastest
+            grids = np.meshgrid(*[np.asarray(strategyList, dtype=np.int64) for strategyList in lists], indexing="ij")
+            return np.stack([grid.ravel() for grid in grids], axis=1)
+        
+        def payoffBlock(lists):
+            # the payoff tensor of the product of the lists
+            return np.asarray(payoffFunction(productProfiles(lists)), dtype=float).T.reshape((numPlayers,) + tuple(len(strategyList) for strategyList in lists))
+        
+        restricted = SimGame(numPlayers)
+        restricted.setPayoffTensor(payoffBlock(strategies))
+        
+        def solve():
+            if numPlayers == 2:
+                if restricted.isConstantSum(tol):
+                    value, p, q = restricted.solveZeroSum(tol)
+                    if value is not None:
+                        return [p, q]
+                equilibrium = restricted.lemkeHowson()
+                if equilibrium:
+                    return equilibrium
+            return restricted.logitHomotopy(tol)
+        
+        for iteration in range(maxIter + 1):
+            equilibrium = solve()
+            if not equilibrium:
+                print(Fore.RED + f"doubleOracle: the restricted game with {[len(strategyList) for strategyList in strategies]} strategies couldn't be solved." + Style.RESET_ALL)
+                return None, None
+            mixtures = [np.asarray(strategy, dtype=float) for strategy in equilibrium]
+            if iteration == maxIter:
+                warnings.warn(f"doubleOracle: stopped after {maxIter} iterations without converging.", RuntimeWarning)
+                break
+            values = restricted.expectedPayoffs(mixtures)
+            supports = [np.flatnonzero(mixture > 0) for mixture in mixtures]
+            supportStrategies = [np.asarray(strategies[y])[supports[y]] for y in range(numPlayers)]
+            supportProbabilities = [mixtures[y][supports[y]] for y in range(numPlayers)]
+            
+            added = False
+            for x in range(numPlayers):
+                # the others' profiles in the restricted equilibrium and their probabilities
+                others = [supportStrategies[y] if y != x else [0] for y in range(numPlayers)]
+                weights = np.ones(())
+                for y in range(numPlayers):
+                    weights = np.multiply.outer(weights, supportProbabilities[y] if y != x else np.ones(1))
+                weights = weights.ravel()
+                def bestResponsePayoffs(candidates):
+                    lists = others[:x] + [candidates] + others[x + 1:]
+                    payoffs = np.asarray(payoffFunction(productProfiles(lists)), dtype=float)[:, x]
+                    payoffs = np.moveaxis(payoffs.reshape([len(strategyList) for strategyList in lists]), x, 0)
+                    return payoffs.reshape(len(candidates), len(weights)) @ weights
+                
+                if oracle is not None:
+                    best = int(oracle(x, supportStrategies, supportProbabilities))
+                    if best < 0 or best >= numStrats[x]:
+                        print(Fore.RED + f"doubleOracle: the oracle returned {best}, which isn't one of player {x + 1}'s strategies." + Style.RESET_ALL)
+                        return None, None
+                    payoff = bestResponsePayoffs([best])[0]
+                else:
+                    # scanning the strategies a chunk at a time
+                    best, payoff = -1, -np.inf
+                    chunk = max(1, 2 ** 20 // len(weights))
+                    for start in range(0, numStrats[x], chunk):
+                        payoffs = bestResponsePayoffs(np.arange(start, min(start + chunk, numStrats[x])))
+                        if payoffs.max() > payoff:
+                            best, payoff = start + int(np.argmax(payoffs)), payoffs.max()
+                
+                if payoff > values[x] + tol and best not in strategies[x]:
+                    lists = strategies[:x] + [[best]] + strategies[x + 1:]
+                    restricted.appendStrategies(x, payoffBlock(lists))
+                    strategies[x].append(best)
+                    added = True
+            if not added:
+                break
+        
+        result = []
+        for x in range(numPlayers):
+            full = np.zeros(numStrats[x])
+            full[strategies[x]] = mixtures[x]
+            result.append(full.tolist())
+        return result, [list(strategyList) for strategyList in strategies]
+    
+    def eliminateStrictlyDominatedStrategies_full(self, mixed = False):
+        """Removes every strategy eliminated by iterated elimination of strictly dominated strategies, as found by computeIESDS
+
+        Args:
+            mixed (bool): whether to also remove strategies that are only dominated by mixed strategies
+
+        Returns:
+            list: the eliminations [x, s, mixture] made, as returned by computeIESDS
+        """
         self.originalNumPlayers = self.numPlayers
         self.originalNumStrats = [self.players[x].numStrats for x in range(self.numPlayers)]
-        self.originalPayoffMatrix = self.payoffMatrix
+        self.originalPayoffTensor = self.payoffTensor
         
         self.removedCols = []
         self.removedMatrices = []
         self.removedRows = []
         
-        strategyIndices = [[k for k in range(self.players[x].numStrats)] for x in range(self.numPlayers)]
-        # pairs[x] contains numPlayers-long tuples of strategy indices
-        # pairs[x][0] and pairs[x][1] are the strategies being compared
-        pairs = [combinations(strategyIndices[x], r=2) for x in range(self.numPlayers)]
-        numCombos = [sum(1 for pair in pairs[x]) for x in range(self.numPlayers)]
-        greaterThanFound = [False for x in range(self.numPlayers)]
-        lessThanFound = [False for x in range(self.numPlayers)]
-        equalFound = [False for x in range(self.numPlayers)]
-        multipleStrats = [True for x in range(self.numPlayers)]
-        oneWithMultipleStrats = False
-        for ms in multipleStrats:
-            if ms:
-                oneWithMultipleStrats = True
-                break
-        stratRemoved = [True for x in range(self.numPlayers)]
-        oneStratRemoved = False
-        for sr in stratRemoved:
-            if sr:
-                oneStratRemoved = True
-                break
-        checked = [False for x in range(self.numPlayers)]
-        oneNotChecked = False
-        for p in checked:
-            if not p:
-                oneNotChecked = True
-                break
-        x = -1
-        k = 0
-        # Stop when you can't eliminate a strategy for either player or when only one strategy is left for each players or when all players have been checked
-        # Stop when all players have only one strat or when all players' strategies have been checked...or when there isn't a strat that can be removed? No, when we remove a strat, we should check all other player's strategies. 
-        # Continue if one player has multiple strategies and one player hasn't been checked and you can eliminate a strategy for one player
-        oneWithMultipleStratsAndNotChecked = False
-        for x in range(self.numPlayers):
-            if multipleStrats[x] and not checked[x]:
-                oneWithMultipleStratsAndNotChecked = True
-                break
-        while oneWithMultipleStratsAndNotChecked:
-            x += 1
-            for y in range(self.numPlayers):
-                stratRemoved[y] = False
-            # recomputing the pairs that need to be checked because the number of strategies may have changed
-            strategyIndices = [[k for k in range(self.players[y].numStrats)] for y in range(self.numPlayers)]
-            pairs = [combinations(strategyIndices[y], r=2) for y in range(self.numPlayers)]
-            numCombos = [sum(1 for pair in pairs[y]) for y in range(self.numPlayers)]
-            pairs = [combinations(strategyIndices[y], r=2) for y in range(self.numPlayers)]
-            
-            numMatrices = 1
-            for y in range(2, self.numPlayers):
-                numMatrices *= self.players[y].numStrats
-            
-            multipleStrats = [True for y in range(self.numPlayers)]
-            for y in range(self.numPlayers):
-                if self.players[y].numStrats == 1:
-                    multipleStrats[y] = False
-            stratRemoved = [False for x in range(self.numPlayers)]
-            oneNotChecked = True
-            
-            # if the player has multiple strats and hasn't been checked
-            if multipleStrats[x % self.numPlayers] and not checked[x % self.numPlayers]:
-                checked[x % self.numPlayers] = True
-                if x % self.numPlayers == 0:
-                    for pair in pairs[x % self.numPlayers]:
-                        greaterThanFound[0] = False
-                        lessThanFound[0] = False
-                        equalFound[0] = False
-                        # Searching for < or > among the payoffs
-                        # Fixing all other player's strategies
-                        for m in range(numMatrices):  
-                            for j in range(self.players[1].numStrats):
-                                # if p1 has only one strategy lef
-                                if len(self.payoffMatrix[0]) == 1: 
-                                    multipleStrats1 = False
-                                    break
-                                # Comparing two payoffs
-                                if self.payoffMatrix[m][pair[0]][j].getListNode(x % self.numPlayers).payoff < self.payoffMatrix[m][pair[1]][j].getListNode(x % self.numPlayers).payoff:
-                                    lessThanFound[x % self.numPlayers] = True
-                                elif self.payoffMatrix[m][pair[0]][j].getListNode(x % self.numPlayers).payoff > self.payoffMatrix[m][pair[1]][j].getListNode(x % self.numPlayers).payoff:
-                                    greaterThanFound[x % self.numPlayers] = True
-                                else: # equal payoffs found
-                                    equalFound[x % self.numPlayers] = True
-                                    break
-                        
-                        # Removing strategies based on the results
-                        if lessThanFound[x % self.numPlayers] and not greaterThanFound[x % self.numPlayers] and not equalFound[x % self.numPlayers]: # remove strategy pair[0]
-                            self.removeStrategy(x % self.numPlayers, pair[0])
-                            strategyIndices[x % self.numPlayers].pop()
-                            stratRemoved[x % self.numPlayers] = True
-                            for y in range(self.numPlayers):
-                                if y != x % self.numPlayers:
-                                    checked[y] = False
-                        elif greaterThanFound[x % self.numPlayers] and not lessThanFound[x % self.numPlayers] and not equalFound[x % self.numPlayers]: # remove strategy pair[1]
-                            self.removeStrategy(x % self.numPlayers, pair[1])
-                            strategyIndices[x % self.numPlayers].pop()
-                            stratRemoved[x % self.numPlayers] = True
-                            for y in range(self.numPlayers):
-                                if y != x % self.numPlayers:
-                                    checked[y] = False
-                        else: # (not lessThanFound[x % self.numPlayers] and not greaterThanFound[x % self.numPlayers])(all equal) or (lessThanFound[x % self.numPlayers] and greaterThanFound[x % self.numPlayers])(no dominance)
-                            stratRemoved[x % self.numPlayers] = False
-                        
-                        if stratRemoved[x % self.numPlayers]:
-                            break
-                elif x % self.numPlayers == 1:
-                    for pair in pairs[x % self.numPlayers]:
-                        greaterThanFound[1] = False
-                        lessThanFound[1] = False
-                        equalFound[1] = False
-                        # Searching for < or > among the payoffs
-                        # Fixing all other player's strategies
-                        for m in range(numMatrices):
-                            for i in range(self.players[0].numStrats):
-                                if len(self.payoffMatrix[m][pair[0]]) == 1: # if p2 only has one strategy left
-                                    multipleStrats2 = False
-                                    break
-                                # Comparing two payoffs
-                                if self.payoffMatrix[m][i][pair[0]].getListNode(x % self.numPlayers).payoff < self.payoffMatrix[m][i][pair[1]].getListNode(x % self.numPlayers).payoff:
-                                    lessThanFound[x % self.numPlayers] = True
-                                elif self.payoffMatrix[m][i][pair[0]].getListNode(x % self.numPlayers).payoff > self.payoffMatrix[m][i][pair[1]].getListNode(x % self.numPlayers).payoff:
-                                    greaterThanFound[x % self.numPlayers] = True
-                                else: # equal payoffs were found
-                                    equalFound[x % self.numPlayers] = True
-                                    break
-                        
-                        # Removing strategies based on the results
-                        if lessThanFound[x % self.numPlayers] and not greaterThanFound[x % self.numPlayers] and not equalFound[x % self.numPlayers]: # remove strategy pair[0]
-                            self.removeStrategy(x % self.numPlayers, pair[0])
-                            strategyIndices[x % self.numPlayers].pop()
-                            stratRemoved[x % self.numPlayers] = True
-                            for y in range(self.numPlayers):
-                                if y != x % self.numPlayers:
-                                    checked[y] = False
-                        elif greaterThanFound[x % self.numPlayers] and not lessThanFound[x % self.numPlayers] and not equalFound[x % self.numPlayers]: # remove strategy pair[1]
-                            self.removeStrategy(x % self.numPlayers, pair[1])
-                            strategyIndices[x % self.numPlayers].pop()
-                            stratRemoved[x % self.numPlayers] = True
-                            for y in range(self.numPlayers):
-                                if y != x % self.numPlayers:
-                                    checked[y] = False
-                        else: # (not lessThanFound[1] and not greaterThanFound[1]) or (lessThanFound[1] and greaterThanFound[1])
-                            stratRemoved[x % self.numPlayers] = False
-                        
-                        if stratRemoved[x % self.numPlayers]:
-                            break
-                else: # x > 1
-                    greaterThanFound[x % self.numPlayers] = False
-                    lessThanFound[x % self.numPlayers] = False
-                    equalFound[x % self.numPlayers] = False
-                    for pair in pairs[x % self.numPlayers]:
-                        greaterThanFound[x % self.numPlayers] = False
-                        lessThanFound[x % self.numPlayers] = False
-                        equalFound[x % self.numPlayers] = False
-                        # Searching for < or > among the payoffs
-                        # Fixing all other player's strategies
-                        firstProfile1 = [0 for y in range(self.numPlayers)]
-                        firstProfile2 = [0 for y  in range(self.numPlayers)]
-                        firstProfile1[x % self.numPlayers] = pair[0] # start at the first array for the first strategy
-                        firstProfile2[x % self.numPlayers] = pair[1] # start at the first array for the second strategy
-                        m1 = self.toIndex(firstProfile1)
-                        m2 = self.toIndex(firstProfile2)
-                        product = 1
-                        
-                        # Getting the number of matrices to compare
-                        numToCompare = 1
-                        for y in range(2, self.numPlayers):
-                            if y != x % self.numPlayers:
-                                numToCompare *= self.players[y].numStrats
-                                
-                        numCompared = 0
-                        while numCompared < numToCompare:
-                            # Comparing
-                            for i in range(self.players[0].numStrats):
-                                for j in range(self.players[1].numStrats):
-                                    if self.payoffMatrix[m1][i][j].getListNode(x % self.numPlayers).payoff < self.payoffMatrix[m2][i][j].getListNode(x % self.numPlayers).payoff:
-                                        lessThanFound[x % self.numPlayers] = True
-                                    elif self.payoffMatrix[m1][i][j].getListNode(x % self.numPlayers).payoff > self.payoffMatrix[m2][i][j].getListNode(x % self.numPlayers).payoff:
-                                        greaterThanFound[x % self.numPlayers] = True
-                                    else: # equal payoffs found
-                                        equalFound[x % self.numPlayers] = True
-                            numCompared += 1
-                                    
-                            # Move both profiles to the next matrix in the section
-                            # obtaining the next profile in the sequence
-                            if x % self.numPlayers == 2 and self.numPlayers > 3:
-                                product = self.players[x % self.numPlayers].numStrats
-                            else:
-                                allBelowPlayerAtMaxStrat = True
-                                m1Profile = self.toProfile(m1)
-                                for y in range(2, x % self.numPlayers):
-                                    if m1Profile[y] != self.players[y].numStrats - 1:
-                                        allBelowPlayerAtMaxStrat = False
-                                if m1Profile[x % self.numPlayers] == pair[0] and allBelowPlayerAtMaxStrat:
-                                    productBelowPlayer = 1
-                                    for y in range(2, x):
-                                        productBelowPlayer *= self.players[y].numStrats
-                                    product += productBelowPlayer * (self.players[x % self.numPlayers].numStrats - 1)
-                                else:
-                                    product = 1
-                            m1 += product
-                            if x % self.numPlayers == 2 and self.numPlayers > 3:
-                                product = self.players[x % self.numPlayers].numStrats
-                            else:
-                                allBelowPlayerAtMaxStrat = True
-                                m2Profile = self.toProfile(m2)
-                                for y in range(2, x % self.numPlayers):
-                                    if m2Profile[y] != self.players[y].numStrats - 1:
-                                        allBelowPlayerAtMaxStrat = False
-                                if m2Profile[x % self.numPlayers] == pair[1] and allBelowPlayerAtMaxStrat:
-                                    productBelowPlayer = 1
-                                    for y in range(2, x % self.numPlayers):
-                                        productBelowPlayer *= self.players[y].numStrats
-                                    product += productBelowPlayer * (self.players[x % self.numPlayers].numStrats - 1)
-                                else:
-                                    product = 1
-                            m2 += product
-                                                        
-                        # Removing strategies based on the results
-                        if lessThanFound[x % self.numPlayers] and not greaterThanFound[x % self.numPlayers] and not equalFound[x % self.numPlayers]: # remove strategy pair[0]
-                            self.removeStrategy(x % self.numPlayers, pair[0])
-                            strategyIndices[x % self.numPlayers].pop()
-                            stratRemoved[x % self.numPlayers] = True
-                            for y in range(self.numPlayers):
-                                if y != x % self.numPlayers:
-                                    checked[y] = False
-                        elif greaterThanFound[x % self.numPlayers] and not lessThanFound[x % self.numPlayers] and not equalFound[x % self.numPlayers]: # remove strategy pair[1]
-                            self.removeStrategy(x % self.numPlayers, pair[1])
-                            strategyIndices[x % self.numPlayers].pop()
-                            stratRemoved[x % self.numPlayers] = True
-                            for y in range(self.numPlayers):
-                                if y != x % self.numPlayers:
-                                    checked[y] = False
-                        else: # (not lessThanFound[1] and not greaterThanFound[1]) or (lessThanFound[1] and greaterThanFound[1])
-                            stratRemoved[x % self.numPlayers] = False
-                        
-                        if stratRemoved[x % self.numPlayers]:
-                            break
-                if self.players[x % self.numPlayers].numStrats == 1:
-                    multipleStrats[x % self.numPlayers] = False
-                oneWithMultipleStratsAndNotChecked = False
-                for y in range(self.numPlayers):
-                    if multipleStrats[y] and not checked[y]:
-                        oneWithMultipleStratsAndNotChecked = True
-                        break        
-        return
+        survivors, eliminations = self.computeIESDS(mixed)
+        for n, (x, s, mixture) in enumerate(eliminations):
+            # shifting the index past the player's strategies that were already removed
+            self.removeStrategy(x, s - sum(1 for y, t, other in eliminations[:n] if y == x and t < s))
+        return eliminations
     
-    def eliminateStrictlyDominatedStrategies_step(self):
+    def eliminateStrictlyDominatedStrategies_step(self, mixed = False):
+        """Removes the first strategy that computeIESDS eliminates, so that the elimination can be followed one step at a time
+
+        Args:
+            mixed (bool): whether to also remove strategies that are only dominated by mixed strategies
+
+        Returns:
+            list: the elimination [x, s, mixture] made, or None if no strategy is dominated
+        """
         if self.numIESDSSteps == 0:
             self.originalNumPlayers = self.numPlayers
             self.originalNumStrats = [self.players[x].numStrats for x in range(self.numPlayers)]
-            self.originalPayoffMatrix = self.payoffMatrix
+            self.originalPayoffTensor = self.payoffTensor
         
         self.removedMatrices = []
         self.removedRows = []
         self.removedCols = []
         self.numIESDSSteps += 1
-        # strategyIndices[x] is the set of indices (0, 1, 2,...,numStrats[x] - 1) for the x-th player
-        # strategyIndices[x][k] is the k-th strategy index for the x-th player
-        strategyIndices = [[k for k in range(self.players[x].numStrats)] for x in range(self.numPlayers)]    
-        pairs = [combinations(strategyIndices[x], r=2) for x in range(self.numPlayers)] # pairs of p(x + 1)'s strategies to compare; indices
-        numCombos = [sum(1 for pair in pairs[x]) for x in range(self.numPlayers)]
-        oneStratEliminated = False
-        
-        greaterThanFound = [False for y in range(self.numPlayers)]
-        lessThanFound = [False for y in range(self.numPlayers)]
-        equalFound = [False for y in range(self.numPlayers)]
-        multipleStrats = [True for y in range(self.numPlayers)]
-        for y in range(self.numPlayers):
-            if self.players[y].numStrats == 1:
-                multipleStrats[y] = False
-        stratRemoved = [False for x in range(self.numPlayers)]
-        oneNotChecked = True
-        checked = [False for x in range(self.numPlayers)]
-        oneNotChecked = False
-        for p in checked:
-            if not p:
-                oneNotChecked = True
-                break
-        
-        """
-        We want to check player 1 first, then player 2, then player 3,... with the first click, then player numPlayers, then player 1, player 2, and so on with each succeeding click until we can't remove a strategy. 
-        """
-        # if not oneStratEliminated and the player has multiple strats and hasn't been checked
         
-        oneWithMultipleStratsAndNotChecked = False
-        for y in range(self.numPlayers):
-            if multipleStrats[y] and not checked[y]:
-                oneWithMultipleStratsAndNotChecked = True
-                break
-        x = 0
-        while x < self.numPlayers and not oneStratEliminated and oneWithMultipleStratsAndNotChecked:
-            # recomputing the pairs that need to be checked because the number of strategies may have changed
-            strategyIndices = [[k for k in range(self.players[y].numStrats)] for y in range(self.numPlayers)]
-            pairs = [combinations(strategyIndices[y], r=2) for y in range(self.numPlayers)]
-            numCombos = [sum(1 for pair in pairs[y]) for y in range(self.numPlayers)]
-            pairs = [combinations(strategyIndices[y], r=2) for y in range(self.numPlayers)]
-            
-            numMatrices = 1
-            for y in range(2, self.numPlayers):
-                numMatrices *= self.players[y].numStrats
-            
-            multipleStrats = [True for y in range(self.numPlayers)]
-            for y in range(self.numPlayers):
-                if self.players[y].numStrats == 1:
-                    multipleStrats[y] = False
-            stratRemoved = [False for y in range(self.numPlayers)]
-            oneNotChecked = True
-            
-            # if the player has multiple strats and hasn't been checked
-            if multipleStrats[x] and not checked[x]:
-                checked[x] = True
-                if x == 0:
-                    for pair in pairs[x]:
-                        greaterThanFound[0] = False
-                        lessThanFound[0] = False
-                        equalFound[0] = False
-                        # Searching for < or > among the payoffs
-                        # Fixing all other player's strategies
-                        for m in range(numMatrices):  
-                            for j in range(self.players[1].numStrats):
-                                # if p1 has only one strategy lef
-                                if len(self.payoffMatrix[0]) == 1: 
-                                    multipleStrats1 = False
-                                    break
-                                # Comparing two payoffs
-                                if self.payoffMatrix[m][pair[0]][j].getListNode(x).payoff < self.payoffMatrix[m][pair[1]][j].getListNode(x).payoff:
-                                    lessThanFound[x] = True
-                                elif self.payoffMatrix[m][pair[0]][j].getListNode(x).payoff > self.payoffMatrix[m][pair[1]][j].getListNode(x).payoff:
-                                    greaterThanFound[x] = True
-                                else: # equal payoffs found
-                                    equalFound[x] = True
-                                    break
-                        
-                        # Removing strategies based on the results
-                        if lessThanFound[x] and not greaterThanFound[x] and not equalFound[x]: # remove strategy pair[0]
-                            self.removeStrategy(x, pair[0])
-                            oneStratEliminated = True
-                            strategyIndices[x].pop()
-                            stratRemoved[x] = True
-                            for y in range(self.numPlayers):
-                                if y != x:
-                                    checked[y] = False
-                        elif greaterThanFound[x] and not lessThanFound[x] and not equalFound[x]: # remove strategy pair[1]
-                            self.removeStrategy(x, pair[1])
-                            oneStratEliminated = True
-                            strategyIndices[x].pop()
-                            stratRemoved[x] = True
-                            for y in range(self.numPlayers):
-                                if y != x:
-                                    checked[y] = False
-                        else: # (not lessThanFound[x] and not greaterThanFound[x])(all equal) or (lessThanFound[x] and greaterThanFound[x])(no dominance)
-                            stratRemoved[x] = False
-                        
-                        if stratRemoved[x]:
-                            break
-                elif x == 1:
-                    for pair in pairs[x]:
-                        greaterThanFound[1] = False
-                        lessThanFound[1] = False
-                        equalFound[1] = False
-                        # Searching for < or > among the payoffs
-                        # Fixing all other player's strategies
-                        for m in range(numMatrices):
-                            for i in range(self.players[0].numStrats):
-                                if len(self.payoffMatrix[m][pair[0]]) == 1: # if p2 only has one strategy left
-                                    multipleStrats2 = False
-                                    break
-                                # Comparing two payoffs
-                                if self.payoffMatrix[m][i][pair[0]].getListNode(x).payoff < self.payoffMatrix[m][i][pair[1]].getListNode(x).payoff:
-                                    lessThanFound[x] = True
-                                elif self.payoffMatrix[m][i][pair[0]].getListNode(x).payoff > self.payoffMatrix[m][i][pair[1]].getListNode(x).payoff:
-                                    greaterThanFound[x] = True
-                                else: # equal payoffs were found
-                                    equalFound[x] = True
-                                    break
-                        
-                        # Removing strategies based on the results
-                        if lessThanFound[x] and not greaterThanFound[x] and not equalFound[x]: # remove strategy pair[0]
-                            self.removeStrategy(x, pair[0])
-                            oneStratEliminated = True
-                            strategyIndices[x].pop()
-                            stratRemoved[x] = True
-                            for y in range(self.numPlayers):
-                                if y != x:
-                                    checked[y] = False
-                        elif greaterThanFound[x] and not lessThanFound[x] and not equalFound[x]: # remove strategy pair[1]
-                            self.removeStrategy(x, pair[1])
-                            oneStratEliminated = True
-                            strategyIndices[x].pop()
-                            stratRemoved[x] = True
-                            for y in range(self.numPlayers):
-                                if y != x:
-                                    checked[y] = False
-                        else: # (not lessThanFound[1] and not greaterThanFound[1]) or (lessThanFound[1] and greaterThanFound[1])
-                            stratRemoved[x] = False
-                        
-                        if stratRemoved[x]:
-                            break
-                else: # x > 1
-                    greaterThanFound[x] = False
-                    lessThanFound[x] = False
-                    equalFound[x] = False
-                    for pair in pairs[x]:
-                        greaterThanFound[x] = False
-                        lessThanFound[x] = False
-                        equalFound[x] = False
-                        # Searching for < or > among the payoffs
-                        # Fixing all other player's strategies
-                        firstProfile1 = [0 for y in range(self.numPlayers)]
-                        firstProfile2 = [0 for y  in range(self.numPlayers)]
-                        firstProfile1[x] = pair[0] # start at the first array for the first strategy
-                        firstProfile2[x] = pair[1] # start at the first array for the second strategy
-                        m1 = self.toIndex(firstProfile1)
-                        m2 = self.toIndex(firstProfile2)
-                        product = 1
-                        
-                        # Getting the number of matrices to compare
-                        numToCompare = 1
-                        for y in range(2, self.numPlayers):
-                            if y != x:
-                                numToCompare *= self.players[y].numStrats
-                                
-                        numCompared = 0
-                        while numCompared < numToCompare:
-                            # Comparing
-                            for i in range(self.players[0].numStrats):
-                                for j in range(self.players[1].numStrats):
-                                    if self.payoffMatrix[m1][i][j].getListNode(x).payoff < self.payoffMatrix[m2][i][j].getListNode(x).payoff:
-                                        lessThanFound[x] = True
-                                    elif self.payoffMatrix[m1][i][j].getListNode(x).payoff > self.payoffMatrix[m2][i][j].getListNode(x).payoff:
-                                        greaterThanFound[x] = True
-                                    else: # equal payoffs found
-                                        equalFound[x] = True
-                            numCompared += 1
-                                    
-                            # Move both profiles to the next matrix in the section
-                            # obtaining the next profile in the sequence
-                            if x == 2 and self.numPlayers > 3:
-                                product = self.players[x].numStrats
-                            else:
-                                allBelowPlayerAtMaxStrat = True
-                                m1Profile = self.toProfile(m1)
-                                for y in range(2, x):
-                                    if m1Profile[y] != self.players[y].numStrats - 1:
-                                        allBelowPlayerAtMaxStrat = False
-                                if m1Profile[x] == pair[0] and allBelowPlayerAtMaxStrat:
-                                    productBelowPlayer = 1
-                                    for y in range(2, x):
-                                        productBelowPlayer *= self.players[y].numStrats
-                                    product += productBelowPlayer * (self.players[x].numStrats - 1)
-                                else:
-                                    product = 1
-                            m1 += product
-                            if x == 2 and self.numPlayers > 3:
-                                product = self.players[x].numStrats
-                            else:
-                                allBelowPlayerAtMaxStrat = True
-                                m2Profile = self.toProfile(m2)
-                                for y in range(2, x):
-                                    if m2Profile[y] != self.players[y].numStrats - 1:
-                                        allBelowPlayerAtMaxStrat = False
-                                if m2Profile[x] == pair[1] and allBelowPlayerAtMaxStrat:
-                                    productBelowPlayer = 1
-                                    for y in range(2, x):
-                                        productBelowPlayer *= self.players[y].numStrats
-                                    product += productBelowPlayer * (self.players[x].numStrats - 1)
-                                else:
-                                    product = 1
-                            m2 += product
-                                                        
-                        # Removing strategies based on the results
-                        if lessThanFound[x] and not greaterThanFound[x] and not equalFound[x]: # remove strategy pair[0]
-                            self.removeStrategy(x, pair[0])
-                            oneStratEliminated = True
-                            strategyIndices[x].pop()
-                            stratRemoved[x] = True
-                            for y in range(self.numPlayers):
-                                if y != x:
-                                    checked[y] = False
-                        elif greaterThanFound[x] and not lessThanFound[x] and not equalFound[x]: # remove strategy pair[1]
-                            self.removeStrategy(x, pair[1])
-                            strategyIndices[x].pop()
-                            stratRemoved[x] = True
-                            for y in range(self.numPlayers):
-                                if y != x:
-                                    checked[y] = False
-                        else: # (not lessThanFound[1] and not greaterThanFound[1]) or (lessThanFound[1] and greaterThanFound[1])
-                            stratRemoved[x] = False
-                        
-                        if stratRemoved[x]:
-                            break
-            
-            if self.players[x].numStrats == 1:
-                multipleStrats[x] = False
-            oneWithMultipleStratsAndNotChecked = False
-            for y in range(self.numPlayers):
-                if multipleStrats[y] and not checked[y]:
-                    oneWithMultipleStratsAndNotChecked = True
-                    break
-            x += 1
+        eliminations = self.computeIESDS(mixed)[1]
+        if eliminations:
+            self.removeStrategy(*eliminations[0][:2])
+            return eliminations[0]
         return
     
     def enterData(self, numPlayers = 2, numStrats = [2, 2], payoffs = [
         [[1, 5], [2, 6]],
         [[3, 7], [4, 8]]
-    ]):        
+    ]):
+        # ensuring that the payoffs are a list of matrices
+        matrices = np.array(payoffs, dtype=float)
+        if matrices.ndim == 3:
+            matrices = matrices[np.newaxis]
+        numMatrices = 1
+        for x in range(2, numPlayers):
+            numMatrices *= numStrats[x]
+        if matrices.shape != (numMatrices, numStrats[0], numStrats[1], numPlayers):
+            print(Fore.RED + f"enterData: invalid input. Expected {numMatrices} payoff arrays of {numStrats[0]} rows and {numStrats[1]} columns of outcomes with {numPlayers} payoffs, but received payoffs of shape {matrices.shape} instead." + Style.RESET_ALL)
+            return
+        
         oldNumPlayers = self.numPlayers
         oldNumStrats = [self.players[x].numStrats for x in range(oldNumPlayers)]
         self.numPlayers = numPlayers
@@ -1709,25 +1850,8 @@ class SimGame:
             for x in range(self.numPlayers - oldNumPlayers):
                 self.players.append(Player(numStrats[oldNumPlayers + x]))
         
-        # ensuring that the payoffs are a list of matrices
-        if type(payoffs[0][0][0]).__name__ == "float":
-            payoffs = [payoffs]
-        
-        self.payoffMatrix = []
-        numMatrices = 1
-        for x in range(2, numPlayers):
-            numMatrices *= numStrats[x]
-        for m in range(numMatrices):
-            matrix = []
-            for i in range(self.players[0].numStrats):
-                row = []
-                for j in range(self.players[1].numStrats):
-                    outcome = ListNode(payoffs[m][i][j][0], False)
-                    for x in range(1, self.numPlayers):
-                        outcome.append(payoffs[m][i][j][x], False)
-                    row.append(outcome)
-                matrix.append(row)
-            self.payoffMatrix.append(matrix)
+        self.setPayoffTensor(matricesToTensor(matrices, numStrats))
+        self.resizeKMatrix()
         
         # updating strategy names
         self.strategyNames = []
@@ -1754,82 +1878,516 @@ class SimGame:
                 else: 
                     self.strategyNames.append(["L(" + str(x + 1) + ")"] + ["C(" + str(x + 1) + ", " + str(s + 1) + ")" for s in range(self.players[x].numStrats)] + ["R(" + str(x + 1) + ")"])
         
+    def expectedPayoffs(self, mixedProfile):
+        """Computes every player's expected payoff under a mixed profile, with a single einsum over the payoff tensor
+
+        Args:
+            mixedProfile (list or np.ndarray): mixedProfile[x] is player x + 1's mixed strategy
+
+        Returns:
+            np.ndarray: payoffs[x] is player x + 1's expected payoff
+        """
+        error = mixedProfileError(mixedProfile, [self.players[x].numStrats for x in range(self.numPlayers)])
+        if error is not None:
+            print(Fore.RED + "expectedPayoffs: invalid input. " + error + Style.RESET_ALL)
+            return
+        operands = [self.payoffTensor, list(range(self.numPlayers + 1))]
+        for x in range(self.numPlayers):
+            operands += [np.asarray(mixedProfile[x], dtype=float), [x + 1]]
+        return np.einsum(*operands, [0], optimize=True)
+    
+    def findDominatedStrategies(self, x, survivors = None, mixed = False, tol = 1e-9):
+        """Finds player x + 1's strategies that are strictly dominated in the game restricted to the surviving strategies
+
+        Args:
+            x (int): the index of the player
+            survivors (list): survivors[y] is a boolean mask of player y + 1's strategies that are still in the game, or None for all of them
+            mixed (bool): whether to check for dominance by mixed strategies
+            tol (float): how much more a dominating mixture must earn against every profile of the others
+
+        Returns:
+            list: the dominated strategies [s, mixture], where mixture is a dominating mixed strategy over all of player x + 1's strategies
+        """
+        if survivors is None:
+            survivors = [np.ones(numStrats, dtype=bool) for numStrats in self.payoffTensor.shape[1:]]
+        strategies = np.flatnonzero(survivors[x])
+        if len(strategies) < 2:
+            return []
+        # the payoffs of player x + 1's surviving strategies against the surviving profiles of the others, a view if every strategy survives
+        if all(survivor.all() for survivor in survivors):
+            block = self.payoffTensor[x]
+        else:
+            block = self.payoffTensor[x][np.ix_(*[np.flatnonzero(survivor) for survivor in survivors])]
+        otherAxes = tuple(y for y in range(self.numPlayers) if y != x)
+        
+        mixtures = {}
+        candidates = []
+        for b in range(len(strategies)):
+            dominating = np.flatnonzero((block > np.take(block, [b], axis=x)).all(axis=otherAxes))
+            if len(dominating) > 0:
+                mixtures[b] = np.zeros(len(strategies))
+                mixtures[b][dominating[0]] = 1
+            else:
+                candidates.append(b)
+        if mixed and len(strategies) > 2 and candidates:
+            # candidate b is dominated if the row player wins the zero-sum game u(a, t) - u(b, t) over the other strategies a
+            # the linear programs need each strategy's payoffs as a row
+            payoffs = np.moveaxis(block, x, 0).reshape(len(strategies), -1)
+            candidates = np.array(candidates)
+            others = np.array([np.delete(np.arange(len(strategies)), b) for b in candidates])
+            chunk = max(1, 2 ** 20 // payoffs.size)
+            for start in range(0, len(candidates), chunk):
+                batch = candidates[start:start + chunk]
+                games = payoffs[others[start:start + chunk]] - payoffs[batch][:, np.newaxis, :]
+                values, weights, responses = solveMatrixGames(games, tol)
+                for k, b in enumerate(batch):
+                    # keeping only the mixtures that actually dominate b
+                    if np.isfinite(weights[k]).all() and (weights[k] @ games[k]).min() > tol:
+                        mixtures[b] = np.zeros(len(strategies))
+                        mixtures[b][others[start + k]] = weights[k]
+        
+        dominated = []
+        for b in sorted(mixtures):
+            mixture = np.zeros(len(survivors[x]))
+            mixture[strategies] = mixtures[b]
+            dominated.append([int(strategies[b]), mixture.tolist()])
+        return dominated
+    
+    def fitRationalityProbabilities(self, observations, perPlayer = False, noise = 1e-3, tol = 1e-10, maxIter = 10000, chunkSize = 2 ** 20):
+        """Finds the maximum-likelihood probabilities of the rationality levels given observed play, under the level-k model of levelLikelihood
+
+        Args:
+            observations (np.ndarray, str, or iterable): the flat profile indices of the observed profiles, as accepted by countObservedStrategies
+            perPlayer (bool): whether to fit separate probabilities for each player, stored in players[x].rationalityProbabilities with players[x].rationality set to the most likely level, instead of one set of probabilities stored in rationalityProbabilities
+            noise (float): the probability that a player plays a uniformly random strategy instead of their level's strategy, which keeps strategies that no level plays possible
+            tol (float): stops once the log-likelihood improves by less than tol per observation
+            maxIter (int): the maximum number of iterations
+            chunkSize (int): the number of observations read at once
+
+        Returns:
+            tuple: (probabilities, logLikelihood), where probabilities is a list of the level probabilities, or a list of them per player if perPlayer
+        """
+        if not 0 < noise < 1:
+            print(Fore.RED + f"fitRationalityProbabilities: invalid input. Expected a noise probability in (0, 1), but received {noise} instead." + Style.RESET_ALL)
+            return None, None
+        counts = self.countObservedStrategies(observations, chunkSize)
+        if counts is None:
+            return None, None
+        numObservations = int(counts[0].sum())
+        if numObservations == 0:
+            print(Fore.RED + f"fitRationalityProbabilities: invalid input. There are no observations." + Style.RESET_ALL)
+            return None, None
+        
+        levelStrategies = np.array(self.computeKStrategies(), dtype=np.int64)
+        probabilities = np.full((self.numPlayers, self.maxRationality), 1.0 / self.maxRationality)
+        logLikelihood, gradient = levelLikelihood(counts, levelStrategies, probabilities, noise)
+        for iteration in range(maxIter):
+            # the expected number of observations from each level
+            responsibilities = probabilities * gradient
+            if not perPlayer:
+                responsibilities[:] = responsibilities.sum(axis=0)
+            probabilities = responsibilities / responsibilities.sum(axis=1, keepdims=True)
+            previous = logLikelihood
+            logLikelihood, gradient = levelLikelihood(counts, levelStrategies, probabilities, noise)
+            if logLikelihood - previous <= tol * numObservations:
+                break
+        
+        if perPlayer:
+            for x in range(self.numPlayers):
+                self.players[x].rationalityProbabilities = probabilities[x].tolist()
+                self.players[x].rationality = int(np.argmax(probabilities[x]))
+            return probabilities.tolist(), logLikelihood
+        self.rationalityProbabilities = probabilities[0].tolist()
+        return self.rationalityProbabilities, logLikelihood
+    
+    @classmethod
+    def fromArray(cls, arr, copy = False, playerAxis = None):
+        """Creates a game whose payoff tensor is an existing array, without copying it unless asked to
+
+        Args:
+            arr (np.ndarray): the payoffs, of shape (numPlayers, s_1, ..., s_n) or (s_1, ..., s_n, numPlayers), e.g. an array, a memmap, or any object supporting the buffer protocol. Floating-point payoffs are used as they are; others are converted to floats, which copies them.
+            copy (bool): whether to copy the payoffs, so that the game doesn't share them with arr
+            playerAxis (int): 0 if the players are on the first axis or -1 if they're on the last. If None, it's the axis whose length is the number of other axes, preferring the first if both are.
+
+        Returns:
+            SimGame: the game, or None if arr doesn't have the shape of a game
+        """
+        arr = np.asarray(arr)
+        if playerAxis is None:
+            playerAxis = 0 if arr.ndim > 0 and arr.shape[0] == arr.ndim - 1 else -1
+        if arr.ndim < 3 or playerAxis not in (0, -1) or arr.shape[playerAxis] != arr.ndim - 1 or 0 in arr.shape:
+            print(Fore.RED + f"fromArray: invalid input. Expected payoffs of shape (numPlayers, s_1, ..., s_n) or (s_1, ..., s_n, numPlayers) with numPlayers >= 2, but received shape {arr.shape} instead." + Style.RESET_ALL)
+            return
+        if not np.issubdtype(arr.dtype, np.floating):
+            arr = arr.astype(float)
+        elif copy:
+            arr = arr.copy(order="K")
+        
+        game = cls(arr.ndim - 1)
+        game.setPayoffTensor(arr if playerAxis == 0 else np.moveaxis(arr, -1, 0))
+        game.resetStrategyNames()
+        game.resizeKMatrix()
+        return game
+    
+    @classmethod
+    def fromNFG(cls, fileName):
+        """Reads a game from a Gambit normal form (.nfg) file, in either the payoff-list or the outcome version
+
+        Args:
+            fileName (str): the file name
+
+        Returns:
+            SimGame: the game, or None if the file can't be read
+        """
+        with open(fileName, 'r') as file:
+            text = file.read()
+        
+        # the header is made of quoted strings, braces, and words
+        tokens = re.finditer(r'"(?:[^"\\]|\\.)*"|[{}]|[^\s{}",]+', text)
+        def nextToken():
+            match = next(tokens, None)
+            return (None, len(text)) if match is None else (match.group(), match.end())
+        def invalid(reason):
+            print(Fore.RED + f"fromNFG: invalid file. {fileName} {reason}" + Style.RESET_ALL)
+        
+        header = [nextToken()[0] for k in range(3)]
+        if header[0] != "NFG" or header[1] != "1" or header[2] not in ("R", "D"):
+            invalid("does not start with NFG 1 R or NFG 1 D.")
+            return
+        token, end = nextToken() # the title
+        token, end = nextToken()
+        if token != "{":
+            invalid("does not list the players.")
+            return
+        numPlayers = 0
+        token, end = nextToken()
+        while token not in ("}", None):
+            numPlayers += 1
+            token, end = nextToken()
+        
+        # the strategies, either as counts or as lists of names
+        numStrats = []
+        strategyNames = []
+        token, end = nextToken()
+        token, end = nextToken()
+        while token not in ("}", None):
+            if token == "{":
+                names = []
+                token, end = nextToken()
+                while token not in ("}", None):
+                    names.append(token[1:-1].replace('\\"', '"'))
+                    token, end = nextToken()
+                strategyNames.append(names)
+                numStrats.append(len(names))
+            elif token.isdigit():
+                numStrats.append(int(token))
+            else:
+                invalid(f"has an unexpected {token} in its strategies.")
+                return
+            token, end = nextToken()
+        if numPlayers < 2 or len(numStrats) != numPlayers or min(numStrats) < 1:
+            invalid(f"does not contain a game with {numPlayers} players and {numStrats} strategies.")
+            return
+        if not strategyNames:
+            strategyNames = [[str(s + 1) for s in range(numStrats[x])] for x in range(numPlayers)]
+        
+        # an optional comment
+        rest = text[end:].lstrip()
+        if rest.startswith('"'):
+            rest = rest[re.match(r'"(?:[^"\\]|\\.)*"', rest).end():].lstrip()
+        
+        numProfiles = int(np.prod(numStrats))
+        if rest.startswith("{"): # the outcome version: a list of outcomes, then the outcome of each profile
+            # outcome names are usually empty, which a plain replace removes much faster
+            section = rest.replace('{ ""', "{ ")
+            if '"' in section:
+                section = re.sub(r'"(?:[^"\\]|\\.)*"', " ", section)
+            close = re.search(r"}\s*}", section)
+            if close is None:
+                invalid("has an unterminated list of outcomes.")
+                return
+            outcomes = section[1:close.start() + 1]
+            numOutcomes = outcomes.count("{")
+            values = parseNumbers(outcomes.replace("{", " ").replace("}", " "))
+            if values is None or values.size != numOutcomes * numPlayers:
+                invalid(f"has outcomes without {numPlayers} payoffs.")
+                return
+            # outcome 0 is the null outcome, where everyone gets 0
+            outcomes = np.vstack([np.zeros((1, numPlayers)), values.reshape(numOutcomes, numPlayers)])
+            indices = parseNumbers(section[close.end():])
+            if indices is None or indices.size != numProfiles or np.any(indices != np.round(indices)) or indices.min() < 0 or indices.max() > numOutcomes:
+                invalid(f"does not give an outcome for each of the {numProfiles} profiles.")
+                return
+            payoffs = outcomes[indices.astype(np.int64)]
+        else: # the payoff-list version
+            payoffs = parseNumbers(rest)
+            if payoffs is None or payoffs.size != numProfiles * numPlayers:
+                invalid(f"does not contain {numPlayers} payoffs for each of the {numProfiles} profiles.")
+                return
+        
+        # with player 1 changing fastest, the payoffs are indexed by [s_n]...[s_1][x]
+        tensor = payoffs.reshape(tuple(reversed(numStrats)) + (numPlayers,)).transpose([numPlayers] + list(range(numPlayers - 1, -1, -1)))
+        game = cls(numPlayers)
+        game.setPayoffTensor(np.ascontiguousarray(tensor, dtype=float))
+        game.strategyNames = strategyNames
+        game.resizeKMatrix()
+        return game
+    
+    def getStrides(self):
+        """Returns the mixed-radix stride tables for the current shape of the game, computing them only when strategies have been added or removed
+
+        Returns:
+            tuple: (matrixStrides, profileStrides), where matrixStrides[x] is the step in the payoff array index m for one strategy of player x + 1 (0 for players 1 and 2) and profileStrides[x] is the step in the flat profile index
+        """
+        shape = self.payoffTensor.shape[1:]
+        with self.lock:
+            if self.strides is None or self.strides[0] != shape:
+                matrixStrides = np.zeros(len(shape), dtype=np.int64)
+                product = 1
+                for x in range(2, len(shape)):
+                    matrixStrides[x] = product
+                    product *= shape[x]
+                profileStrides = np.ones(len(shape), dtype=np.int64)
+                for x in range(len(shape) - 2, -1, -1):
+                    profileStrides[x] = profileStrides[x + 1] * shape[x + 1]
+                self.strides = (shape, matrixStrides, profileStrides)
+            return self.strides[1:]
+    
+    def initializeState(self, players):
+        """Sets up the state every game starts with, before it has any payoffs
+
+        Args:
+            players (list of Players): the players of the game
+        """
+        self.numPlayers = len(players)
+        self.players = players
+        self.lock = threading.RLock() # guards the caches below
+        self.bestResponseMask = None # bestResponseMask[x][s_1]...[s_n] is whether player x + 1's strategy is a best response
+        self.strides = None # (shape, matrixStrides, profileStrides) for the shape the stride tables were computed for
+        self.payoffBuffer = None # storage with room for more strategies, of which payoffTensor is the leading corner
+        self.version = 0 # counts the changes to the payoffs, so that subgames know when to read them again
+        self.subgames = weakref.WeakSet() # the subgames reading this game's payoffs
+        
+        self.maxRationality = 4 # the number of rationality levels, L_0, ..., L_{maxRationality - 1}
+        self.kMatrix = []
+        self.kOutcomes = [] # n-tuples that appear in kMatrix; won't be all of them
+        self.kStrategies = [[None for x in range(self.numPlayers)] for r in range(self.maxRationality)] # kStrategies[r][x] is the strategy player x + 1 plays at level L_r
+        self.mixedEquilibria = []
+        self.outcomeProbabilities = [] # probability of each outcome in kMatrix stored in kOutcomes; P(i, j)
+        self.pureEquilibria = []
+        self.rationalityProbabilities = [0.0 for r in range(self.maxRationality)] # probability a player is L_r
+        self.removedCols = []
+        self.removedMatrices = []
+        self.removedRows = []
+        self.removedStrategies = []
+        self.strategyNames = []
+        self.resizeKMatrix()
+        return
+    
     def isBestResponse(self, profile):
-        """Checks whether p1Strat and p2Strat are best responses relative to each other
+        """Checks whether each player's strategy in a profile is a best response to the other players' strategies
+
+        Args:
+            profile (list): the strategies to be checked
+
+        Returns:
+            list: br[x] is whether player x + 1's strategy is a best response
+        """
+        return self.computeBestResponses()[(slice(None),) + tuple(profile)].tolist()
+    
+    def isEpsilonEquilibrium(self, profile, eps = 1e-9):
+        """Checks whether a profile is an epsilon-equilibrium, i.e. no player can gain more than eps by deviating. With eps = 0, this checks for a Nash equilibrium.
+
+        Args:
+            profile (list): a pure profile of strategy indices or a mixed profile of probability lists, as accepted by regret
+            eps (float): the largest gain from deviating that is allowed
+
+        Returns:
+            bool: whether the profile is an epsilon-equilibrium
+        """
+        regrets = self.regret(profile)
+        if regrets is None:
+            return
+        return bool(regrets.max() <= eps)
+    
+    def isConstantSum(self, tol = 1e-9):
+        """Checks whether a two-player game is constant-sum, i.e. the players' payoffs add up to the same amount in every outcome
+
+        Args:
+            tol (float): the tolerance used when comparing the sums
+
+        Returns:
+            bool: whether the game is constant-sum
+        """
+        if self.numPlayers != 2:
+            return False
+        sums = self.payoffTensor[0] + self.payoffTensor[1]
+        return bool(np.ptp(sums) <= tol)
+    
+    def kToProfile(self, m):
+        """Converts an index in kMatrix into the profile of rationality levels of players 3,...,n that produces that index
+
+        Args:
+            m (int): the index of the payoff array of kMatrix
+
+        Returns:
+            list of ints: the levels, with -1 for players 1 and 2
+        """
+        levels = np.unravel_index(m, (self.maxRationality,) * (self.numPlayers - 2), order="F")
+        return [-1, -1] + [int(r) for r in levels]
+    
+    def lemkeHowson(self, label = None, allLabels = False, maxPivots = 100000):
+        """Computes a Nash equilibrium of a two-player game with the Lemke-Howson algorithm
+
+        Args:
+            label (int): the label that is dropped first; 0,...,m - 1 are player 1's strategies and m,...,m + n - 1 are player 2's. If None, paths from several labels are followed side by side and the first equilibrium reached is returned, since path lengths vary a lot between labels
+            allLabels (bool): whether to follow every label and return all of the distinct equilibria found
+            maxPivots (int): the maximum total number of pivots for one call
+
+        Returns:
+            list: the equilibrium [[p_1, ..., p_m], [q_1, ..., q_n]], or a list of equilibria if allLabels is True
+        """
+        if self.numPlayers != 2:
+            print(Fore.RED + f"lemkeHowson: expected a game with 2 players, but this game has {self.numPlayers}." + Style.RESET_ALL)
+            return []
+        numRows, numCols = self.payoffTensor.shape[1:]
+        if label is not None and (label < 0 or label >= numRows + numCols):
+            print(Fore.RED + f"lemkeHowson: invalid input. Expected a label between 0 and {numRows + numCols - 1}, but received {label} instead." + Style.RESET_ALL)
+            return []
+        
+        A, B = positiveBimatrix(self.payoffTensor)
+        
+        if allLabels:
+            equilibria = []
+            for k in range(numRows + numCols):
+                equilibrium = None
+                for pivots, equilibrium in enumerate(lemkeHowsonPath(A, B, k)):
+                    if equilibrium is not None or pivots >= maxPivots:
+                        break
+                if equilibrium and not any(np.allclose(equilibrium[0], other[0]) and np.allclose(equilibrium[1], other[1]) for other in equilibria):
+                    equilibria.append(equilibrium)
+            return equilibria
+        
+        # starting a new path every few pivots, so one long path can't hold everything up
+        labels = iter([label] if label is not None else range(numRows + numCols))
+        paths = []
+        pivots = 0
+        while pivots < maxPivots:
+            # capping the number of paths kept in memory at once
+            newLabel = next(labels, None) if len(paths) < 32 else None
+            if newLabel is not None:
+                paths.append(lemkeHowsonPath(A, B, newLabel))
+            if len(paths) == 0:
+                break
+            for path in list(paths):
+                for step in range(4):
+                    equilibrium = next(path)
+                    pivots += 1
+                    if equilibrium is not None:
+                        break
+                if equilibrium:
+                    return equilibrium
+                if equilibrium is not None:
+                    # the path was unbounded
+                    paths.remove(path)
+        warnings.warn(f"lemkeHowson: no equilibrium was reached within {maxPivots} pivots.", RuntimeWarning)
+        return []
+    
+    def logitHomotopy(self, tol = 1e-9, maxSteps = 10000, maxLambda = 1e7):
+        """Computes a Nash equilibrium of a game with any number of players by following the logit quantal response equilibria
 
         Args:
-            profile (int): the strategies to be checked
-        """
-        br = [True for x in range(self.numPlayers)]
-        if self.numPlayers < 3:
-            for i in chain(range(profile[0]), range(profile[0] + 1, self.players[0].numStrats)):
-                if self.payoffMatrix[0][profile[0]][profile[1]].getListNode(0).payoff < self.payoffMatrix[0][i][profile[1]].getListNode(0).payoff:
-                    br[0] = False
-            
-            for j in chain(range(profile[1]), range(profile[1] + 1, self.players[1].numStrats)):
-                if self.payoffMatrix[0][profile[0]][profile[1]].getListNode(1).payoff < self.payoffMatrix[0][profile[0]][j].getListNode(1).payoff:
-                    br[1] = False
-        else:
-            for player in range(self.numPlayers):
-                if player == 0:
-                    for i in range(self.players[0].numStrats):
-                        if self.payoffMatrix[self.toIndex(profile)][profile[0]][profile[1]].getListNode(0).payoff < self.payoffMatrix[self.toIndex(profile)][i][profile[1]].getListNode(0).payoff:
-                            br[player] = False
-                elif player == 1:
-                    for j in range(self.players[1].numStrats):
-                        if self.payoffMatrix[self.toIndex(profile)][profile[0]][profile[1]].getListNode(1).payoff < self.payoffMatrix[self.toIndex(profile)][profile[0]][j].getListNode(1).payoff:
-                            br[player] = False
-                # FIXME: finish computing BRs for players 2,...,numPlayers - 1
-                else: # player > 1
-                    m = 0
-                    product = 1
-                    numCompared = 0
-                    curProfile = [0 for x in range(self.numPlayers)]
-                    
-                    # Getting the number of matrices to be compared
-                    numToCompare = self.players[2].numStrats
-                    for x in range(3, self.numPlayers):
-                        if x != player:
-                            numToCompare *= self.players[x].numStrats
-                    numToCompare -= 1
-                    
-                    numCompared = 0
-                    while numCompared < numToCompare:
-                        if m != self.toIndex(profile):
-                            if self.payoffMatrix[self.toIndex(profile)][profile[0]][profile[1]].getListNode(player).payoff < self.payoffMatrix[m][profile[0]][profile[1]].getListNode(player).payoff:
-                                br[player] = False
-                            numCompared += 1
-
-                        # obtaining the next profile in the sequence
-                        if player > 2 and player < self.numPlayers - 1 and product == 1:
-                            for x in range(2, player):
-                                product *= self.players[x].numStrats
-                        m += product
-        return br
-    
-    def kToProfile(self, m):
-        """Converts an index in a list of payoff arrays into the strategy profile that produces that index
+            tol (float): the tolerance used by the corrector and when checking the equilibrium
+            maxSteps (int): the maximum number of predictor-corrector steps
+            maxLambda (float): the largest lambda that is followed, relative to payoffs scaled to [0, 1]
+
+        Returns:
+            list: the equilibrium [[p_1, ..., p_m], [q_1, ..., q_n], ...], or [] if none was found
         """
-        rationality = 0
-        previousValues = 0
-        product = 1
-        rationalityProfile = [-1, -1] + [0 for x in range(2, self.numPlayers)]
+        numStrats = list(self.payoffTensor.shape[1:])
+        starts = np.cumsum([0] + numStrats)
+        # equilibria don't change under positive affine transformations of a player's payoffs
+        tensor = self.payoffTensor.astype(float)
+        for x in range(self.numPlayers):
+            spread = np.ptp(tensor[x])
+            tensor[x] = (tensor[x] - tensor[x].min()) / (spread if spread > 0 else 1)
         
-        product = 4 ** (self.numPlayers - 3)
+        def split(vector):
+            return [vector[starts[x]:starts[x + 1]] for x in range(self.numPlayers)]
         
-        for x in range(self.numPlayers - 1, 1, -1):
-            rationality = 0
-            while product * rationality + previousValues < m and rationality != 4:
-                rationality += 1
-                
-            if product * rationality + previousValues > m:
-                rationality -= 1
-                
-            previousValues += product * rationality
-            rationalityProfile[x] = rationality
-            product = product / 4
+        def homotopy(z):
+            # z is the log-probabilities followed by lambda
+            logs = split(z[:-1])
+            strategies = [np.exp(log) for log in logs]
+            payoffs = deviationPayoffs(tensor, strategies)
+            jacobian = deviationJacobian(tensor, strategies)
+            values = []
+            rows = []
+            for x in range(self.numPlayers):
+                # log p_k - log p_0 = lambda (u_k - u_0) for k > 0, and the probabilities add up to 1
+                values.append(logs[x][1:] - logs[x][0] - z[-1] * (payoffs[x][1:] - payoffs[x][0]))
+                values.append([strategies[x].sum() - 1])
+                block = np.zeros((numStrats[x], len(z)))
+                for y in range(self.numPlayers):
+                    # differentiating with respect to the log-probabilities
+                    block[:-1, starts[y]:starts[y + 1]] = -z[-1] * (jacobian[x][y][1:] - jacobian[x][y][0]) * strategies[y]
+                block[np.arange(numStrats[x] - 1), starts[x] + 1 + np.arange(numStrats[x] - 1)] += 1
+                block[:-1, starts[x]] -= 1
+                block[:-1, -1] = -(payoffs[x][1:] - payoffs[x][0])
+                block[-1, starts[x]:starts[x + 1]] = strategies[x]
+                rows.append(block)
+            return np.concatenate(values), np.vstack(rows)
+        
+        def tangent(jacobian, orientation):
+            # the direction of the curve is the null space of the jacobian, oriented so that the sign of the determinant of the jacobian bordered by the direction stays the same along the branch, which keeps the path from turning back at folds
+            direction = np.linalg.svd(jacobian)[2][-1]
+            return direction if np.linalg.slogdet(np.vstack([jacobian, direction]))[0] == orientation else -direction
+        
+        z = np.concatenate([-np.log(numStrats[x]) * np.ones(numStrats[x]) for x in range(self.numPlayers)] + [[0.0]])
+        step = 0.1
+        nextCheck = 1.0
+        values, jacobian = homotopy(z)
+        # the branch starts out toward increasing lambda
+        direction = np.linalg.svd(jacobian)[2][-1]
+        if direction[-1] < 0:
+            direction = -direction
+        orientation = np.linalg.slogdet(np.vstack([jacobian, direction]))[0]
+        for steps in range(maxSteps):
+            # predicting along the tangent, then correcting back onto the curve with Newton's method
+            converged = False
+            predicted = z + step * direction
+            candidate = predicted.copy()
+            with np.errstate(all='ignore'):
+                for newton in range(6):
+                    values, jacobian = homotopy(candidate)
+                    if not np.isfinite(jacobian).all():
+                        break
+                    correction = np.linalg.lstsq(jacobian, values, rcond=None)[0]
+                    candidate -= correction
+                    if np.abs(correction).max() <= tol ** 0.5:
+                        converged = True
+                        break
+            # rejecting steps that correct too far or turn too sharply, which could jump onto another branch
+            if converged:
+                newDirection = tangent(jacobian, orientation)
+            if not converged or np.linalg.norm(candidate - predicted) > 0.5 * step or newDirection @ direction < 0.9 or candidate[-1] < 0:
+                step /= 2
+                if step < 1e-12:
+                    break
+                continue
+            z = candidate
+            direction = newDirection
+            step = min(step * 1.5, 1e3)
             
-        return rationalityProfile
+            if z[-1] >= nextCheck or z[-1] >= maxLambda:
+                nextCheck = z[-1] * 2
+                equilibrium = polishEquilibrium(tensor, split(np.exp(z[:-1])), tol)
+                if equilibrium is not None:
+                    return equilibrium
+                if z[-1] >= maxLambda:
+                    break
+        warnings.warn(f"logitHomotopy: no equilibrium was found within {maxSteps} steps.", RuntimeWarning)
+        return []
     
     def maxStrat(self, x):
         """Returns the strategy that gives player x + 1's maximum payoff over all outcomes
@@ -1837,35 +2395,11 @@ class SimGame:
         Args:
             x (int): the player index        
         """
-        maxStrat = 0
-        maxVal = -10000000
-        curList = ListNode()
-        
-        if x == 0:
-            for m in range(len(self.payoffMatrix)):
-                for i in range(self.players[0].numStrats):
-                    for j in range(self.players[1].numStrats):
-                        curList = self.payoffMatrix[m][i][j]
-                        if curList.getListNode(x).payoff > maxVal:
-                            maxVal = curList.getListNode(x).payoff
-                            maxStrat = i
-        elif x == 1:
-            for m in range(len(self.payoffMatrix)):
-                for i in range(self.players[0].numStrats):
-                    for j in range(self.players[1].numStrats):
-                        curList = self.payoffMatrix[m][i][j]
-                        if curList.getListNode(x).payoff > maxVal:
-                            maxVal = curList.getListNode(x).payoff
-                            maxStrat = j
-        else: # x > 1
-            for m in range(len(self.payoffMatrix)):
-                for i in range(self.players[0].numStrats):
-                    for j in range(self.players[1].numStrats):
-                        curList = self.payoffMatrix[m][i][j]
-                        if curList.getListNode(x).payoff > maxVal:
-                            maxVal = curList.getListNode(x).payoff
-                            maxStrat = self.toProfile(m)[x]
-        return maxStrat
+        # searching the payoff arrays in order so that ties go to the first maximum found
+        payoffs = toMatrixLayout(self.payoffTensor[x], self.numPlayers)
+        m, i, j = np.unravel_index(np.argmax(payoffs), payoffs.shape)
+        profile = [i, j] + self.toProfile(m)[2:]
+        return int(profile[x])
     
     def paretoOptimal(self, profile):
         """Checks if an outcome is Pareto optimal
@@ -1873,109 +2407,33 @@ class SimGame:
         Args:
             profile (list): the strategy profile for the outcome in question
         """
-        curList = ListNode()
-        curProfile = self.payoffMatrix[self.toIndex(profile)][profile[0]][profile[1]]
-        # (-->)
-        onePlayerWorseOff = True
-        # (<--)
-        # onePlayerBetterOff = True
-        # count = 0
-        # (-->)
-        betterOutcomes = []
-        betterOffPlayers = []
-        worseOff = []
-        # (<--)
-        worseOutcomes = []
-        worseOffPlayers = []
-        betterOff = []
-        
-        comparing = [0 for x in range(self.numPlayers)]
-        for m in range(len(self.payoffMatrix)):
-            comparing = self.toProfile(m)
-            for i in range(self.players[0].numStrats):
-                comparing[0] = i
-                for j in range(self.players[1].numStrats):
-                    comparing[1] = j
-                    if comparing != profile:
-                        foundOneBetter = False
-                        foundOneWorse = False
-                        x = 0
-                        while (not foundOneBetter or not foundOneWorse) and x < self.numPlayers:
-                            curList = self.payoffMatrix[m][i][j]
-                            curProfile = self.payoffMatrix[self.toIndex(profile)][profile[0]][profile[1]]
-                        
-                            if curProfile.getListNode(x).payoff < curList.getListNode(x).payoff:
-                                foundOneBetter = True
-                                betterOffPlayers.append(x)
-                                betterOutcomes.append(self.toProfile(m))
-                                # first two are -1
-                                betterOutcomes[len(betterOutcomes) - 1][0] = i
-                                betterOutcomes[len(betterOutcomes) - 1][1] = j
-                                worseOff.append(False)
-                            elif curProfile.getListNode(x).payoff > curList.getListNode(x).payoff:
-                                foundOneWorse = True
-                                worseOffPlayers.append(x)
-                                worseOutcomes.append(self.toProfile(m))
-                                # first two are -1
-                                worseOutcomes[len(worseOutcomes) - 1][0] = i
-                                worseOutcomes[len(worseOutcomes) - 1][1] = j
-                                betterOff.append(False)
-                            x += 1
-        
-        # determine if at least one other player is worse off at each outcome found
-        if len(betterOutcomes) > 0:
-            if len(worseOutcomes) <= 0:
-                return False
-            
-            n = 0
-            while n < len(worseOff) and not worseOff[n]:
-                for x in range(self.numPlayers):
-                    if betterOffPlayers[n] != x:
-                        curList = self.payoffMatrix[self.toIndex(betterOutcomes[n])][betterOutcomes[n][0]][betterOutcomes[n][1]]
-                        curProfile = self.payoffMatrix[self.toIndex(profile)][profile[0]][profile[1]]
-
-                        if curList.getListNode(x).payoff < curProfile.getListNode(x).payoff:
-                            worseOff[n] = True
-                n += 1
-            n = 0
-            while n < len(worseOff) and onePlayerWorseOff:
-                if not worseOff[n]:
-                    onePLayersWorseOff = False
-                n += 1
-            
-            if onePlayerWorseOff:
-                return True
-            else:
-                return False
-        else:
-            return True
+        outcome = self.payoffTensor[(slice(None),) + tuple(profile)]
+        payoffs = self.payoffTensor.reshape(self.numPlayers, -1)
+        # an outcome is Pareto optimal if no other outcome makes a player better off without making another worse off
+        paretoDominating = np.all(payoffs >= outcome[:, np.newaxis], axis=0) & np.any(payoffs > outcome[:, np.newaxis], axis=0)
+        return not paretoDominating.any()
     
     def print(self):
         """Prints the payoff matrix
         """
-        for m in range(len(self.payoffMatrix)):
+        matrices = tensorToMatrices(self.payoffTensor)
+        for m in range(len(matrices)):
             for i in range(self.players[0].numStrats):
                 for j in range(self.players[1].numStrats):
-                    self.payoffMatrix[m][i][j].print() # print the linked list in self.payoffMatrix[m][i][j]
+                    print(", ".join(formatPayoff(payoff) for payoff in matrices[m][i][j]), end=" ") # print the payoffs of the outcome
                     if j < self.players[1].numStrats - 1:
                         print("  ", end="")
                     else:
                         print()
-            if m < len(self.payoffMatrix) - 1:
+            if m < len(matrices) - 1:
                 print()
                 
     def printKMatrix(self, probabilities = [0.25, 0.25, 0.25, 0.25]):
-        self.rationalityProbabilities = probabilities
-        curEntry = []
-        temp = []
-        inOutcomes = False
-        self.kOutcomes = []
-        self.outcomeProbabilities = []        
         self.computeKMatrix(probabilities)
         print()
         for m in range(len(self.kMatrix)):            
-            for r1 in range(4):
-                for r2 in range(4):
+            for r1 in range(self.maxRationality):
+                for r2 in range(self.maxRationality):
                     curEntry = self.kMatrix[m][r1][r2]
                     print("(", end="")
                     for x in range(self.numPlayers):
@@ -1983,7 +2441,7 @@ class SimGame:
                         if x < self.numPlayers - 1:
                             print(", ", end="")
                     print(")", end="")
-                    if r2 < 3:
+                    if r2 < self.maxRationality - 1:
                         print(" ", end="")
                 print()
             print()
@@ -1991,36 +2449,26 @@ class SimGame:
     def printBestResponses(self):
         """Prints the payoff matrix
         """
-        self.computeBestResponses()
-        if self.numPlayers < 3:
+        matrices = tensorToMatrices(self.computeBestResponses())
+        for m in range(len(matrices)):
+            if self.numPlayers > 2:
+                print("m:", m)
             for i in range(self.players[0].numStrats):
                 for j in range(self.players[1].numStrats):
-                    self.payoffMatrix[0][i][j].printBestResponse()
+                    print(", ".join(str(int(br)) for br in matrices[m][i][j]), end=" ")
                     if j < self.players[1].numStrats - 1:
-                            print("  ", end="")
+                        print("  ", end="")
                     else:
                         print()
             print()
-        else:
-            for m in range(len(self.payoffMatrix)):
-                print("m:", m)
-                for i in range(self.players[0].numStrats):
-                    for j in range(self.players[1].numStrats):
-                        self.payoffMatrix[m][i][j].printBestResponse()
-                        if j < self.players[1].numStrats - 1:
-                            print("  ", end="")
-                        else:
-                            print()
-                print()
     
-    def probabilizeKChoices(self):
-        self.computeKStrategies()    
-        self.computeOutcomeProbabilities()
+    def probabilizeKChoices(self, kStrategies = None):
+        """Prints the probability of each outcome in kOutcomes
 
-        choices = [0 for x in range(self.numPlayers)]
-        for x in range(self.numPlayers):
-            choices[x] = self.kStrategies[self.players[x].rationality][x]
-            self.players[x].kChoice = choices[x]
+        Args:
+            kStrategies (list of lists of ints): the strategies of each level as computed by computeKStrategies. If None, they are computed.
+        """
+        self.computeOutcomeProbabilities(kStrategies)
         
         for n in range(len(self.kOutcomes)):
             print("P(", end="")
@@ -2032,142 +2480,155 @@ class SimGame:
         
         return
 
-    def readFromFile(self, fileName):
-        addMoreOutcomesPast2 = False # kMatrix
-        nP = -1 # numPlayers
-        nS = -1 # numStrats
-        r = -1 # rationality
-        oldNumPlayers = -1
-        oldNumStrats = [-1 for i in range(self.numPlayers)]
-        oldSize = -1
-        curList = []
+    def ravel(self, profiles):
+        """Converts strategy profiles into flat profile indices, the positions of the profiles in payoffTensor[x].ravel(). This is the inverse of the function unravel.
+
+        Args:
+            profiles (array-like): array of shape (..., numPlayers) containing strategy profiles
+
+        Returns:
+            np.ndarray: the flat indices, of shape profiles.shape[:-1]
+        """
+        return np.asarray(profiles) @ self.getStrides()[1]
+    
+    def readFromBinaryFile(self, fileName):
+        """Reads a game from a binary file written by saveToFile, memory-mapping the payoffs copy-on-write
+
+        Args:
+            fileName (str): the file name
+        """
+        with open(fileName, 'rb') as file:
+            magic = file.read(len(BINARY_MAGIC))
+            fields = file.read(8)
+            if magic != BINARY_MAGIC or len(fields) != 8:
+                print(Fore.RED + f"readFromBinaryFile: invalid file. {fileName} is not a binary game file." + Style.RESET_ALL)
+                return
+            version, headerLength = struct.unpack("<II", fields)
+            if version != BINARY_VERSION:
+                print(Fore.RED + f"readFromBinaryFile: invalid file. {fileName} has format version {version}, but only version {BINARY_VERSION} can be read." + Style.RESET_ALL)
+                return
+            try:
+                header = json.loads(file.read(headerLength).decode("utf-8"))
+                numPlayers = int(header["numPlayers"])
+                numStrats = [int(numStrat) for numStrat in header["numStrats"]]
+                rationalities = [int(rationality) for rationality in header["rationalities"]]
+                strategyNames = [[str(name) for name in names] for names in header["strategyNames"]]
+            except (ValueError, KeyError, TypeError):
+                print(Fore.RED + f"readFromBinaryFile: invalid file. {fileName} has a malformed header." + Style.RESET_ALL)
+                return
+            file.seek(0, 2)
+            fileSize = file.tell()
+        
+        offset = -(-(len(BINARY_MAGIC) + 8 + headerLength) // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+        shape = (numPlayers,) + tuple(numStrats)
+        if numPlayers < 2 or len(numStrats) != numPlayers or min(numStrats) < 1 or len(rationalities) != numPlayers or len(strategyNames) != numPlayers or fileSize < offset + 8 * int(np.prod(shape)):
+            print(Fore.RED + f"readFromBinaryFile: invalid file. {fileName} does not contain a game with {numPlayers} players and {numStrats} strategies." + Style.RESET_ALL)
+            return
+        
+        for x in range(len(self.players), numPlayers):
+            self.players.append(Player(numStrats[x]))
+        self.numPlayers = numPlayers
+        for x in range(self.numPlayers):
+            self.players[x].rationality = rationalities[x]
+        self.setPayoffTensor(np.memmap(fileName, dtype="<f8", mode="c", offset=offset, shape=shape))
+        self.strategyNames = strategyNames
+        self.resizeKMatrix()
+        print("Done reading from " + fileName)
+    
+    def readFromFile(self, fileName, chunkSize = 2 ** 24, progress = None):
+        """Reads a game from a text file written by saveToFile, or from a binary file with readFromBinaryFile
+
+        Args:
+            fileName (str): the file name
+            chunkSize (int): the number of characters read at a time
+            progress (function): called as progress(numRead, numPayoffs) after each chunk, with the number of payoffs read so far and in total
+        """
+        with open(fileName, 'rb') as file:
+            binary = file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+        if binary:
+            self.readFromBinaryFile(fileName)
+            return
         
         with open(fileName, 'r') as file:
-            oldNumPlayers = self.numPlayers
+            # reading numPlayers and numStrats
+            numPlayers = int(file.readline())
+            numStrats = [int(n) for n in file.readline().split()]
             
-            for x in range(self.numPlayers):
-                oldNumStrats[x] = self.players[x].numStrats
-                
-            oldSize = len(self.payoffMatrix)
+            # Getting strategy names, keeping names such as C(3, 1) together
+            strategyNames = [re.findall(r"[^\s(]*\([^)]*\)|\S+", file.readline()) for x in range(numPlayers)]
             
-            # reading numPlayers
-            nP = file.readline()
-            self.numPlayers = int(nP)
+            # Getting rationalities
+            rationalities = [int(rat) for rat in file.readline().split()]
             
-            # reading numStrats for old players
-            if oldNumPlayers <= self.numPlayers:
-                nS = file.readline().split(" ")
-                for n in nS:
-                    n = n.rstrip()
-                
-                # Getting strategy names
-                for x in range(self.numPlayers):
-                    self.strategyNames[x] = file.readLine().split(" ")
-                
-                # Getting rationalities
-                rats = file.readline().split(" ")
-                for rat in rats:
-                    rat = rat.rstrip()
-                               
-                for x in range(oldNumPlayers):
-                    self.players[x].numStrats = int(nS[x])
-                    self.players[x].rationality = int(rats[x])
-            else:
-                nS = file.readline().split(" ")
-                for n in nS:
-                    n = int(n.rstrip())
-                # Getting rationalities
-                rats = file.readline.split(" ")
-                for rat in rats:
-                    rat = int(rat.rstrip())
-                
-                for x in range(numPlayers):
-                    self.players[x].numStrats = int(nS[x])
-                    self.players[x].rationality = rats[x]
+            if len(numStrats) != numPlayers or len(rationalities) != numPlayers:
+                print(Fore.RED + f"readFromFile: invalid file. {fileName} does not contain a game with {numPlayers} players and {numStrats} strategies." + Style.RESET_ALL)
+                return
             
-            """
-			add new players if there are more,
-			resizing payoffMatrix and kMatrix,
-			increase the size of kStrategy lists 
-            """
-            if oldNumPlayers != self.numPlayers:
-                if oldNumPLayers < numPlayers:
-                    addMoreOutcomesPast2 = True
-                # Create new players and read rest of numStrats
-                for x in range(oldNumPlayers, self.numPlayers):
-                    p = Player(int(nS[x]), rats[x])
-                    players.append(p)
-                    
-            # new matrices added to the end
-            size = 1
-            if self.numPlayers > 2:
-                for x in range(2, self.numPlayers):
-                    size *= self.players[x].numStrats
-            if size > len(self.payoffMatrix):
-                self.payoffMatrix += [] * (size - len(self.payoffMatrix))
-            else:
-                self.payoffMatrix = self.payoffMatrix[:size]
+            # the file lists the payoffs by payoff array m, row i, column j, then player x; finding where each goes in the tensor
+            shape = (numPlayers,) + tuple(numStrats)
+            tensor = np.empty(shape)
+            tensorStrides = np.array(tensor.strides) // tensor.itemsize
+            numMatrices = int(np.prod(numStrats[2:]))
+            matrixOffsets = np.zeros(numMatrices, dtype=np.int64)
+            product = 1
+            for x in range(2, numPlayers):
+                matrixOffsets += (np.arange(numMatrices) // product % numStrats[x]) * tensorStrides[x + 1]
+                product *= numStrats[x]
+            cellsPerMatrix = numStrats[0] * numStrats[1] * numPlayers
+            numPayoffs = numMatrices * cellsPerMatrix
             
-            size = 1
-            if self.numPlayers > 2:
-                size = 4 ** (self.numPlayers - 2)
-            if size > len(self.kMatrix):
-                self.kMatrix += [] * (size - len(self.kMatrix))
-            else:
-                self.kMatrix = self.kMatrix[:size]
-
-            # creating/deleting entries and reading values
-            for m in range(len(self.payoffMatrix)):
-                if self.players[0].numStrats > len(self.payoffMatrix[m]):
-                    self.payoffMatrix[m] += [] * (self.players[0].numStrats - len(self.payoffMatrix[m]))
-                else:
-                    self.payoffMatrix[m] = self.payoffMatrix[m][:self.players[0].numStrats]
-                for i in range(self.players[0].numStrats):
-                    # resizing
-                    if self.players[1].numStrats > len(self.payoffMatrix[m][i]):
-                        self.payoffMatrix[m][i] += [] * (self.players[1].numStrats - len(self.payoffMatrix[m][i]))
-                    else:
-                        self.payoffMatrix[m][i] = self.payoffMatrix[m][i][:self.players[1].numStrats]
-                    # Reading in the next row of payoffs
-                    payoffs = file.readline().split(" ")
-                    for payoff in payoffs:
-                        payoff = float(payoff.rstrip())
-                    groupedPayoffs = [payoffs[i:i + self.numPlayers] for i in range(0, len(payoffs), self.numPlayers)]
-                    
-                    for j in range(self.players[1].numStrats):
-                        # Create new list if needed
-                        if not self.payoffMatrix[m][i][j]:
-                            newList = ListNode(0, False)
-                            self.payoffMatrix[m][i][j] = newList
-                        curList = self.payoffMatrix[m][i][j]
-                        while curList.size() > self.numPlayers:
-                            # Deleting
-                            curList.removeAtIndex(curList.size() - 1)
-                        
-                        for x in range(self.numPlayers):
-                            if m < oldSize and x < oldNumPlayers and i < oldNumStrats[0] and j < oldNumStrats[1]: # old matrix, old outcome, old payoff
-                                curList.updateListNode(float(groupedPayoffs[j][x]), x) # inserting payoff value
-                            else: # Everything is new
-                                # Adding
-                                curList.appendNode(int(payoffs[x]), False)
-            if addMoreOutcomesPast2:
-                for m in range((len(self.kMatrix))):
-                    if 4 > len(self.kMatrix[m]):
-                        self.kMatrix[m] += [None] * (4 - len(self.kMatrix[m]))
-                    else:
-                        self.kMatrix[m] = self.kMatrix[m][:4]
-                    for i in range(4):
-                        if 4 > len(self.kMatrix[m]):
-                            self.kMatrix[m][i] += [None] * (4 - len(self.kMatrix[m][i]))
-                        else:
-                            self.kMatrix[m][i] = self.kMatrix[m][i][:4]
-                        for j in range(4):
-                            myList = [-1 for l in range(self.numPlayers)]
-                            kMatrix[m][i][j] = myList
+            # reading the payoffs, one row of outcomes per line with blank lines between payoff arrays
+            flat = tensor.reshape(-1)
+            numRead = 0
+            tooMany = False
+            leftover = ""
+            while True:
+                chunk = file.read(chunkSize)
+                text = leftover + chunk
+                if chunk:
+                    # a number may continue into the next chunk
+                    cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t"))
+                    text, leftover = (text[:cut], text[cut:]) if cut >= 0 else ("", text)
+                if text.strip():
+                    try:
+                        with warnings.catch_warnings():
+                            warnings.simplefilter("error")
+                            values = np.fromstring(text, sep=" ")
+                    except (ValueError, DeprecationWarning):
+                        print(Fore.RED + f"readFromFile: invalid file. {fileName} contains payoffs that aren't numbers." + Style.RESET_ALL)
+                        return
+                    if numRead + len(values) > numPayoffs:
+                        tooMany = True
+                        break
+                    positions = np.arange(numRead, numRead + len(values))
+                    m, cell = np.divmod(positions, cellsPerMatrix)
+                    i, cell = np.divmod(cell, numStrats[1] * numPlayers)
+                    j, x = np.divmod(cell, numPlayers)
+                    flat[x * tensorStrides[0] + i * tensorStrides[1] + j * tensorStrides[2] + matrixOffsets[m]] = values
+                    numRead += len(values)
+                    if progress is not None:
+                        progress(numRead, numPayoffs)
+                if not chunk:
+                    break
+        
+        if tooMany or numRead != numPayoffs:
+            print(Fore.RED + f"readFromFile: invalid file. {fileName} does not contain a game with {numPlayers} players and {numStrats} strategies." + Style.RESET_ALL)
+            return
+        
+        # add new players if there are more
+        for x in range(len(self.players), numPlayers):
+            self.players.append(Player(numStrats[x]))
+        self.numPlayers = numPlayers
+        for x in range(self.numPlayers):
+            self.players[x].numStrats = numStrats[x]
+            self.players[x].rationality = rationalities[x]
+        self.setPayoffTensor(tensor)
+        self.strategyNames = strategyNames
+        self.resizeKMatrix()
         print("Done reading from " + fileName)
 
-    def removeStrategy(self, player, s):
-        """Removes strategy s from player x in the payoff matrix
+    def recordRemoval(self, player, s):
+        """Records a removed strategy in removedRows, removedCols, or removedMatrices
 
         Args:
             player (int): index of the player
@@ -2175,57 +2636,84 @@ class SimGame:
         """
         if player == 0: # x is player 1
             self.removedRows.append(s)
-            for m in range(len(self.payoffMatrix)):
-                del self.payoffMatrix[m][s]
         elif player == 1: # x is player 2
             self.removedCols.append(s)
-            for m in range(len(self.payoffMatrix)):
-                for i in range(len(self.payoffMatrix[m])):
-                    del self.payoffMatrix[m][i][s]
         else: # player > 1
-            m = 0
-            product = 1
-            """In this file there's no x to go through, so just cycle through the 
-            matrices and delete the appropriate ones. 
-            """
-            # Starting at the first profile in the sequence
-            firstProfile = [0 for x in range(self.numPlayers)]
-            firstProfile[player] = s
-            m = self.toIndex(firstProfile)
-            
-            # lastProfile = [-1, -1] + [self.players[x].numStrats - 1 for x in range(2, self.numPlayers)]
-            # lastProfile[player] = s
-            
-            # Getting the number of matrices to be deleted
-            numToDelete = 1
-            for x in range(2, self.numPlayers):
-                if x != player:
-                    numToDelete *= self.players[x].numStrats
-            
-            numDeleted = 0
-            while numDeleted < numToDelete:
-                self.removedMatrices.append(m - numDeleted)
-                del self.payoffMatrix[m - numDeleted]
-                numDeleted += 1
-                
-                # obtaining the next profile in the sequence
-                if player == 2 and self.numPlayers > 3:
-                    product = self.players[player].numStrats
-                else:
-                    allBelowPlayerAtMaxStrat = True
-                    mProfile = self.toProfile(m)
-                    for x in range(2, player):
-                        if mProfile[x] != self.players[x].numStrats - 1:
-                            allBelowPlayerAtMaxStrat = False
-                    if mProfile[player] == s and allBelowPlayerAtMaxStrat:
-                        productBelowPlayer = 1
-                        for x in range(2, player):
-                            productBelowPlayer *= self.players[x].numStrats
-                        product += productBelowPlayer * (self.players[player].numStrats - 1)
-                    else:
-                        product = 1
-                m += product
-        self.players[player].numStrats -= 1
+            # the payoff arrays whose profiles have player x playing s
+            shape = tuple(self.players[x].numStrats for x in range(2, self.numPlayers))
+            indices = np.arange(int(np.prod(shape))).reshape(shape, order="F")
+            self.removedMatrices += [int(m) for m in np.take(indices, s, axis=player - 2).ravel(order="F")]
+        return
+    
+    def regret(self, profile):
+        """Computes how much each player could gain by deviating from a profile to one of their pure strategies
+
+        Args:
+            profile (list or np.ndarray): either a pure profile, a strategy index for each player, or a mixed profile, a list of probabilities for each player or an array with one row per player
+
+        Returns:
+            np.ndarray: regrets[x] is how much player x + 1 could gain by deviating
+        """
+        if isinstance(profile, (list, tuple, np.ndarray)) and all(isinstance(s, (int, np.integer)) and not isinstance(s, bool) for s in profile):
+            if len(profile) != self.numPlayers or any(s < 0 or s >= self.players[x].numStrats for x, s in enumerate(profile)):
+                print(Fore.RED + f"regret: invalid input. Expected a strategy index for each of the {self.numPlayers} players, but received {list(profile)} instead." + Style.RESET_ALL)
+                return
+            return self.batchRegret(np.array([profile], dtype=np.int64))[0]
+        error = mixedProfileError(profile, [self.players[x].numStrats for x in range(self.numPlayers)])
+        if error is not None:
+            print(Fore.RED + "regret: invalid input. " + error + Style.RESET_ALL)
+            return
+        strategies = [np.asarray(strategy, dtype=float) for strategy in profile]
+        payoffs = deviationPayoffs(self.payoffTensor, strategies)
+        return np.array([payoffs[x].max() - strategies[x] @ payoffs[x] for x in range(self.numPlayers)])
+    
+    def removeStrategy(self, player, s):
+        """Removes strategy s from player x in the payoff matrix
+
+        Args:
+            player (int): index of the player
+            s (int): index of the strategy
+        """
+        self.recordRemoval(player, s)
+        self.setPayoffTensor(np.delete(self.payoffTensor, s, axis=player + 1))
+    
+    def resizeKMatrix(self):
+        """Resizes the kStrategy lists to the current number of players and rationality levels
+        """
+        levels = self.maxRationality
+        self.kMatrix = []
+        self.kStrategies = self.kStrategies[:levels] + [[None for x in range(self.numPlayers)] for r in range(len(self.kStrategies), levels)]
+        for r in range(levels):
+            if self.numPlayers > len(self.kStrategies[r]):
+                self.kStrategies[r] += [None] * (self.numPlayers - len(self.kStrategies[r]))
+            else:
+                self.kStrategies[r] = self.kStrategies[r][:self.numPlayers]
+        return
+    
+    def reserve(self, x, capacity):
+        """Makes room for player x + 1 to have capacity strategies, so that appending strategies up to then doesn't move the payoffs
+
+        Args:
+            x (int): the index of the player
+            capacity (int): the number of strategies to make room for
+        """
+        if isinstance(x, bool) or not isinstance(x, (int, np.integer)) or x < 0 or x >= self.numPlayers:
+            print(Fore.RED + f"reserve: invalid input. Expected a player index between 0 and {self.numPlayers - 1}, but received {x} instead." + Style.RESET_ALL)
+            return
+        if isinstance(capacity, bool) or not isinstance(capacity, (int, np.integer)):
+            print(Fore.RED + f"reserve: invalid input. Expected an integer capacity, but received {capacity} instead." + Style.RESET_ALL)
+            return
+        tensor = self.payoffTensor
+        capacities = list(tensor.shape if self.payoffBuffer is None else self.payoffBuffer.shape)
+        if self.payoffBuffer is not None and capacity <= capacities[x + 1]:
+            return
+        capacities[x + 1] = max(capacity, tensor.shape[x + 1])
+        buffer = np.empty(capacities)
+        corner = tuple(slice(0, k) for k in tensor.shape)
+        buffer[corner] = tensor
+        self.payoffBuffer = buffer
+        self.setPayoffTensor(buffer[corner])
+        return
     
     def resetStrategyNames(self):
         self.strategyNames = []
@@ -2258,15 +2746,57 @@ class SimGame:
                 else:
                     center = ["C(" + str(x + 1) + ", " + str(s) + ")" for s in range(1, self.players[x].numStrats - 1)]
                 self.strategyNames.append(["L(" + str(x + 1) + ")"] + center + ["R(" + str(x + 1) + ")"])
-        print("HERE:", self.strategyNames)
         return
     
-    def saveToFile(self, fileName):
-        """Saves the data of a game to a text file
+    def restrict(self, strategies):
+        """Restricts the game to subsets of the players' strategies without copying any payoffs. See SubGame.
+
+        Args:
+            strategies (list of lists of ints): for each player, the indices of the strategies to keep, or None to keep all of them
+
+        Returns:
+            SubGame: the restricted game, sharing this game's payoffs
+        """
+        if not isinstance(strategies, (list, tuple)) or len(strategies) != self.numPlayers:
+            print(Fore.RED + f"restrict: invalid input. Expected a list of {self.numPlayers} lists of strategies, but received {strategies} instead." + Style.RESET_ALL)
+            return
+        for x in range(self.numPlayers):
+            if strategies[x] is None:
+                continue
+            kept = np.asarray(strategies[x])
+            if kept.ndim != 1 or len(kept) == 0 or not np.issubdtype(kept.dtype, np.integer):
+                print(Fore.RED + f"restrict: invalid input. Expected a nonempty list of strategy indices for player {x + 1}, but received {strategies[x]} instead." + Style.RESET_ALL)
+                return
+            if kept.min() < 0 or kept.max() >= self.players[x].numStrats or len(np.unique(kept)) != len(kept):
+                print(Fore.RED + f"restrict: invalid input. Expected distinct strategy indices between 0 and {self.players[x].numStrats - 1} for player {x + 1}, but received {strategies[x]} instead." + Style.RESET_ALL)
+                return
+        return SubGame(self, strategies)
+    
+    def saveToFile(self, fileName, binary = False):
+        """Saves the data of a game to a text file, or to a binary file that readFromFile memory-maps
 
         Args:
             fileName (str): the file name
+            binary (bool): whether to write the binary format, a versioned header followed by the raw payoff tensor
         """
+        if binary:
+            header = json.dumps({
+                "numPlayers": self.numPlayers,
+                "numStrats": [self.players[x].numStrats for x in range(self.numPlayers)],
+                "strategyNames": [[str(name) for name in names] for names in self.strategyNames],
+                "rationalities": [self.players[x].rationality for x in range(self.numPlayers)],
+            }).encode("utf-8")
+            offset = -(-(len(BINARY_MAGIC) + 8 + len(header)) // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+            with open(fileName, 'wb') as file:
+                file.write(BINARY_MAGIC + struct.pack("<II", BINARY_VERSION, len(header)) + header)
+                file.write(bytes(offset - file.tell()))
+                # writing one of player 1's strategies for one player at a time, so a memory-mapped game is never copied whole
+                for x in range(self.numPlayers):
+                    for block in self.payoffTensor[x]:
+                        file.write(np.ascontiguousarray(block, dtype="<f8").tobytes())
+            print("Saved to " + fileName + ".\n")
+            return
+        
         with open(fileName, 'w') as file:
             file.write(str(self.numPlayers) + "\n")
             
@@ -2294,81 +2824,123 @@ class SimGame:
                     file.write(" ")
             file.write("\n")
             
-            # write payoffMatrix to file
-            for m in range(len(self.payoffMatrix)):
+            # write payoffMatrix to file, one row of outcomes per line
+            matrices = tensorToMatrices(self.payoffTensor)
+            for m in range(len(matrices)):
                 for i in range(self.players[0].numStrats):
-                    for j in range(self.players[1].numStrats):
-                        curList = self.payoffMatrix[m][i][j]
-                        for x in range(self.numPlayers):
-                            file.write(str(curList.getListNode(x).payoff))
-                            if x < self.numPlayers - 1:
-                                file.write(" ")
-                        if j < self.players[1].numStrats - 1:
-                            file.write(" ")
+                    file.write(" ".join(formatPayoff(payoff) for payoff in matrices[m][i].ravel()))
                     if i < self.players[0].numStrats - 1:
                         file.write("\n")
-                if m < len(self.payoffMatrix) - 1:
+                if m < len(matrices) - 1:
                     file.write("\n\n")
             print("Saved to " + fileName + ".\n")
     
-    def solve_system(self, equations, variables):
-        print("equations:", equations)
-        print("variables:", variables)
-        
-        # Combine equations and variables into tuples
-        combined = list(zip(equations.keys(), equations.values()))
-        
-        # Sort combined list based on the number of free symbols in equations
-        combined.sort(key=lambda x: len(x[1].free_symbols))
-        
-        # Unpack sorted equations and variables
-        sorted_eqs = {eq[0]: eq[1] for eq in combined}
-        sorted_variables = [var[0] for var in combined]
-        print("sorted_eqs:", sorted_eqs)
-        print("sorted_variables:", sorted_variables)
+    def setMaxLevel(self, maxLevel):
+        """Sets the highest rationality level, so that the levels are L_0, ..., L_maxLevel
+
+        Args:
+            maxLevel (int): the highest level
+        """
+        if isinstance(maxLevel, bool) or not isinstance(maxLevel, (int, np.integer)) or maxLevel < 0:
+            print(Fore.RED + f"setMaxLevel: invalid input. Expected a nonnegative integer, but received {maxLevel} instead." + Style.RESET_ALL)
+            return
+        self.maxRationality = int(maxLevel) + 1
+        self.rationalityProbabilities = (list(self.rationalityProbabilities) + [0.0 for r in range(self.maxRationality)])[:self.maxRationality]
+        self.resizeKMatrix()
+        return
+    
+    def setPayoffTensor(self, tensor):
+        """Replaces the payoffs of the game, updating the players' numbers of strategies to match
+
+        Args:
+            tensor (np.ndarray): the payoff tensor of shape (numPlayers, s_1, ..., s_n)
+        """
+        if self.payoffBuffer is not None and tensor.base is not self.payoffBuffer:
+            self.payoffBuffer = None
+        # the subgames' index maps only fit the current strategies, so they copy their payoffs before the strategies change
+        with self.lock:
+            subgames = list(self.subgames)
+        for subgame in subgames:
+            if tensor.shape != self.payoffTensor.shape:
+                subgame.detach()
+        self.payoffTensor = tensor
+        self.numPlayers = tensor.shape[0]
+        for x in range(len(self.players), self.numPlayers):
+            self.players.append(Player(tensor.shape[x + 1]))
+        for x in range(self.numPlayers):
+            self.players[x].numStrats = tensor.shape[x + 1]
+        self.clearCaches()
+        return
+    
+    def solveZeroSum(self, tol = 1e-9):
+        """Solves a two-player constant-sum game, whose pairs of optimal strategies are exactly its Nash equilibria
+
+        Args:
+            tol (float): the tolerance used by solveMatrixGame
+
+        Returns:
+            float: player 1's value; player 2's is the constant sum minus it
+            list: player 1's optimal mixed strategy [p_1, ..., p_m]
+            list: player 2's optimal mixed strategy [q_1, ..., q_n]
+        """
+        if not self.isConstantSum():
+            print(Fore.RED + "solveZeroSum: expected a two-player constant-sum game." + Style.RESET_ALL)
+            return None, [], []
+        value, p, q = solveMatrixGame(self.payoffTensor[0], tol)
+        return value, p.tolist(), q.tolist()
+    
+    def supportEnumeration(self, tol = 1e-9, batchSize = 65536):
+        """Computes all Nash equilibria of a nondegenerate two-player game by support enumeration
+
+        Args:
+            tol (float): the tolerance used when checking probabilities and best responses
+            batchSize (int): the number of pairs of supports solved at once
+
+        Returns:
+            list: the equilibria [[p_1, ..., p_m], [q_1, ..., q_n]], where p and q are player 1's and player 2's mixed strategies
+        """
+        if self.numPlayers != 2:
+            print(Fore.RED + f"supportEnumeration: expected a game with 2 players, but this game has {self.numPlayers}." + Style.RESET_ALL)
+            return []
+        A = self.payoffTensor[0].astype(float)
+        B = self.payoffTensor[1].astype(float)
+        numRows, numCols = A.shape
         
-        # Iterate until all variables are solved for
-        k = 0
-        while sorted_variables and k < 5:
-            k += 1
-            variable = sorted_variables[0]
-            print("variable:", variable)
-            try:
-                # Solve the equation containing the chosen variable
-                print(f"Solving equation {equations[variable]} for variable {variable}.")
-                solutions = solve(equations[variable], variable)
-                print("solutions:", solutions)
-                if not equations[variable].free_symbols:
-                    solutions = [{variable:equations[variable]}]
-                solved_variable = solutions[0]
-                print("solutions:", solutions)
-                print("solved_variable:", solved_variable)
-                # Substitute the solved variable into other equations
-                for other_variable, eq in zip(sorted_variables, sorted_eqs):
-                    print("\tother_variable:", other_variable)
-                    print("\teq:", eq)
-                    # Check if the equation contains the variable
-                    if variable in eq.free_symbols:
-                        print("\tbefore:", sorted_eqs)
-                        print("\t\tvariable:", variable)
-                        print("\t\tvalue:", solved_variable[variable])
-                        sorted_eqs[other_variable] = eq.subs(variable, solved_variable[variable])
-                        print("\tafter:", sorted_eqs)
-                    else:
-                        # Variable not present in the equation, skip substitution
-                        print(f"Variable {variable} does not exist in equation {eq}.")
-                        pass
-                # Remove solved variable and its equation from the lists
-                sorted_variables.remove(variable)
-                del sorted_eqs[variable]
-            except IndexError:
-                # Handle case where no solution is found
-                print(f"No solution found for equation {equations[variable]} involving variable {variable}")
-                continue
-        # Solve the remaining equations for the remaining variables
-        solution = solve(list(equations.values()), variables)
-        return solution
+        # strategies that don't survive iterated elimination of strategies strictly dominated by mixed strategies are never in the support of an equilibrium
+        survivors = self.computeIESDS(mixed = True)[0]
+        rows = np.flatnonzero(survivors[0]).tolist()
+        cols = np.flatnonzero(survivors[1]).tolist()
         
+        equilibria = []
+        for k in range(1, min(len(rows), len(cols)) + 1):
+            rowSupports = np.array(list(combinations(rows, k)))
+            colSupports = np.array(list(combinations(cols, k)))
+            numPairs = len(rowSupports) * len(colSupports)
+            for start in range(0, numPairs, batchSize):
+                pairs = np.arange(start, min(start + batchSize, numPairs))
+                a = pairs // len(colSupports)
+                b = pairs % len(colSupports)
+                # q on the column support that makes player 1 indifferent over the row support
+                qs, valid = solveIndifference(A, rowSupports[a], colSupports[b], tol)
+                a, b, qs = a[valid], b[valid], qs[valid]
+                # p on the row support that makes player 2 indifferent over the column support, only where q passed
+                ps, valid = solveIndifference(B.T, colSupports[b], rowSupports[a], tol)
+                for n in np.flatnonzero(valid):
+                    p = np.zeros(numRows)
+                    q = np.zeros(numCols)
+                    p[rowSupports[a[n]]] = ps[n]
+                    q[colSupports[b[n]]] = qs[n]
+                    equilibria.append([p.tolist(), q.tolist()])
+        return equilibria
+    
+    def toArray(self):
+        """Returns the payoff tensor itself rather than a copy
+
+        Returns:
+            np.ndarray: the payoff tensor
+        """
+        return self.payoffTensor
+    
     def toIndex(self, profile):
         """Converts a sequence of strategies into the index in a stack of payoff arrays that correspond to that sequence. This is the inverse of the function toProfile. 
 
@@ -2378,32 +2950,42 @@ class SimGame:
         Returns:
             int: the desired index
         """
-        sameNumStratsPastPlayer2 = True
-        # Checking if players 2,...,numPlayers have the same number of strategies as player 3
-        for x in range(2, self.numPlayers):
-            if self.players[x].numStrats != self.players[1].numStrats:
-                self.sameNumStratsPastPlayer2 = False
-        
-        # c_2 + sum_{x = 3}^{nP - 1} (nS)^x * c_x
+        # c_3 + s_3 * c_4 + s_3 * s_4 * c_5 + ...; players 1 and 2 have stride 0
+        strides = self.getStrides()[0]
         num = 0 # return 0 if self.numPlayers < 3
-        if self.numPlayers > 2:
-            num = profile[2]
-        if sameNumStratsPastPlayer2: # if all players past player 2 have the same number of strategies
-            for x in range(3, self.numPlayers):
-                if profile[x] > 0:
-                    num += (self.players[2].numStrats ** (x - 2)) * profile[x]
-        else: # c_2 + sum_{x=3}^{nP} nS_2 *...* nS_{x-1} * c_x
-            if self.numPlayers > 3:
-                product = 0
-                for x in range(3, self.numPlayers):
-                    product = 1
-                    if profile[x] > 0:
-                        for y in range(2, x - 1):
-                            product *= self.players[y].numStrats
-                            
-                        num += product * profile[x]
+        for x in range(2, self.numPlayers):
+            num += int(strides[x]) * profile[x]
         return num
     
+    def toNFG(self, fileName, title = ""):
+        """Saves the game as a Gambit normal form (.nfg) file in the outcome version, which keeps the strategy names
+
+        Args:
+            fileName (str): the file name
+            title (str): the title of the game
+        """
+        def quote(name):
+            return '"' + str(name).replace('"', '\\"') + '"'
+        # with player 1 changing fastest, the payoffs are indexed by [s_n]...[s_1][x]
+        payoffs = self.payoffTensor.transpose(list(range(self.numPlayers, 0, -1)) + [0]).reshape(-1, self.numPlayers)
+        # strategies without a name are numbered, as fromNFG numbers them
+        names = []
+        for x in range(self.numPlayers):
+            names.append(list(self.strategyNames[x][:self.players[x].numStrats]) if x < len(self.strategyNames) else [])
+            names[x] += [str(s + 1) for s in range(len(names[x]), self.players[x].numStrats)]
+        with open(fileName, 'w') as file:
+            file.write("NFG 1 R " + quote(title) + " { " + " ".join(quote("Player " + str(x + 1)) for x in range(self.numPlayers)) + " }\n\n")
+            file.write("{ " + "\n".join("{ " + " ".join(quote(name) for name in names[x]) + " }" for x in range(self.numPlayers)) + "\n}\n\"\"\n\n{\n")
+            # formatting a block of outcomes at a time with one format string
+            outcome = '{ "" ' + ", ".join(["%r"] * self.numPlayers) + " }\n"
+            for start in range(0, len(payoffs), 65536):
+                block = payoffs[start:start + 65536]
+                file.write((outcome * len(block)) % tuple(block.ravel().tolist()))
+            file.write("}\n")
+            file.write(" ".join(map(str, range(1, len(payoffs) + 1))) + "\n")
+        print("Saved to " + fileName + ".\n")
+        return
+    
     def toProfile(self, m):
         """Converts an index in a stack of payoff arrays into the sequence of strategies that produce that index. This is the inverse of the function toIndex. 
 
@@ -2413,26 +2995,286 @@ class SimGame:
         Returns:
             list: a list of indices (strategies)
         """
-        choice = 0
-        prevValues = 0 # values from players below P_x
-        productNumStrats = 1
+        strides = self.getStrides()[0]
         profile = [-1, -1] + [0 for x in range(2, self.numPlayers)]
-        
-        for x in range(2, self.numPlayers - 1):
-            productNumStrats *= self.players[x].numStrats
-            
-        for x in range(self.numPlayers - 1, 1, -1):
-            choice = 0
-            while productNumStrats * choice + prevValues < m and choice != self.players[x].numStrats - 1:
-                choice += 1
-            
-            if productNumStrats * choice + prevValues > m:
-                choice -= 1
-                
-            prevValues += productNumStrats * choice
-            profile[x] = choice
-            productNumStrats = productNumStrats / self.players[x].numStrats
+        for x in range(2, self.numPlayers):
+            profile[x] = (int(m) // int(strides[x])) % self.players[x].numStrats
         return profile
+    
+    def unravel(self, indices):
+        """Converts flat profile indices into strategy profiles. This is the inverse of the function ravel.
+
+        Args:
+            indices (int or array-like): flat indices into payoffTensor[x].ravel()
+
+        Returns:
+            np.ndarray: array of shape indices.shape + (numPlayers,) containing the profiles
+        """
+        strides = self.getStrides()[1]
+        numStrats = np.array(self.payoffTensor.shape[1:])
+        return (np.asarray(indices)[..., np.newaxis] // strides) % numStrats
+
+    def vertexEnumeration(self, exact = False, tol = 1e-9):
+        """Computes all of the extreme Nash equilibria of a two-player game, including degenerate ones, by vertex enumeration
+
+        Args:
+            exact (bool): whether to recompute and check each equilibrium in exact rational arithmetic from the basis it was found at, in which case the probabilities are Fractions
+            tol (float): the tolerance used when traversing the polytopes
+
+        Returns:
+            list: the extreme equilibria [[p_1, ..., p_m], [q_1, ..., q_n]]
+            list: the maximal Nash subsets [[p, ...], [q, ...]] of extreme equilibrium strategies
+            list: the connected components of the equilibria, each a list of indices into the maximal Nash subsets
+        """
+        if self.numPlayers != 2:
+            print(Fore.RED + f"vertexEnumeration: expected a game with 2 players, but this game has {self.numPlayers}." + Style.RESET_ALL)
+            return [], [], []
+        numRows, numCols = self.payoffTensor.shape[1:]
+        
+        A, B = positiveBimatrix(self.payoffTensor)
+        # the variables of both polytopes are labeled by the strategies 0,...,m + n - 1 as in lemkeHowson
+        polytopes = []
+        for tableau, basis in [
+            (np.hstack([B.T, np.eye(numCols), np.ones((numCols, 1))]), list(range(numRows, numRows + numCols))),
+            (np.hstack([np.eye(numRows), A, np.ones((numRows, 1))]), list(range(numRows)))
+        ]:
+            values, bases = enumerateVertices(tableau, basis, basis, tol)
+            # keeping one basis for each vertex
+            first = np.unique(np.round(values / tol).astype(np.int64), axis=0, return_index=True)[1]
+            values, bases = values[np.sort(first)], bases[np.sort(first)]
+            polytopes.append([values, bases, values <= tol])
+        valuesP, basesP, labelsP = polytopes[0]
+        valuesQ, basesQ, labelsQ = polytopes[1]
+        
+        if exact:
+            # the shortest decimal of each payoff, which is what was entered
+            exactA = [[Fraction(repr(float(a))) for a in row] for row in self.payoffTensor[0]]
+            exactB = [[Fraction(repr(float(b))) for b in row] for row in self.payoffTensor[1]]
+            minA = min(min(row) for row in exactA)
+            minB = min(min(row) for row in exactB)
+            # the columns of the two polytopes' constraints, [B^T I] and [I A]
+            columnsP = [[exactB[i][j] - minB + 1 for j in range(numCols)] for i in range(numRows)] + np.eye(numCols, dtype=int).tolist()
+            columnsQ = np.eye(numRows, dtype=int).tolist() + [[exactA[i][j] - minA + 1 for i in range(numRows)] for j in range(numCols)]
+            exactVertices = {}
+            def exactValues(columns, basis):
+                key = (columns is columnsP, tuple(basis))
+                if key not in exactVertices:
+                    # the basic variables solve the constraints with their columns
+                    solution = solveFractions(np.array([columns[var] for var in basis], dtype=object).T.tolist(), [1] * len(basis))
+                    values = [Fraction(0)] * (numRows + numCols)
+                    for row, var in enumerate(basis):
+                        values[var] = solution[row]
+                    exactVertices[key] = values
+                return exactVertices[key]
+        
+        # a pair of vertices other than the origins is an equilibrium if every label missing from x is a label of y
+        def toWords(labels):
+            packed = np.packbits(labels, axis=1, bitorder='little')
+            return np.pad(packed, ((0, 0), (0, -packed.shape[1] % 8))).view(np.uint64)
+        # y either has exactly the missing labels, which is looked up, or more labels than are missing, which is checked
+        wordsQ = toWords(labelsQ)
+        numLabelsQ = labelsQ.sum(axis=1)
+        orderQ = np.argsort(numLabelsQ, kind='stable')
+        sameLabels = {}
+        for b in np.flatnonzero(~labelsQ[:, numRows:].all(axis=1)):
+            sameLabels.setdefault(wordsQ[b].tobytes(), []).append(b)
+        wordsQ = wordsQ[orderQ]
+        numLabelsQ = numLabelsQ[orderQ]
+        missingWords = toWords(~labelsP)
+        equilibria = []
+        for a in np.flatnonzero(~labelsP[:, :numRows].all(axis=1)):
+            missing = missingWords[a]
+            numMissing = numRows + numCols - np.count_nonzero(labelsP[a])
+            more = np.searchsorted(numLabelsQ, numMissing, side='right')
+            matches = orderQ[more:][((wordsQ[more:] & missing) == missing).all(axis=1)]
+            matches = [b for b in matches if not labelsQ[b, numRows:].all()]
+            for b in sorted(sameLabels.get(missing.tobytes(), []) + matches):
+                if exact:
+                    x = exactValues(columnsP, basesP[a])
+                    y = exactValues(columnsQ, basesQ[b])
+                    if any(x[k] != 0 and y[k] != 0 for k in range(numRows + numCols)):
+                        continue
+                    p = x[:numRows]
+                    q = y[numRows:]
+                    equilibria.append([[v / sum(p) for v in p], [v / sum(q) for v in q]])
+                else:
+                    p = valuesP[a, :numRows]
+                    q = valuesQ[b, numRows:]
+                    equilibria.append([(p / p.sum()).tolist(), (q / q.sum()).tolist()])
+        
+        # the maximal Nash subsets are the maximal bicliques of the bipartite graph of extreme equilibria
+        ps = []
+        qs = []
+        neighbors = []
+        for p, q in equilibria:
+            if p not in ps:
+                ps.append(p)
+                neighbors.append(set())
+            if q not in qs:
+                qs.append(q)
+            neighbors[ps.index(p)].add(qs.index(q))
+        # the q sides of the bicliques are the intersections of the neighborhoods of the p's
+        qSides = set()
+        for neighborhood in neighbors:
+            neighborhood = frozenset(neighborhood)
+            qSides |= {neighborhood & side for side in qSides if neighborhood & side} | {neighborhood}
+        subsets = []
+        for side in sorted(qSides, key=sorted):
+            subsets.append([[ps[k] for k in range(len(ps)) if side <= neighbors[k]], [qs[l] for l in sorted(side)]])
+        
+        # the connected components are the unions of maximal Nash subsets that share an extreme equilibrium
+        def overlaps(subset, other):
+            return any(p in other[0] for p in subset[0]) and any(q in other[1] for q in subset[1])
+        components = []
+        for n, subset in enumerate(subsets):
+            overlapping = [component for component in components if any(overlaps(subset, subsets[c]) for c in component)]
+            merged = [n]
+            for component in overlapping:
+                components.remove(component)
+                merged += component
+            components.append(sorted(merged))
+        return equilibria, subsets, components
+
+class SubGame(SimGame):
+    """A game restricted to subsets of its parent's strategies, which keeps reading its payoffs from the parent
+    
+    Where every player's kept strategies are evenly spaced, the payoffs are a view of the parent's; otherwise they are gathered into a copy once, which the parent's single-payoff writes then update in place. Writing to the subgame or changing the parent's strategies gives the subgame its own copy of its payoffs.
+    """
+    def __init__(self, parent, strategies = None):
+        """
+        Args:
+            parent (SimGame): the game to restrict
+            strategies (list of lists of ints): for each player, the indices of the parent's strategies to keep, or None to keep all of them
+        """
+        if strategies is None:
+            strategies = [None for x in range(parent.numPlayers)]
+        strategies = [np.arange(parent.players[x].numStrats) if strategies[x] is None else np.asarray(strategies[x], dtype=np.int64) for x in range(parent.numPlayers)]
+        if isinstance(parent, SubGame) and parent.parent is not None:
+            strategies = [parent.strategies[x][strategies[x]] for x in range(parent.numPlayers)]
+            parent = parent.parent
+        self.parent = parent
+        self.strategies = strategies # strategies[x][s] is the parent's index of player x + 1's strategy s
+        self.ownTensor = None # the subgame's own payoffs once it no longer reads from the parent
+        self.restricted = None # (version, tensor, gathered), the restricted payoffs, the parent's version they were read from, and the writable copy behind them if they aren't a view
+        
+        self.initializeState([Player(len(strategies[x]), parent.players[x].rationality) for x in range(parent.numPlayers)])
+        with parent.lock:
+            parent.subgames.add(self)
+        
+        self.maxRationality = parent.maxRationality
+        self.rationalityProbabilities = list(parent.rationalityProbabilities)
+        self.strategyNames = [[parent.strategyNames[x][t] if x < len(parent.strategyNames) and t < len(parent.strategyNames[x]) else str(t) for t in strategies[x]] for x in range(self.numPlayers)]
+        self.resizeKMatrix()
+        
+        # the original game of a subgame is its unrestricted parent
+        self.originalNumPlayers = parent.numPlayers
+        self.originalNumStrats = [parent.players[x].numStrats for x in range(parent.numPlayers)]
+        self.originalPayoffTensor = parent.payoffTensor
+        return
+    
+    @property
+    def payoffTensor(self):
+        """The restricted payoff tensor of shape (numPlayers, s_1, ..., s_n), read from the parent on first use
+        """
+        if self.parent is None:
+            return self.ownTensor
+        with self.lock:
+            if self.restricted is None or self.restricted[0] != self.parent.version:
+                source = self.parent.payoffTensor
+                # slicing the evenly spaced strategies, which only makes a view
+                index = [slice(None)]
+                gathered = [np.arange(self.numPlayers)]
+                for kept in self.strategies:
+                    step = int(kept[1] - kept[0]) if len(kept) > 1 else 1
+                    if step > 0 and np.all(np.diff(kept) == step):
+                        index.append(slice(int(kept[0]), int(kept[-1]) + 1, step))
+                        gathered.append(None)
+                    else:
+                        index.append(slice(None))
+                        gathered.append(kept)
+                tensor = source[tuple(index)]
+                # gathering the others in a single copy
+                if any(kept is not None for kept in gathered[1:]):
+                    gathered = tensor[np.ix_(*[np.arange(tensor.shape[k]) if kept is None else kept for k, kept in enumerate(gathered)])]
+                    tensor = gathered.view()
+                else:
+                    gathered = None
+                    tensor = tensor.view()
+                tensor.flags.writeable = False
+                self.restricted = (self.parent.version, tensor, gathered)
+                self.clearCaches()
+            return self.restricted[1]
+    
+    @payoffTensor.setter
+    def payoffTensor(self, tensor):
+        if self.parent is not None:
+            with self.parent.lock:
+                self.parent.subgames.discard(self)
+        self.parent = None
+        self.strategies = None
+        self.restricted = None
+        self.ownTensor = tensor
+    
+    def detach(self):
+        """Copies the restricted payoffs into the subgame, after which it no longer reads from its parent
+
+        Returns:
+            np.ndarray: the subgame's own payoff tensor
+        """
+        with self.lock:
+            if self.parent is not None:
+                self.setPayoffTensor(np.array(self.payoffTensor))
+            return self.payoffTensor
+    
+    def parentChanged(self, index):
+        """Brings the subgame up to date after a single payoff of the parent changed, without reading the other payoffs again
+
+        Args:
+            index (tuple of ints): the (x, s_1, ..., s_n) of the parent's payoff that changed
+        """
+        with self.lock:
+            # payoffs that were already out of date are read again on their next use
+            if self.parent is None or self.restricted is None or self.restricted[0] != self.parent.version - 1:
+                return
+            version, tensor, gathered = self.restricted
+            positions = [np.flatnonzero(self.strategies[x] == index[x + 1]) for x in range(self.numPlayers)]
+            if all(len(position) == 1 for position in positions):
+                if gathered is not None:
+                    gathered[(index[0],) + tuple(int(position[0]) for position in positions)] = self.parent.payoffTensor[index]
+                self.clearCaches()
+            self.restricted = (self.parent.version, tensor, gathered)
+        return
+    
+    def removeStrategy(self, player, s):
+        """Removes strategy s from player x by dropping it from the index maps, without touching the payoffs
+
+        Args:
+            player (int): index of the player
+            s (int): index of the strategy
+        """
+        if self.parent is None:
+            return SimGame.removeStrategy(self, player, s)
+        self.recordRemoval(player, s)
+        with self.lock:
+            self.strategies[player] = np.delete(self.strategies[player], s)
+            self.players[player].numStrats -= 1
+            self.restricted = None
+            self.clearCaches()
+        return
+    
+    def toParentProfile(self, profile):
+        """Maps a profile of the subgame to the corresponding profile of the parent
+
+        Args:
+            profile (list of ints): a strategy for each player, as indices in the subgame
+
+        Returns:
+            list of ints: the same strategies as indices in the parent
+        """
+        if self.parent is None:
+            print(Fore.RED + f"toParentProfile: invalid input. The subgame no longer has a parent since its payoffs were changed." + Style.RESET_ALL)
+            return
+        return [int(self.strategies[x][profile[x]]) for x in range(self.numPlayers)]
 
 arr_2players = [
     [
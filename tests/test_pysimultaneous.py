@@ -0,0 +1,514 @@
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+
+import numpy as np
+
+from pysimultaneous import BINARY_MAGIC, SimGame
+
+
+def test_logitHomotopy_follows_the_branch_past_folds():
+    # orienting the tangent by the previous direction turned this game's branch back toward lambda = 0
+    game = SimGame.fromArray(np.random.default_rng(18).random((4, 4, 4, 4, 4)))
+    equilibrium = game.logitHomotopy()
+    assert equilibrium
+    assert game.regret(equilibrium).max() < 1e-8
+
+
+def test_fromArray_read_only_buffer_is_copied_on_write():
+    payoffs = np.arange(8, dtype=float)
+    buffer = np.frombuffer(payoffs.tobytes(), dtype=float).reshape(2, 2, 2)
+    game = SimGame.fromArray(buffer)
+    assert game.toArray() is buffer
+
+    game.payoffMatrix[0][1][0].getListNode(1).payoff = 42
+    assert game.payoffTensor[1, 1, 0] == 42
+    assert buffer[1, 1, 0] == 6
+    assert game.payoffTensor.flags.writeable
+
+
+def test_toNFG_numbers_unnamed_strategies(tmp_path):
+    game = SimGame.fromArray(np.random.default_rng(0).random((2, 3, 4)))
+    game.strategyNames[1] = game.strategyNames[1][:2]
+    game.toNFG(str(tmp_path / "game.nfg"))
+
+    read = SimGame.fromNFG(str(tmp_path / "game.nfg"))
+    assert np.allclose(read.toArray(), game.toArray())
+    assert read.strategyNames[1] == ["L", "C1", "3", "4"]
+
+
+def test_appendStrategies_names_new_strategies(tmp_path):
+    rng = np.random.default_rng(0)
+    game = SimGame.fromArray(rng.random((2, 2, 2)))
+    game.appendStrategies(1, rng.random((2, 2, 3)))
+    assert game.strategyNames[1] == ["L", "R", "3", "4", "5"]
+
+    game.saveToFile(str(tmp_path / "game.txt"))
+    read = SimGame(2)
+    read.readFromFile(str(tmp_path / "game.txt"))
+    assert np.allclose(read.toArray(), game.toArray())
+    assert read.strategyNames == game.strategyNames
+
+
+def test_findDominatedStrategies_mixed():
+    payoffs = np.zeros((2, 4, 2))
+    payoffs[0] = [[3, 0], [0, 3], [1, 1], [2, 1]]
+    game = SimGame.fromArray(payoffs)
+    assert game.findDominatedStrategies(0) == []
+
+    # the third row is strictly dominated by mixtures, the fourth only weakly by mixing the first two 2:1
+    dominated = game.findDominatedStrategies(0, mixed=True)
+    assert [s for s, mixture in dominated] == [2]
+    assert (np.array(dominated[0][1]) @ payoffs[0] > payoffs[0][2]).all()
+
+
+def test_supportEnumeration_is_scale_invariant_with_singular_supports():
+    payoffs = np.random.default_rng(6).random((2, 6, 6))
+    payoffs[:, :, 5] = payoffs[:, :, 4]
+    equilibria = SimGame.fromArray(payoffs).supportEnumeration()
+    scaled = SimGame.fromArray(payoffs * 1e-3).supportEnumeration()
+    assert len(scaled) == len(equilibria) == 5
+
+
+def test_gathered_subgame_sees_parent_writes():
+    game = SimGame.fromArray(np.zeros((2, 3, 3)))
+    game.payoffTensor[0, 1, :] = 1
+    game.clearCaches()
+    subgame = game.restrict([[0, 2, 1], [0, 1]])
+    assert not subgame.computeBestResponses()[0, 0, 0]
+
+    payoffs = subgame.payoffTensor
+    game.payoffMatrix[0][0][0].getListNode(0).payoff = 5
+    assert subgame.payoffTensor[0, 0, 0] == 5
+    assert subgame.computeBestResponses()[0, 0, 0]
+    # a write outside the restriction or a patched one doesn't gather the payoffs again
+    game.payoffMatrix[0][0][2].getListNode(1).payoff = 7
+    game.payoffMatrix[0][2][1].getListNode(1).payoff = 4
+    assert subgame.payoffTensor is payoffs
+    assert subgame.payoffTensor[1, 1, 1] == 4
+
+
+def test_subgame_keeps_its_payoffs_when_parent_strategies_change():
+    game = SimGame.fromArray(np.random.default_rng(0).random((2, 4, 4)))
+    subgame = game.restrict([[1, 3], [0, 2]])
+    payoffs = np.array(subgame.payoffTensor)
+
+    game.removeStrategy(0, 1)
+    assert subgame.parent is None
+    assert np.array_equal(subgame.payoffTensor, payoffs)
+
+
+def test_fitRationalityProbabilities_rejects_zero_noise():
+    game = SimGame.fromArray(np.random.default_rng(0).random((2, 3, 3)))
+    assert game.fitRationalityProbabilities(np.arange(9), noise=0) == (None, None)
+    probabilities, logLikelihood = game.fitRationalityProbabilities(np.arange(9))
+    assert np.isfinite(logLikelihood)
+
+
+def test_readFromBinaryFile_reports_malformed_headers(tmp_path):
+    for header in (b"{bad", b'{"numPlayers": 2, "numStrats": [2, 2]}', b"[2, 2]"):
+        path = tmp_path / "game.bin"
+        path.write_bytes(BINARY_MAGIC + struct.pack("<II", 1, len(header)) + header)
+        assert SimGame(2).readFromBinaryFile(str(path)) is None
+
+
+def test_level_k_methods_run_on_a_subgame():
+    game = SimGame.fromArray(np.random.default_rng(3).random((2, 4, 5)))
+    subgame = game.restrict([[0, 2, 3], [1, 4]])
+    copy = SimGame.fromArray(np.array(subgame.payoffTensor))
+    for g in (subgame, copy):
+        g.rationalityProbabilities = [0.4, 0.3, 0.2, 0.1]
+        g.computeOutcomeProbabilities()
+    assert subgame.computeKStrategies() == copy.computeKStrategies()
+    assert np.allclose(subgame.computeKExpectedUtilities(), copy.computeKExpectedUtilities())
+
+
+def test_computeMixedEquilibria_of_constant_sum_games():
+    saddle = np.array([[2.0, 3.0], [1.0, 0.0]])
+    assert SimGame.fromArray(np.stack([saddle, 5 - saddle])).computeMixedEquilibria() == []
+    pennies = np.array([[1.0, -1.0], [-1.0, 1.0]])
+    [[p, q]] = SimGame.fromArray(np.stack([pennies, -pennies])).computeMixedEquilibria()
+    assert np.allclose(p, [0.5, 0.5]) and np.allclose(q, [0.5, 0.5])
+
+
+def test_solveZeroSum_large_game_matches_its_value():
+    A = np.random.default_rng(0).random((200, 300))
+    value, p, q = SimGame.fromArray(np.stack([A, -A])).solveZeroSum()
+    assert np.isclose(sum(p), 1) and np.isclose(sum(q), 1)
+    assert (np.array(p) @ A).min() >= value - 1e-7
+    assert (A @ np.array(q)).max() <= value + 1e-7
+
+
+def test_restrict_from_many_threads():
+    game = SimGame.fromArray(np.random.default_rng(4).random((2, 6, 6)))
+    with ThreadPoolExecutor(8) as pool:
+        subgames = list(pool.map(lambda k: game.restrict([[k % 6, (k + 1) % 6], None]), range(200)))
+    assert len(game.subgames) == 200
+    assert all(np.array_equal(subgame.payoffTensor, game.payoffTensor[:, [k % 6, (k + 1) % 6]]) for k, subgame in enumerate(subgames))
+
+
+def test_computeCognitiveHierarchy_of_a_prisoners_dilemma():
+    payoffs = np.array([[3.0, 0.0], [5.0, 1.0]])
+    game = SimGame.fromArray(np.stack([payoffs, payoffs.T]))
+    choices, outcomes = game.computeCognitiveHierarchy(tau=1.5, maxLevel=2)
+    assert choices == [[[0.5, 0.5], [0.5, 0.5]], [[0.0, 1.0], [0.0, 1.0]], [[0.0, 1.0], [0.0, 1.0]]]
+    # the population plays uniformly with the share of L_0, 1 / (1 + 1.5 + 1.125), and defects otherwise
+    population = np.array([0.5, 3.125]) / 3.625
+    assert np.allclose(outcomes, np.outer(population, population))
+    # the level-k model is left alone
+    assert game.maxRationality == 4
+    assert game.rationalityProbabilities == [0.0, 0.0, 0.0, 0.0]
+
+
+def test_payoff_and_regret_apis_take_profile_arrays():
+    pennies = np.array([[1.0, -1.0], [-1.0, 1.0]])
+    game = SimGame.fromArray(np.stack([pennies, -pennies]))
+    profile = np.array([[0.25, 0.75], [0.5, 0.5]])
+    assert np.allclose(game.expectedPayoffs(profile), game.expectedPayoffs(profile.tolist()))
+    assert np.allclose(game.deviationPayoffs(profile, 1), [0.5, -0.5])
+    assert np.allclose(game.regret(profile), [0.0, 0.5])
+    profiles = np.stack([profile, np.full((2, 2), 0.5)], axis=1)
+    assert np.allclose(game.batchExpectedPayoffs(profiles), [[0.0, 0.0], [0.0, 0.0]])
+    assert np.allclose(game.batchRegret(profiles), [[0.0, 0.5], [0.0, 0.0]])
+
+
+def test_payoffMatrix_reads_and_writes_the_payoff_tensor():
+    tensor = np.arange(24, dtype=float).reshape(3, 2, 2, 2)
+    game = SimGame(3)
+    game.enterData(3, [2, 2, 2], [[[list(tensor[:, i, j, m]) for j in range(2)] for i in range(2)] for m in range(2)])
+    assert np.array_equal(game.payoffTensor, tensor)
+    assert game.payoffMatrix[1][0][1].getListNode(2).payoff == tensor[2, 0, 1, 1]
+
+    game.payoffMatrix[1][0][1].getListNode(2).payoff = -1
+    assert game.payoffTensor[2, 0, 1, 1] == -1
+    game.removeStrategy(1, 0)
+    assert game.payoffTensor.shape == (3, 2, 1, 2)
+    assert game.players[1].numStrats == 1
+
+
+def test_computeBestResponses_matches_brute_force():
+    tensor = np.random.default_rng(2).integers(0, 3, (3, 3, 2, 4)).astype(float)
+    game = SimGame.fromArray(tensor)
+    bestResponses = game.computeBestResponses()
+    for profile in np.ndindex(3, 2, 4):
+        for x in range(3):
+            deviations = [tensor[(x,) + profile[:x] + (s,) + profile[x + 1:]] for s in range(tensor.shape[x + 1])]
+            assert bestResponses[(x,) + profile] == (tensor[(x,) + profile] == max(deviations))
+    assert game.computePureEquilibria() == sorted([list(profile) for profile in np.ndindex(3, 2, 4) if bestResponses[(slice(None),) + profile].all()], key=lambda p: (p[2], p[0], p[1]))
+
+
+def test_stride_tables_round_trip_and_follow_the_shape():
+    game = SimGame.fromArray(np.zeros((4, 2, 3, 4, 3)))
+    for m in range(12):
+        profile = game.toProfile(m)
+        assert profile[:2] == [-1, -1]
+        assert game.toIndex(profile) == m
+    profiles = np.array(list(np.ndindex(2, 3, 4, 3)))
+    assert np.array_equal(game.ravel(profiles), np.arange(72))
+    assert np.array_equal(game.unravel(np.arange(72)), profiles)
+
+    game.removeStrategy(2, 0)
+    assert game.toProfile(4) == [-1, -1, 1, 1]
+    assert game.unravel(71 - 18).tolist() == [1, 2, 2, 2]
+
+
+def test_games_are_isolated_and_solve_concurrently():
+    tensors = [np.random.default_rng(seed).integers(0, 4, (2, 4, 4)).astype(float) for seed in range(16)]
+    expected = [SimGame.fromArray(tensor).computePureEquilibria() for tensor in tensors]
+    with ThreadPoolExecutor(4) as pool:
+        assert list(pool.map(lambda tensor: SimGame.fromArray(tensor).computePureEquilibria(), tensors)) == expected
+
+    first, second = SimGame(), SimGame()
+    first.setMaxLevel(6)
+    first.strategyNames[0][0] = "T"
+    assert second.maxRationality == 4
+    assert second.strategyNames[0] == ["U", "D"]
+
+
+def nondegenerateGame():
+    # the 3 x 2 game with three equilibria from von Stengel's survey of bimatrix equilibrium computation
+    return SimGame.fromArray(np.array([[[3.0, 3.0], [2.0, 5.0], [0.0, 6.0]], [[3.0, 2.0], [2.0, 6.0], [3.0, 1.0]]]))
+
+
+NONDEGENERATE_EQUILIBRIA = [[[1, 0, 0], [1, 0]], [[0.8, 0.2, 0], [2 / 3, 1 / 3]], [[0, 1 / 3, 2 / 3], [1 / 3, 2 / 3]]]
+
+
+def test_supportEnumeration_finds_every_equilibrium():
+    equilibria = nondegenerateGame().supportEnumeration()
+    assert len(equilibria) == 3
+    for equilibrium, expected in zip(equilibria, NONDEGENERATE_EQUILIBRIA):
+        assert all(np.allclose(strategy, expectedStrategy) for strategy, expectedStrategy in zip(equilibrium, expected))
+
+
+def test_lemkeHowson_reaches_known_equilibria():
+    game = nondegenerateGame()
+    def isKnown(equilibrium):
+        return any(all(np.allclose(strategy, expectedStrategy) for strategy, expectedStrategy in zip(equilibrium, expected)) for expected in NONDEGENERATE_EQUILIBRIA)
+    assert isKnown(game.lemkeHowson())
+    assert all(isKnown(game.lemkeHowson(label)) for label in range(5))
+    # the mixed equilibrium with index -1 is not reached from the artificial equilibrium
+    equilibria = game.lemkeHowson(allLabels=True)
+    assert len(equilibria) == 2 and all(isKnown(equilibrium) for equilibrium in equilibria)
+
+
+def test_vertexEnumeration_finds_a_degenerate_component():
+    # von Stengel's degenerate variant, where player 2 is indifferent against player 1's first strategy
+    game = SimGame.fromArray(np.array([[[3.0, 3.0], [2.0, 5.0], [0.0, 6.0]], [[3.0, 3.0], [2.0, 6.0], [3.0, 1.0]]]))
+    equilibria, subsets, components = game.vertexEnumeration(exact=True)
+    assert equilibria == [[[1, 0, 0], [1, 0]], [[1, 0, 0], [Fraction(2, 3), Fraction(1, 3)]], [[0, Fraction(1, 3), Fraction(2, 3)], [Fraction(1, 3), Fraction(2, 3)]]]
+    assert subsets == [[[[1, 0, 0]], [[1, 0], [Fraction(2, 3), Fraction(1, 3)]]], [[[0, Fraction(1, 3), Fraction(2, 3)]], [[Fraction(1, 3), Fraction(2, 3)]]]]
+    assert components == [[0], [1]]
+
+
+def test_logitHomotopy_solves_three_player_matching_pennies():
+    # Jordan's game: player 1 matches player 2, player 2 matches player 3 and player 3 mismatches player 1, whose only equilibrium is uniform
+    tensor = np.zeros((3, 2, 2, 2))
+    for a, b, c in np.ndindex(2, 2, 2):
+        tensor[:, a, b, c] = [a == b, b == c, c != a]
+    game = SimGame.fromArray(tensor)
+    assert game.computePureEquilibria() == []
+    assert np.allclose(game.logitHomotopy(), 0.5)
+
+
+def test_computeIESDS_matches_brute_force():
+    rng = np.random.default_rng(5)
+    for trial in range(30):
+        shape = (3,) + tuple(rng.integers(2, 5, 3))
+        tensor = rng.integers(0, 6, shape).astype(float)
+        # a bonus per strategy, which makes some strategies dominated
+        for x in range(3):
+            tensor[x] += np.expand_dims(3 * rng.integers(0, 3, shape[x + 1]), [y for y in range(3) if y != x])
+        # pure elimination by hand, removing every dominated strategy each round
+        alive = [list(range(k)) for k in shape[1:]]
+        while True:
+            block = tensor[np.ix_(range(3), *alive)]
+            dominated = [[b for b in range(len(alive[x])) if any((np.take(block[x], a, axis=x) > np.take(block[x], b, axis=x)).all() for a in range(len(alive[x])))] for x in range(3)]
+            if not any(dominated):
+                break
+            alive = [[s for k, s in enumerate(alive[x]) if k not in dominated[x]] for x in range(3)]
+
+        game = SimGame.fromArray(tensor)
+        survivors, eliminations = game.computeIESDS()
+        assert [np.flatnonzero(survivor).tolist() for survivor in survivors] == alive
+        assert game.payoffTensor is tensor
+        game.eliminateStrictlyDominatedStrategies_full()
+        assert np.array_equal(game.payoffTensor, tensor[np.ix_(range(3), *alive)])
+
+
+def test_computeIESDS_with_mixed_dominance_unlocks_pure_eliminations():
+    # B is only dominated by mixing T and M; once it's gone, R and then M are dominated by pure strategies
+    rows = np.array([[3.0, 0.0], [0.0, 3.0], [1.0, 1.0]])
+    columns = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 2.0]])
+    game = SimGame.fromArray(np.stack([rows, columns]))
+    assert game.computeIESDS()[1] == []
+    survivors, eliminations = game.computeIESDS(mixed=True)
+    assert [survivor.tolist() for survivor in survivors] == [[True, False, False], [True, False]]
+    assert [elimination[:2] for elimination in eliminations] == [[0, 2], [1, 1], [0, 1]]
+    assert (np.array(eliminations[0][2]) @ rows > rows[2]).all()
+
+
+def test_incremental_IESDS_eliminations_stay_valid():
+    rng = np.random.default_rng(12)
+    for trial in range(20):
+        shape = (3,) + tuple(rng.integers(3, 6, 3))
+        tensor = rng.integers(0, 8, shape).astype(float)
+        for x in range(3):
+            tensor[x] += np.expand_dims(2 * rng.integers(0, 4, shape[x + 1]), [y for y in range(3) if y != x])
+        survivors, eliminations = SimGame.fromArray(tensor).computeIESDS()
+        # every elimination is by a strategy that does strictly better against the others' strategies left at that point
+        alive = [np.ones(k, dtype=bool) for k in shape[1:]]
+        for x, s, mixture in eliminations:
+            block = tensor[x][np.ix_(*[np.flatnonzero(alive[y]) if y != x else np.arange(shape[x + 1]) for y in range(3)])]
+            assert (np.tensordot(mixture, block, axes=([0], [x])) > np.take(block, s, axis=x)).all()
+            alive[x][s] = False
+        assert all(np.array_equal(a, survivor) for a, survivor in zip(alive, survivors))
+
+        stepped = SimGame.fromArray(tensor)
+        while stepped.eliminateStrictlyDominatedStrategies_step() is not None:
+            pass
+        assert np.array_equal(stepped.payoffTensor, tensor[np.ix_(range(3), *[np.flatnonzero(survivor) for survivor in survivors])])
+
+
+def test_computeKStrategies_matches_brute_force():
+    tensor = np.random.default_rng(14).random((3, 4, 3, 5))
+    game = SimGame.fromArray(tensor)
+    kStrategies = game.computeKStrategies(maxLevel=6)
+    assert len(kStrategies) == 7 and game.maxRationality == 7
+    # L_0 plays toward the player's best outcome, and L_r best responds to everyone else playing L_{r - 1}
+    expected = [[int(np.unravel_index(tensor[x].argmax(), tensor.shape[1:])[x]) for x in range(3)]]
+    for r in range(1, 7):
+        previous = expected[-1]
+        expected.append([int(np.argmax([tensor[(x,) + tuple(previous[:x]) + (s,) + tuple(previous[x + 1:])] for s in range(tensor.shape[x + 1])])) for x in range(3)])
+    assert kStrategies == expected
+
+
+def test_computeOutcomeProbabilities_matches_brute_force():
+    game = SimGame.fromArray(np.random.default_rng(16).random((3, 3, 4, 3)))
+    game.rationalityProbabilities = [0.1, 0.4, 0.3, 0.2]
+    kStrategies = game.computeKStrategies()
+    probabilities = game.computeOutcomeProbabilities()
+    # drawing every player's level independently
+    expected = {}
+    for levels in np.ndindex(4, 4, 4):
+        index = int(game.ravel([kStrategies[r][x] for x, r in enumerate(levels)]))
+        expected[index] = expected.get(index, 0) + np.prod([game.rationalityProbabilities[r] for r in levels])
+    assert {index: p for index, p in probabilities.items() if p > 0}.keys() == expected.keys()
+    assert all(np.isclose(probabilities[index], p) for index, p in expected.items())
+    assert np.isclose(sum(probabilities.values()), 1)
+    assert sorted(game.ravel(game.kOutcomes).tolist()) == sorted(probabilities)
+    assert np.allclose(game.computeKExpectedUtilities(), sum(p * game.payoffTensor.reshape(3, -1)[:, index] for index, p in expected.items()))
+
+
+def test_fitRationalityProbabilities_recovers_the_levels_played():
+    # every level plays a different strategy here, so the fit should match how often each level was drawn
+    game = SimGame.fromArray(np.random.default_rng(0).random((2, 5, 5)))
+    kStrategies = np.array(game.computeKStrategies())
+    assert all(len(set(kStrategies[:, x])) == 4 for x in range(2))
+    levels = np.random.default_rng(1).choice(4, size=(20000, 2), p=[0.1, 0.4, 0.3, 0.2])
+    observations = game.ravel(np.stack([kStrategies[levels[:, 0], 0], kStrategies[levels[:, 1], 1]], axis=1))
+
+    probabilities, logLikelihood = game.fitRationalityProbabilities(observations)
+    assert np.allclose(probabilities, np.bincount(levels.ravel()) / levels.size, atol=1e-3)
+    assert game.rationalityProbabilities == probabilities
+    perPlayer, logLikelihood = game.fitRationalityProbabilities(observations, perPlayer=True)
+    for x in range(2):
+        assert np.allclose(perPlayer[x], np.bincount(levels[:, x]) / len(levels), atol=1e-3)
+        assert game.players[x].rationality == 1
+
+
+def test_expected_payoffs_match_brute_force():
+    rng = np.random.default_rng(18)
+    tensor = rng.random((3, 2, 3, 4))
+    game = SimGame.fromArray(tensor)
+    profiles = [rng.dirichlet(np.ones(k), size=5) for k in (2, 3, 4)]
+    expected = np.array([sum(tensor[(slice(None),) + profile] * np.prod([profiles[x][k][s] for x, s in enumerate(profile)]) for profile in np.ndindex(2, 3, 4)) for k in range(5)])
+    assert np.allclose(game.batchExpectedPayoffs(profiles), expected)
+    assert np.allclose(game.expectedPayoffs([strategies[0] for strategies in profiles]), expected[0])
+    # a player's expected payoff is their deviation payoffs weighted by their own strategy
+    deviations = game.batchDeviationPayoffs(profiles, 2)
+    assert np.allclose(np.einsum("ks,ks->k", deviations, profiles[2]), expected[:, 2])
+    assert np.allclose(game.deviationPayoffs([strategies[1] for strategies in profiles], 2), deviations[1])
+
+
+def test_regret_matches_brute_force_and_flags_equilibria():
+    tensor = np.random.default_rng(19).integers(0, 5, (3, 3, 2, 3)).astype(float)
+    game = SimGame.fromArray(tensor)
+    profiles = np.array(list(np.ndindex(3, 2, 3)))
+    regrets = game.batchRegret(profiles)
+    for profile, regret in zip(profiles, regrets):
+        for x in range(3):
+            best = max(tensor[(x,) + tuple(profile[:x]) + (s,) + tuple(profile[x + 1:])] for s in range(tensor.shape[x + 1]))
+            assert regret[x] == best - tensor[(x,) + tuple(profile)]
+    assert profiles[game.batchIsEpsilonEquilibrium(profiles)].tolist() == sorted(game.computePureEquilibria())
+    assert np.array_equal(game.regret(list(profiles[7])), regrets[7])
+
+    bimatrix = nondegenerateGame()
+    for equilibrium in NONDEGENERATE_EQUILIBRIA:
+        assert bimatrix.isEpsilonEquilibrium(equilibrium)
+    assert not bimatrix.isEpsilonEquilibrium([[0.5, 0.5, 0], [0.5, 0.5]])
+
+
+def test_binary_file_round_trip(tmp_path):
+    game = SimGame.fromArray(np.random.default_rng(20).random((3, 2, 4, 3)))
+    game.players[2].rationality = 2
+    game.strategyNames[1][1] = "X"
+    path = str(tmp_path / "game.bin")
+    game.saveToFile(path, binary=True)
+
+    read = SimGame()
+    read.readFromFile(path)
+    assert np.array_equal(read.payoffTensor, game.payoffTensor)
+    assert read.strategyNames == game.strategyNames
+    assert [player.rationality for player in read.players] == [0, 0, 2]
+    # the payoffs are mapped from the file, and writing to them leaves the file alone
+    assert isinstance(read.payoffTensor, np.memmap)
+    read.payoffMatrix[0][0][0].getListNode(0).payoff = -1
+    again = SimGame()
+    again.readFromBinaryFile(path)
+    assert np.array_equal(again.payoffTensor, game.payoffTensor)
+
+
+def test_text_file_streams_in_small_chunks(tmp_path):
+    game = SimGame.fromArray(np.random.default_rng(21).integers(-5, 5, (3, 2, 3, 2)) / 4)
+    path = str(tmp_path / "game.txt")
+    game.saveToFile(path)
+
+    progress = []
+    read = SimGame()
+    # chunks of 7 characters split numbers and lines between reads
+    read.readFromFile(path, chunkSize=7, progress=lambda numRead, numPayoffs: progress.append((numRead, numPayoffs)))
+    assert np.array_equal(read.payoffTensor, game.payoffTensor)
+    assert read.strategyNames == game.strategyNames
+    assert len(progress) > 1 and progress[-1] == (36, 36)
+    assert all(earlier[0] <= later[0] for earlier, later in zip(progress, progress[1:]))
+
+
+def test_fromNFG_reads_both_versions_and_round_trips(tmp_path):
+    # the prisoner's dilemma with player 1's strategy changing fastest
+    payoffList = tmp_path / "payoffs.nfg"
+    payoffList.write_text('NFG 1 R "Prisoner\'s dilemma" { "Player 1" "Player 2" } { 2 2 }\n\n3 3 5 0 0 5 1 1\n')
+    outcomes = tmp_path / "outcomes.nfg"
+    outcomes.write_text('NFG 1 R "Prisoner\'s dilemma" { "Player 1" "Player 2" }\n\n{ { "C" "D" }\n{ "C" "D" }\n}\n""\n\n'
+                        '{\n{ "CC" 3, 3 }\n{ "DC" 5, 0 }\n{ "CD" 0, 5 }\n{ "" 1, 1 }\n}\n1 2 3 4\n')
+    expected = np.array([[[3.0, 0.0], [5.0, 1.0]], [[3.0, 5.0], [0.0, 1.0]]])
+    assert np.array_equal(SimGame.fromNFG(str(payoffList)).payoffTensor, expected)
+    game = SimGame.fromNFG(str(outcomes))
+    assert np.array_equal(game.payoffTensor, expected)
+    assert game.strategyNames == [["C", "D"], ["C", "D"]]
+
+    game = SimGame.fromArray(np.random.default_rng(22).random((3, 2, 3, 2)))
+    game.strategyNames[0][0] = 'say "hi"'
+    game.toNFG(str(tmp_path / "game.nfg"), title="three players")
+    read = SimGame.fromNFG(str(tmp_path / "game.nfg"))
+    assert np.array_equal(read.payoffTensor, game.payoffTensor)
+    assert read.strategyNames == game.strategyNames
+
+
+def test_fromArray_shares_payoffs_unless_copying():
+    outcomes = np.random.default_rng(23).random((2, 3, 2))
+    game = SimGame.fromArray(outcomes, playerAxis=-1)
+    assert np.shares_memory(game.payoffTensor, outcomes)
+    assert game.payoffTensor[1, 0, 2] == outcomes[0, 2, 1]
+    outcomes[0, 2, 1] = 9
+    assert game.payoffTensor[1, 0, 2] == 9
+
+    copied = SimGame.fromArray(outcomes, copy=True, playerAxis=-1)
+    assert not np.shares_memory(copied.payoffTensor, outcomes)
+    assert SimGame.fromArray(np.ones((2, 2, 2), dtype=int)).payoffTensor.dtype == float
+
+
+def test_appended_strategies_grow_the_buffer_geometrically():
+    rng = np.random.default_rng(24)
+    tensor = rng.random((3, 2, 2, 2))
+    game = SimGame.fromArray(tensor)
+    blocks = [rng.random((3, 2, 2, 1)) for k in range(20)]
+    buffers = set()
+    for block in blocks:
+        game.appendStrategies(2, block)
+        buffers.add(id(game.payoffBuffer))
+    assert np.array_equal(game.payoffTensor, np.concatenate([tensor] + blocks, axis=3))
+    # doubling the capacity moves the payoffs only a logarithmic number of times
+    assert len(buffers) <= 5
+
+    game.reserve(0, 10)
+    buffer = game.payoffBuffer
+    for k in range(8):
+        game.appendStrategies(0, rng.random((3, 1, 2, 22)))
+    assert game.payoffBuffer is buffer and game.payoffTensor.base is buffer
+    assert game.players[0].numStrats == 10
+
+
+def test_doubleOracle_finds_a_small_support_in_a_huge_game():
+    # rock-paper-scissors, where any other strategy loses 2 against the three of them
+    rps = np.array([[0.0, -1.0, 1.0], [1.0, 0.0, -1.0], [-1.0, 1.0, 0.0]])
+    def payoffFunction(profiles):
+        i, j = profiles[:, 0], profiles[:, 1]
+        payoffs = np.where((i < 3) & (j < 3), rps[np.minimum(i, 2), np.minimum(j, 2)], np.where(i < 3, 2.0, np.where(j < 3, -2.0, 0.0)))
+        return np.stack([payoffs, -payoffs], axis=1)
+    equilibrium, strategies = SimGame().doubleOracle(payoffFunction=payoffFunction, numStrats=[100000, 100000])
+    assert strategies == [[0, 1, 2], [0, 1, 2]]
+    assert all(np.allclose(strategy[:3], 1 / 3) and len(strategy) == 100000 for strategy in equilibrium)
+
+    game = SimGame.fromArray(np.random.default_rng(25).random((3, 6, 5, 4)))
+    equilibrium, strategies = game.doubleOracle()
+    assert game.regret(equilibrium).max() < 1e-9